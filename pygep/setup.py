@@ -3,8 +3,8 @@ import sys
 
 
 # TODO: once issue 7 goes away, remove this code
-if sys.version_info[:2] < (2, 5):
-    raise SystemExit('PyGEP requires Python 2.5')
+if sys.version_info[:2] < (2, 7):
+    raise SystemExit('PyGEP requires Python 2.7')
 
 
 setup(
@@ -17,7 +17,7 @@ setup(
     url          = 'http://code.google.com/p/pygep',
     download_url = 'http://code.google.com/p/pygep/downloads/list',
 
-    #install_requires = ['python>=2.5'], # 7: setuptools issue for win32
+    #install_requires = ['python>=2.7'], # 7: setuptools issue for win32
 
     package_dir = {'': 'src'},
     packages    = find_packages('src', exclude=['tests', 'tests.*']),
@@ -1,7 +1,9 @@
-#!/usr/bin/env python2.5
+#!/usr/bin/env python2.7
 from pygep import *
+from pygep.data import ingest
 from pygep.functions.linkers import sum_linker
 from pygep.functions.mathematical import MATH_ALL
+from pygep.racing import mean
 import string, sys
 
 
@@ -10,28 +12,22 @@ import string, sys
 # from ftp.ira.uka.de//pub/neuron/proben1.tar.gz
 
 
-# This class represents information about a tumor
-# with a specified number of variables
+# Each tumor has a specified number of variables, followed by
+# two label fields: either benign (1 0) or malignant (0 1)
 VARS = tuple([l for l in string.lowercase[:9]])
-class Tumor(object):
-    def __init__(self, line):
-        row = line.strip().split()
-        for letter, val in zip(VARS, row):
-            setattr(self, letter, float(val))
-
-        # The tumor can either be benign or malignant
-        if row[-2:] == ['1','0']:
-            self.benign = True
-        elif row[-2:] == ['0','1']:
-            self.benign = False
-        else:
-            raise ValueError('Invalid data row %r' % line)
+def benign(fields):
+    if fields[-2:] == ['1','0']:
+        return True
+    elif fields[-2:] == ['0','1']:
+        return False
+    else:
+        raise ValueError('Invalid data row %r' % ' '.join(fields))
 
 
 # We need two samples: one for training our GEP
 # chromosomes on and another for final evaluation
-TRAIN_SIZE, TRAIN_SAMPLE = 350, []
-TEST_SIZE, TEST_SAMPLE = 174, []
+TRAIN_SIZE, TRAIN_SAMPLE = 350, None
+TEST_SIZE, TEST_SAMPLE = 174, None
 
 
 # We also need to know how many tumors are benign
@@ -47,8 +43,8 @@ class TumorEvaluator(Chromosome):
 
     def _fitness(self):
         try:
-            correct = 0
-            for tumor in TRAIN_SAMPLE:
+            correct, total = 0, len(TRAIN_SAMPLE)
+            for i, tumor in enumerate(TRAIN_SAMPLE):
                 # Make a prediction about the tumor
                 benign = self(tumor) > 0
 
@@ -56,6 +52,12 @@ class TumorEvaluator(Chromosome):
                 if benign == tumor.benign:
                     correct += 1
 
+                # Stop once we can't beat the cutoff even if we get
+                # every remaining tumor right (see pygep.racing)
+                remaining = total - i - 1
+                if self.hopeless(correct + remaining, remaining):
+                    break
+
             # Fitness if the number of hits assuming we at least
             # pass the threshold of a minimum # correct.
             if correct >= max(TRAIN_BENIGN, TRAIN_MALIG):
@@ -75,20 +77,20 @@ if __name__ == '__main__':
         print 'Usage: %s cancer1.dt' % sys.argv[0]
         sys.exit()
 
-    # Read in the training and testing data
-    data = open(sys.argv[1]).readlines()[7:] # skip header
-    TRAIN_SAMPLE.extend([Tumor(line) for line in data[:TRAIN_SIZE]])
-    TEST_SAMPLE.extend([Tumor(line) for line in data[-TEST_SIZE:]])
+    # Convert the data to binary columns once, reading it in chunks, and
+    # map them from disk rather than reading the whole file into memory
+    data = ingest(sys.argv[1], sys.argv[1] + '.columns', VARS, skip=7,
+                  derived={'benign': benign})
+    TRAIN_SAMPLE = data[:TRAIN_SIZE]
+    TEST_SAMPLE = data[-TEST_SIZE:]
 
     # Determine training stats
-    for tumor in TRAIN_SAMPLE:
-        if tumor.benign:
-            TRAIN_BENIGN += 1
-        else:
-            TRAIN_MALIG += 1
+    TRAIN_BENIGN = int(TRAIN_SAMPLE['benign'].sum())
+    TRAIN_MALIG = TRAIN_SIZE - TRAIN_BENIGN
 
     # Create our population and find a solution
     p = Population(TumorEvaluator, 50, 8, 4, sum_linker)
+    p.racing = mean
     print p
     p.is_transposition_rate = 1
 
@@ -0,0 +1,55 @@
+from pygep import *
+from pygep.functions.linkers import or_linker
+from pygep.functions.logical import LOGIC_ALL
+from pygep.vector import Bits
+
+# Demo for the boolean 11-multiplexer, evaluated bit-parallel over all
+# 2048 fitness cases at once
+
+ADDRESS = 'a0', 'a1', 'a2'
+DATA = 'd0', 'd1', 'd2', 'd3', 'd4', 'd5', 'd6', 'd7'
+TABLE = Bits.truth_table(*(ADDRESS + DATA))
+
+def multiplexer():
+    # Selects the data bit at the address given by a0 a1 a2
+    target = 0
+    for i, d in enumerate(DATA):
+        selected = TABLE[d]
+        for j, a in enumerate(ADDRESS):
+            if i & (4 >> j):
+                selected &= TABLE[a]
+            else:
+                selected &= ~TABLE[a]
+        target |= selected
+    return target & TABLE.mask
+
+TARGET = multiplexer()
+
+
+class Multiplexer(Chromosome):
+    functions = LOGIC_ALL
+    terminals = ADDRESS + DATA
+    
+    def _fitness(self):
+        # Fitness function: number of hits
+        return TABLE.hits(self.batch(TABLE), TARGET)
+    
+    def _solved(self):
+        return self.fitness >= TABLE.rows
+
+
+if __name__ == '__main__':
+    # Search for a solution
+    p = Population(Multiplexer, 100, 10, 4, or_linker)
+    print p
+
+    for _ in xrange(1000):
+        if p.best.solved:
+            break
+        p.cycle()
+        print
+        print p
+        
+    if p.best.solved:
+        print
+        print 'SOLVED:', p.best
@@ -1,33 +1,37 @@
-#!/usr/bin/env python2.5
+#!/usr/bin/env python2.7
 from pygep import *
+from pygep.fitness import relative_error, reward
 from pygep.functions.linkers import sum_linker
 from pygep.functions.mathematical.arithmetic import (add_op, subtract_op, 
-    multiply_op, divide_op)
+    multiply_op)
+from pygep.functions.protected import divide_op
+from array import array
 import random
 
 
 # Data points to test against and target function
 class DataPoint(object):
-    SAMPLE = []
+    SAMPLE = None # Dataset with columns x and y
     SAMPLE_SIZE = 10
     RANGE_LOW, RANGE_HIGH = -10.0, 10.0
     RANGE_SIZE = RANGE_HIGH - RANGE_LOW
 
-    def __init__(self, x):
-        self.x = float(x)
-
+    @staticmethod
+    def function(x):
         # The function we are trying to find
         # f(x) = 4*x^3 + 3x^2 + 2x + 1
-        #self.y = 4*(x**3) + 3*(x**2) + (2*x) + 1
-        self.y = (2.718 * x**2) + (3.141636 * x)
+        #return 4*(x**3) + 3*(x**2) + (2*x) + 1
+        return (2.718 * x**2) + (3.141636 * x)
 
     @staticmethod
     def populate():
-        # Creates a random sample of data points
-        DataPoint.SAMPLE = []
+        # Creates a random sample of data points, stored as columns
+        xs = array('d')
         for _ in xrange(DataPoint.SAMPLE_SIZE):
-            x = DataPoint.RANGE_LOW + (random.random() * DataPoint.RANGE_SIZE)
-            DataPoint.SAMPLE.append(DataPoint(x))
+            xs.append(DataPoint.RANGE_LOW + 
+                      (random.random() * DataPoint.RANGE_SIZE))
+        ys = array('d', (DataPoint.function(x) for x in xs))
+        DataPoint.SAMPLE = Dataset(x=xs, y=ys)
 
 
 # The chromsomes: fitness is accuracy over the sample
@@ -37,20 +41,11 @@ class Regression(Chromosome):
     terminals = 'x', '?'
     
     def _fitness(self):
-        # Fitness function: relative mean squared error
-        error = 0.0
-        for x in DataPoint.SAMPLE:
-            try:
-                guess = self(x) # Evaluation of this chromosome
-                error += ((guess - x.y) / x.y) ** 2
-            
-            except AttributeError: # programmer error
-                raise
-            
-            except: # unviable organism
-                return 0
-        
-        return self.REWARD * (1 / (1 + (error / DataPoint.SAMPLE_SIZE)))
+        # Fitness function: mean relative error over the whole sample at
+        # once, with unviable organisms rewarded 0 (see pygep.fitness)
+        results = self.batch(DataPoint.SAMPLE.columns)
+        error = relative_error(results, DataPoint.SAMPLE['y'])
+        return reward(error, self.REWARD)
     
     def _solved(self):
         return self.fitness >= self.REWARD
@@ -22,7 +22,7 @@ Copyright (C) 2007  Ryan J. O'Neil
 http://code.google.com/p/pygep/
 
 PyGEP is a simple library suitable for academic study of GEP (Gene 
-Expression Programming) in Python 2.5, aiming for ease of use and 
+Expression Programming) in Python 2.7, aiming for ease of use and 
 rapid implementation. It provides standard multigenic chromosomes; a 
 population class using elitism and fitness scaling for selection;
 mutation, crossover and transposition operators; and some standard 
@@ -32,7 +32,8 @@ This software is released under the GPL 2.0.
 '''
 
 from pygep.chromosome import Chromosome
+from pygep.data import Dataset
 from pygep.population import Population
 
 __version__ = '0.3.1'
-__all__ = 'Chromosome', 'Population'
+__all__ = 'Chromosome', 'Dataset', 'Population'
@@ -24,15 +24,79 @@ a set of terminal and function symbols.
 '''
 
 from pygep.functions.linkers import default_linker
-from pygep.gene import KarvaGene
-from pygep.util import cache
-import random
+from pygep.gene import KarvaGene, SymbolTable
+from pygep.util import cache, registry, stats
+import functools, math, random, time
+
+
+def _decode(cls, encoding):
+    '''@return: chromosome of type cls decoded from its compact encoding'''
+    return cls.decode(*encoding)
+
+
+def _recalled(func):
+    '''
+    Decorator for fitness functions that first looks for a fitness value
+    the chromosome can inherit and then for one in the fitness store of
+    the chromosome type, if it has one.  Computed values are stored, and
+    counted as 'fitness_evaluated'.
+    '''
+    @functools.wraps(func)
+    def wrapper(self):
+        '''Looks for the fitness of self before computing it'''
+        if self._inherit():
+            return getattr(self, self._fitness.cache)
+
+        store = self.store
+        if store is None:
+            stats.count('fitness_evaluated')
+            return func(self)
+
+        try:
+            return store[self]
+        except KeyError:
+            stats.count('fitness_evaluated')
+            fitness = func(self)
+            if not self.skipped: # values from racing are not final
+                store[self] = fitness
+            return fitness
+
+    return wrapper
+
+
+def mutation_sites(rate, length):
+    '''
+    Picks the loci to mutate in a sequence, each with probability rate.
+    Rather than drawing a random number per locus, this draws the gaps
+    between mutated loci from the geometric distribution, which gives the
+    same distribution with one draw per mutation.
+    @param rate:   mutation rate per locus
+    @param length: number of loci
+    @return:       generator of increasing locus indexes
+    '''
+    if rate >= 1:
+        for i in xrange(length):
+            yield i
+        return
+    
+    if rate <= 0:
+        return
+
+    log_miss, i = math.log(1.0 - rate), -1
+    while True:
+        # Number of loci skipped before the next mutation
+        i += 1 + int(math.log(1.0 - random.random()) / log_miss)
+        if i >= length:
+            return
+        yield i
 
 
 def symbol(symb):
     '''
     Decorator that assigns a symbol to a function for chromosome 
     display. The symbol is stored in the function.symbol attribute.
+    The function is also registered in pygep.util.registry, so that
+    chromosomes using it can be pickled.
 
         @symbol('/')
         def divide(x, y):
@@ -46,6 +110,30 @@ def symbol(symb):
         @param func: function to decorate
         '''
         func.symbol = symb
+        return registry.register(func)
+
+    return decorator
+
+
+def lazy(eager):
+    '''
+    Decorator that assigns a lazy form to a function for top-down 
+    evaluation (see pygep.gene.LazyKarvaGene).  The lazy form is stored in
+    eager.lazy.  It receives a thunk, a callable without arguments, for
+    each argument in place of its value, and need only call those it uses.
+
+        @lazy(if_op)
+        def if_lazy(i, j, k):
+            return j() if i() else k()
+
+    @param eager: function the decorated function is a lazy form of
+    '''
+    def decorator(func):
+        '''
+        Attaches func to the eager function as its 'lazy' attribute
+        @param func: lazy form
+        '''
+        eager.lazy = func
         return func
 
     return decorator
@@ -56,13 +144,15 @@ class MetaChromosome(type):
     Metaclass for computing various information about a chromosomal
     type.  Sets the following attributes on a chromosome class:
         - arity:   maximum functional arity
+        - arities: SymbolTable of arities (terminals map to None)
         - symbols: symbols that can reside in the head
-    Also turns caching of fitness values on for all chromosomes.
+    Also turns caching of fitness values on for all chromosomes, along
+    with the use of a fitness store if the type has one.
     '''
     def __new__(mcs, name, bases, dct):
         '''
         Prepares a chromosome type for use in GEP, assigning to 
-        cls.symbols, cls.arity, and caching the cls._fitness.
+        cls.symbols, cls.arity, cls.arities and caching the cls._fitness.
         
         @param mcs:   class to apply the metaclass to
         @param name:  name of the class
@@ -72,14 +162,18 @@ class MetaChromosome(type):
         typ = type.__new__(mcs, name, bases, dct)
         typ.symbols = typ.functions + typ.terminals
 
+        # Build the symbol table once, so genes never need to introspect
+        typ.arities = SymbolTable(typ.functions, typ.terminals)
+
         # Find the max arity
         try:
-            typ.arity = max([f.func_code.co_argcount for f in typ.functions])
+            typ.arity = max([typ.arities[f] for f in typ.functions])
         except ValueError:
             typ.arity = 0
 
-        # Cache fitness values
-        typ._fitness = cache(typ._fitness)
+        # Cache (and possibly store) fitness values
+        if '_fitness' in dct:
+            typ._fitness = cache(_recalled(typ._fitness))
         return typ
 
 
@@ -93,6 +187,31 @@ class Chromosome(object):
         - _fitness: fitness of a given individual
         - _solved:  True if the problem is optimally solved (optional)
 
+    Children produced by variation whose genes all have the same coding
+    regions as their parent's (or those of an earlier evaluated ancestor)
+    inherit its fitness without evaluation.
+    Chromosomes with fitness functions that depend on anything other than
+    the expressions their genes encode should set inherit_fitness = False.
+    Setting store to a pygep.store.FitnessStore keeps fitness values 
+    from one run to the next.
+
+    Chromosomes with finite = True check each result they return, and set
+    inviable = True at the first NaN or inf, so that fitness functions 
+    can stop evaluating them early.  With the protected functions in 
+    pygep.functions.protected, which return NaN and inf rather than 
+    raising exceptions, this replaces catching errors around evaluation.
+    Setting budget guards against individuals that are too costly to 
+    evaluate, such as those building huge integers with nested powers 
+    (see the bounded functions in pygep.functions.mathematical.power).
+    The time spent in evaluation is added up in spent, and once it exceeds
+    the budget, in seconds, the chromosome is marked inviable and counted
+    as 'guard_killed' in pygep.util.stats.counters.
+    The sample attribute holds the current batch of fitness cases when
+    a Population draws them with a sampler (see pygep.sampling).
+    Fitness functions may stop evaluating an individual once hopeless()
+    says it cannot reach the cutoff fitness (see pygep.racing), and the
+    number of fitness cases they skipped is kept in skipped.
+
     An example Chromosome that evolves simple arithmetic expressions
     on data objects providing attributes 'a' and 'b' and the constants
     1 and 2:
@@ -118,6 +237,14 @@ class Chromosome(object):
     __metaclass__ = MetaChromosome
     __next_id = 1
     gene_type = KarvaGene
+    inherit_fitness = True
+    store = None
+    finite = inviable = False
+    sample = None # fitness cases of the generation, when sampling
+    cutoff = None # fitness to reach when racing
+    skipped = 0
+    budget = None # evaluation time allowed per individual
+    spent  = 0.0
 
 
     functions = ()
@@ -151,7 +278,9 @@ class Chromosome(object):
                     rnc_l, dc = [], []
                     
                 
-                new_genes[i] = cls.gene_type(head_l + tail_l + rnc_l, head, dc)
+                new_genes[i] = cls.gene_type(
+                    head_l + tail_l + rnc_l, head, dc, cls.arities
+                )
 
             yield cls(new_genes, head, linker, dc)
 
@@ -225,15 +354,94 @@ class Chromosome(object):
         return chrom_str
 
 
+    def __reduce__(self):
+        '''
+        Pickles chromosomes in their compact encoding (see encode) along
+        with their ID and fitness value, if it is known.
+        '''
+        state = {'_Chromosome__id': self.__id}
+        if self.cutoff is not None: # for racing in other processes
+            state['cutoff'] = self.cutoff
+        try:
+            state[self._fitness.cache] = getattr(self, self._fitness.cache)
+        except AttributeError: # not evaluated
+            pass
+        
+        return _decode, (type(self), self.encode()), state
+
+
+    def encode(self):
+        '''
+        Encodes a chromosome compactly as (genes, head, linker, dc).  Each
+        gene is given in the form of KarvaGene.encode, and linkers that are
+        in pygep.util.registry are given by ID.
+        @return: encoded chromosome
+        '''
+        try:
+            linker = registry.identify(self.linker)
+        except KeyError: # unregistered linkers are pickled by name
+            linker = self.linker
+        
+        return [g.encode() for g in self.genes], self.head, linker, self.dc
+
+
+    @classmethod
+    def decode(cls, genes, head, linker, dc=None):
+        '''
+        Creates a chromosome from its compact encoding.  See encode().
+        @param genes:  encoded genes
+        @param head:   length (not index) of the gene heads
+        @param linker: linker function or registered linker ID
+        @param dc:     pregenerated RNC domain
+        @return:       new chromosome
+        '''
+        if isinstance(linker, int):
+            linker = registry.lookup(linker)
+        
+        genes = [cls.gene_type.decode(*g + (cls.arities,)) for g in genes]
+        return cls(genes, head, linker, dc)
+
+
     def _child(self, genes):
         '''
         Creates a child chromosome
         @param genes: ordered list of GEP genes
         @return:      a child chromosome of self
         '''
-        if genes != self.genes:
-            return type(self)(genes, self.head, self.linker)
-        return self
+        if genes == self.genes:
+            return self
+        
+        child = type(self)(genes, self.head, self.linker, self.dc)
+        
+        # Whether a fitness value is passed on is decided once the child is
+        # evaluated, since its genes may not have found their coding yet
+        if self.inherit_fitness:
+            child._parent = self
+        return child
+
+
+    def _inherit(self):
+        '''
+        Takes the fitness value of the closest evaluated ancestor, if the 
+        genes of self have the same coding regions as that ancestor's
+        @return: True if a fitness value was inherited
+        '''
+        genes  = self.genes
+        parent = self.__dict__.pop('_parent', None)
+        while parent is not None and len(parent.genes) == len(genes) and \
+              all(g1.same_coding(g2) for g1, g2 in zip(parent.genes, genes)):
+            try:
+                fitness = getattr(parent, self._fitness.cache)
+            except AttributeError: # not evaluated: try its parent
+                parent = parent.__dict__.get('_parent')
+            else:
+                setattr(self, self._fitness.cache, fitness)
+                if parent.skipped: # still a partial value from racing
+                    self.skipped = parent.skipped
+                stats.count('fitness_inherited')
+                return True
+
+        return False
 
 
     # Unique ID of the organism
@@ -249,7 +457,75 @@ class Chromosome(object):
         @param obj: an object instance with terminal attributes set
         @return:    result of evaluating the chromosome
         '''
-        return self.linker(*[g(obj) for g in self.genes])
+        if self.budget is None:
+            results = [g(obj) for g in self.genes]
+            result  = self.linker(*results)
+        else: # evaluation guard
+            start   = time.time()
+            results = [g(obj) for g in self.genes]
+            result  = self.linker(*results)
+            self._guard(time.time() - start)
+
+        if self.finite: # gene results and linked results, which may be tuples
+            results.extend(result if isinstance(result, tuple) else (result,))
+            if any(r - r != 0 for r in results): # NaN or inf
+                self.inviable = True
+        return result
+
+
+    def batch(self, columns):
+        '''
+        Evaluates a chromosome over a columnar dataset in a single pass per
+        gene.  Gene results are linked with the vector form of the linker.
+        Requires NumPy.  See pygep.vector.
+
+        @param columns: mapping of terminal name to NumPy array
+        @return:        result of linking the gene result arrays
+        '''
+        from pygep.vector import Columns, link # only needed for batches
+        import numpy
+        start   = time.time()
+        results = [g.batch(columns) for g in self.genes]
+        if isinstance(columns, Columns): # registered datasets link their own
+            results = columns.link(self.linker, results)
+        else:
+            results = link(self.linker, results)
+
+        if self.budget is not None:
+            self._guard(time.time() - start)
+
+        if self.finite and not numpy.isfinite(results).all():
+            self.inviable = True
+        return results
+
+
+    def _guard(self, seconds):
+        '''
+        Charges evaluation time against the budget, killing the chromosome
+        (marking it inviable) the first time the budget is exceeded
+        @param seconds: time spent evaluating the chromosome
+        '''
+        self.spent += seconds
+        if self.spent > self.budget and not self.inviable:
+            self.inviable = True
+            stats.count('guard_killed')
+
+
+    def hopeless(self, bound, remaining):
+        '''
+        Racing: reports an upper bound on the fitness of self partway
+        through evaluation.  If the bound cannot reach the cutoff, the
+        remaining fitness cases are counted as skipped.
+        @param bound:     highest fitness self could still reach
+        @param remaining: number of fitness cases not yet evaluated
+        @return:          True if the fitness function should stop
+        '''
+        if self.cutoff is None or bound >= self.cutoff or not remaining:
+            return False
+
+        self.skipped += remaining
+        stats.count('cases_skipped', remaining)
+        return True
 
 
     def _fitness(self):
@@ -272,29 +548,47 @@ class Chromosome(object):
         @param rate: mutation rate per locus
         @return:     child chromosome (or self)
         '''
-        genes = list(self.genes)
+        return self.mutate_at(mutation_sites(rate, len(self)))
+
+
+    def mutate_at(self, loci):
+        '''
+        Produces a new chromosome via point mutation on the given loci.  If
+        nothing changes, the original chromosome is returned.
+
+        @param loci: increasing allele indexes, counting gene after gene
+        @return:     child chromosome (or self)
+        '''
+        genes  = list(self.genes)
+        loci   = iter(loci)
+        locus  = next(loci, None)
+        offset = 0
         
         # Traverse the chromosome gene by gene
         for gene_idx, gene in enumerate(self.genes):
-            # Then locus by locus
-            replacements = []
-            for i, allele in enumerate(gene):
-                # Do we mutate this locus?
-                if random.random() < rate:
-                    # Mutation within the tail can only use terminals
-                    if i >= self.head:
-                        new_allele = random.choice(self.terminals)
-                    else:
-                        new_allele = random.choice(self.symbols)
-                    
-                    # Only use this if the mutation actually did something
-                    if new_allele != allele:
-                        replacements.append((i, [new_allele]))
-
+            # Then through the loci to mutate within this gene
+            end, replacements = offset + len(gene), []
+            while locus is not None and locus < end:
+                i, allele = locus - offset, gene[locus - offset]
+                locus = next(loci, None)
+                
+                # Mutation within the RNC region picks new indexes,
+                # and mutation within the tail can only use terminals
+                if gene.dc and i >= gene.rnc:
+                    new_allele = random.randrange(len(gene.dc))
+                elif i >= self.head:
+                    new_allele = random.choice(self.terminals)
+                else:
+                    new_allele = random.choice(self.symbols)
+                
+                # Only use this if the mutation actually did something
+                if new_allele != allele:
+                    replacements.append((i, [new_allele]))
 
             # If we have actual replacements to make, do them
             if replacements:
                 genes[gene_idx] = gene.derive(replacements)
+            offset = end
             
         # Create a child of this chromosome
         return self._child(genes)
@@ -0,0 +1,297 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Provides columnar datasets of fitness cases.  Rather than one Python 
+object per row with an attribute per terminal, a Dataset keeps one 
+compact column per terminal, as either a NumPy array or an array.array:
+
+    sample = Dataset(x=array('d', xs), y=array('d', ys))
+    for row in sample:
+        guess = chromosome(row)
+        error += (guess - row.y) ** 2
+
+Rows are views that look up their terminals in the columns, so they work
+with the scalar evaluation of chromosomes as is.  Row values are plain 
+Python numbers, so semantic errors in scalar evaluation still raise the 
+usual exceptions.  The batch engines of pygep.vector use the columns
+directly through the columns attribute:
+
+    results = chromosome.batch(sample.columns)
+
+Two rows of the same dataset with the same index are equal, so gene 
+results memoized for a row are found again on the next pass over the
+dataset.  NumPy is only required for the columns attribute, and for 
+columns given as sequences other than arrays.
+
+Delimited text files too large to hold in memory can be converted to
+binary column files a chunk of lines at a time with ingest().  The 
+columns are then opened through numpy.memmap, so evaluation reads pages
+from disk as it goes:
+
+    sample = ingest('cancer1.dt', 'cancer1', 'abcdefghi', skip=7,
+                    derived={'benign': lambda fields: fields[-2] == '1'})
+
+Column files are named for their column and array typecode (a.d, b.d...)
+and may be opened again later with open_columns(directory).
+'''
+
+from array import array
+from itertools import islice
+from pygep.util import cache
+import os
+
+
+__all__ = 'Dataset', 'Row', 'ingest', 'open_columns'
+
+
+def _column(values):
+    '''
+    @param values: NumPy array, array.array or other sequence of numbers
+    @return:       values as a NumPy array or array.array
+    '''
+    if isinstance(values, array) or hasattr(values, '__array_interface__'):
+        return values
+
+    try:
+        import numpy
+    except ImportError: # keep floats in arrays instead
+        return array('d', values)
+    return numpy.asarray(values)
+
+
+def _take(column, indexes):
+    '''@return: copy of the values at some indexes of a column'''
+    if isinstance(column, array):
+        return array(column.typecode, [column[i] for i in indexes])
+    return column[list(indexes)]
+
+
+class Row(object):
+    '''
+    A view of one row in a Dataset.  Terminal names are attributes.
+    '''
+    __slots__ = 'dataset', 'index'
+
+
+    def __init__(self, dataset, index):
+        '''
+        Creates a view of a dataset row
+        @param dataset: Dataset instance
+        @param index:   row index, from 0 to len(dataset) - 1
+        '''
+        self.dataset = dataset
+        self.index   = index
+
+
+    def __getattr__(self, name):
+        if name in Row.__slots__: # not yet set, as when unpickling
+            raise AttributeError(name)
+        try:
+            return self.dataset._getters[name](self.index)
+        except KeyError:
+            raise AttributeError(name)
+
+
+    def __hash__(self):
+        return hash((id(self.dataset), self.index))
+
+
+    def __eq__(self, other):
+        return isinstance(other, Row) and \
+               self.dataset is other.dataset and self.index == other.index
+
+
+    def __ne__(self, other):
+        return not self == other
+
+
+    def __repr__(self):
+        values = ', '.join('%s=%r' % (name, getattr(self, name)) 
+                           for name in sorted(self.dataset.names))
+        return 'Row(%s)' % values
+
+
+class Dataset(object):
+    '''
+    A columnar dataset of fitness cases.  Supports len(), iteration over
+    Row views, indexing by row number or slice, column access by name and
+    taking arbitrary rows with take().
+    Slices of NumPy columns are views, but slices of array.array columns 
+    are copies.  Datasets should not be modified once they have been used.
+    '''
+    def __init__(self, columns=(), **kwds):
+        '''
+        Creates a dataset from equal length columns
+        @param columns: mapping of terminal name to column, or pairs of them
+        @param kwds:    more terminal names and columns
+        '''
+        self._columns = dict((name, _column(values)) 
+                             for name, values in dict(columns, **kwds).items())
+        lengths = set(len(c) for c in self._columns.itervalues())
+        if len(lengths) > 1:
+            raise ValueError('Columns must all have the same length')
+        self._length = lengths and lengths.pop() or 0
+
+        # NumPy scalars divide by zero without errors, so return Python ones
+        self._getters = dict(
+            (name, getattr(column, 'item', column.__getitem__))
+            for name, column in self._columns.iteritems()
+        )
+
+
+    names = property(lambda self: self._columns.keys(), 
+                     doc='Names of the columns')
+
+
+    def __len__(self):
+        return self._length
+
+
+    def __iter__(self):
+        for i in xrange(self._length):
+            yield Row(self, i)
+
+
+    def __getitem__(self, key):
+        '''
+        @param key: row index, slice of rows or column name
+        @return:    Row view, Dataset or column
+        '''
+        if isinstance(key, basestring):
+            return self._columns[key]
+
+        if isinstance(key, slice):
+            return Dataset((name, column[key]) 
+                           for name, column in self._columns.iteritems())
+
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError('Dataset row index out of range')
+        return Row(self, key)
+
+
+    def take(self, indexes):
+        '''
+        @param indexes: sequence of row indexes
+        @return:        Dataset of copies of those rows
+        '''
+        return Dataset((name, _take(column, indexes))
+                       for name, column in self._columns.iteritems())
+
+
+    def __reduce__(self):
+        return Dataset, (self._columns,)
+
+
+    def __repr__(self):
+        return '<Dataset of %d rows: %s>' % \
+               (self._length, ', '.join(sorted(self._columns)))
+
+
+    def _get_columns(self):
+        '''@return: columns as NumPy arrays, registered for memoization'''
+        from pygep.vector import Columns # only needed for batches
+        import numpy
+
+        columns = Columns()
+        for name, column in self._columns.iteritems():
+            if isinstance(column, array): # shares memory with the array
+                column = numpy.frombuffer(column, column.typecode)
+            columns[name] = column
+        return columns
+
+    columns = property(cache(_get_columns), doc='Columns for batches')
+
+
+def ingest(path, directory, names, delimiter=None, skip=0, derived=(), 
+           typecode='d', chunksize=10000):
+    '''
+    Converts a delimited text file to binary column files, reading it a
+    chunk of lines at a time, and maps the new columns from disk.
+    Blank lines are ignored.  Fields are converted to floats, as are the 
+    values returned by the derived column functions, which receive the 
+    list of fields of a line.  They might map label fields to a class.
+
+    @param path:      delimited text file
+    @param directory: directory for the column files, created if needed
+    @param names:     column name for each leading field, or None to skip it
+    @param delimiter: field delimiter (default: any whitespace)
+    @param skip:      number of header lines to skip
+    @param derived:   mapping (or pairs) of column name to function of
+                      the fields
+    @param typecode:  array typecode of the column files: 'd' or 'f'
+    @param chunksize: lines converted at a time
+    @return:          Dataset of memory mapped columns
+    '''
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    fields  = [(i, n) for i, n in enumerate(names) if n is not None]
+    derived = dict(derived).items()
+    files   = dict((n, os.path.join(directory, '%s.%s' % (n, typecode)))
+                   for n in [n for _, n in fields] + [n for n, _ in derived])
+    outputs = dict((n, open(f, 'wb')) for n, f in files.iteritems())
+    
+    lines = open(path)
+    try:
+        for line in islice(lines, skip): # header
+            pass
+
+        while True:
+            chunk = list(islice(lines, chunksize))
+            if not chunk:
+                break
+
+            chunk = [l.split(delimiter) for l in chunk if l.strip()]
+            for i, name in fields:
+                array(typecode, [float(r[i]) for r in chunk]).tofile(
+                    outputs[name])
+            for name, func in derived:
+                array(typecode, [float(func(r)) for r in chunk]).tofile(
+                    outputs[name])
+
+    finally:
+        lines.close()
+        for output in outputs.itervalues():
+            output.close()
+
+    return Dataset((n, _map(f)) for n, f in files.iteritems())
+
+
+def open_columns(directory):
+    '''
+    Opens the binary column files written by ingest() through numpy.memmap
+    @param directory: directory holding only column files
+    @return:          Dataset of read only, memory mapped columns
+    '''
+    columns = {}
+    for filename in os.listdir(directory):
+        name = os.path.splitext(filename)[0]
+        columns[name] = _map(os.path.join(directory, filename))
+    return Dataset(columns)
+
+
+def _map(path):
+    '''@return: read only NumPy array of a column file, mapped from disk'''
+    import numpy
+
+    typecode = os.path.splitext(path)[1][1:]
+    if os.path.getsize(path):
+        return numpy.memmap(path, typecode, 'r')
+    return numpy.zeros(0, typecode) # empty files cannot be mapped
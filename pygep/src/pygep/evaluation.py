@@ -0,0 +1,156 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Provides fitness evaluation backends for populations.  An evaluator is
+any callable accepting a sequence of chromosomes that makes sure all of
+their fitness values are cached once it returns:
+    - serial:      evaluates each chromosome in turn (the default)
+    - ProcessPool: evaluates chromosomes in parallel worker processes
+
+Worker processes receive chromosomes pickled in their compact encoding
+(see Chromosome.encode) and return fitness values, which are written back
+into the fitness caches of the originals along with their inviable flags,
+the time they spent against their evaluation budgets and the fitness
+cases they skipped by racing (see pygep.racing).  On platforms
+that fork, workers see the module level data (such as fitness samples) 
+that existed when the pool was started.  Both evaluators look up the
+fitness stores of chromosome types (see pygep.store) in batches, so that
+only the chromosomes with unknown fitness values are evaluated.  Example usage:
+
+    from pygep.evaluation import ProcessPool
+    p = Population(Regression, 1000, 6, 4, sum_linker, ProcessPool())
+'''
+
+from pygep.util import stats
+
+
+__all__ = 'serial', 'ProcessPool'
+
+
+def uncached(chromosomes):
+    '''
+    Finds the chromosomes that do not yet have a cached fitness value.  A 
+    chromosome that appears more than once is only returned once.
+    @param chromosomes: sequence of chromosomes
+    @return:            list of chromosomes requiring evaluation
+    '''
+    seen, pending = set(), []
+    for chromosome in chromosomes:
+        if id(chromosome) not in seen:
+            seen.add(id(chromosome))
+            if not hasattr(chromosome, chromosome._fitness.cache):
+                pending.append(chromosome)
+    return pending
+
+
+def restore(chromosomes):
+    '''
+    Caches the fitness values of chromosomes that can inherit them, then of
+    those found in the fitness store of their type (see pygep.store), if
+    it has one
+    @param chromosomes: list of chromosomes without cached fitness values
+    @return:            list of chromosomes still requiring evaluation
+    '''
+    chromosomes = [c for c in chromosomes if not c._inherit()]
+    if chromosomes and chromosomes[0].store is not None:
+        return chromosomes[0].store.restore(chromosomes)
+    return chromosomes
+
+
+def serial(chromosomes):
+    '''
+    Evaluates the fitness of each chromosome in the current process
+    @param chromosomes: sequence of chromosomes
+    '''
+    for chromosome in restore(uncached(chromosomes)):
+        chromosome.fitness
+
+
+def _fitness(chromosome):
+    '''
+    Evaluates a chromosome in a worker process
+    @param chromosome: chromosome to evaluate
+    @return:           fitness, inviable flag, evaluation time spent and
+                       number of fitness cases skipped
+    '''
+    return chromosome.fitness, chromosome.inviable, chromosome.spent, \
+           chromosome.skipped
+
+
+class ProcessPool(object):
+    '''
+    Evaluates chromosomes in a pool of worker processes via the 
+    multiprocessing module.  Chromosomes are sent to the workers in 
+    chunks to keep dispatch overhead low for cheap fitness functions.
+    The pool is started on first use and lives until close() is called.
+    '''
+    chunks = 4 # chunks per worker per generation, when not given a size
+    
+
+    def __init__(self, processes=None, chunksize=None):
+        '''
+        Prepares a process pool evaluator
+        @param processes: number of workers (default: number of CPUs)
+        @param chunksize: chromosomes per task (default: balanced)
+        '''
+        self.processes = processes
+        self.chunksize = chunksize
+        self._pool     = None
+
+
+    def __call__(self, chromosomes):
+        '''
+        Evaluates all uncached chromosomes in parallel
+        @param chromosomes: sequence of chromosomes
+        '''
+        pending = restore(uncached(chromosomes))
+        if not pending:
+            return
+
+        if self._pool is None:
+            import multiprocessing # Python 2.6+
+            self.processes = self.processes or multiprocessing.cpu_count()
+            self._pool = multiprocessing.Pool(self.processes)
+
+        chunksize = self.chunksize or \
+            max(1, len(pending) // (self.processes * self.chunks))
+        results = self._pool.map(_fitness, pending, chunksize)
+
+        store = pending[0].store
+        for chromosome, result in zip(pending, results):
+            value, inviable, spent, skipped = result
+            setattr(chromosome, chromosome._fitness.cache, value)
+            if chromosome.budget is not None: # count kills by the guard
+                chromosome._guard(spent)
+            if inviable:
+                chromosome.inviable = True
+            if skipped: # stopped early by racing
+                chromosome.skipped = skipped
+                stats.count('cases_skipped', skipped)
+            elif store is not None:
+                store[chromosome] = value
+        stats.count('fitness_evaluated', len(pending))
+        stats.count('fitness_parallel', len(pending))
+
+
+    def close(self):
+        '''Shuts down the worker processes'''
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
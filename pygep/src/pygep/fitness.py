@@ -0,0 +1,235 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Provides standard fitness measures computed over the result vectors of
+batch evaluation (see pygep.vector), so that fitness functions need not
+loop over their fitness cases in Python:
+
+    class Regression(Chromosome):
+        def _fitness(self):
+            results = self.batch(SAMPLE.columns)
+            return reward(rmse(results, SAMPLE['y']))
+
+Error measures, for which lower values are better:
+    - rmse:           root mean squared error
+    - mae:            mean absolute error
+    - relative_error: mean absolute error relative to the target
+    - log_loss:       cross entropy of predicted probabilities
+
+Score measures, for which higher values are better:
+    - r_squared:      squared correlation of results and target
+    - hits:           number of results within a tolerance of the target
+    - accuracy:       share of fitness cases classified correctly
+    - sensitivity:    share of positive fitness cases classified correctly
+    - specificity:    share of negative fitness cases classified correctly
+
+Results containing NaN or inf are inviable: error measures give inf for
+them, and r_squared gives 0.  Hits and the classification measures count
+fitness cases with NaN or inf results as misses.  Since populations want
+fitness values to maximize, reward turns errors into fitness values with
+inf errors at 0.  Requires NumPy.
+'''
+
+from pygep.functions.protected import INF
+import functools, numpy
+
+
+__all__ = 'INF', 'viable', 'reward', 'rmse', 'mae', 'relative_error', \
+          'log_loss', 'r_squared', 'hits', 'accuracy', 'sensitivity', \
+          'specificity'
+
+
+def _quiet(measure):
+    '''Decorator computing a measure with NumPy floating point errors off'''
+    @functools.wraps(measure)
+    def wrapper(*args, **kwds):
+        errors = numpy.seterr(all='ignore')
+        try:
+            return measure(*args, **kwds)
+        finally:
+            numpy.seterr(**errors)
+
+    return wrapper
+
+
+def _arrays(results, target):
+    '''
+    @param results: results of batch evaluation, or a single result
+    @param target:  expected results
+    @return:        results and target as float arrays of the same shape
+    '''
+    target  = numpy.asarray(target, float)
+    results = numpy.asarray(results, float)
+    if results.shape != target.shape: # constant chromosomes
+        results = results + numpy.zeros(target.shape)
+    return results, target
+
+
+def _classes(results, target, threshold):
+    '''
+    @return: positive predictions, positive targets and finite results
+    '''
+    results, target = _arrays(results, target)
+    return results > threshold, target != 0, numpy.isfinite(results)
+
+
+def viable(results):
+    '''@return: True if results contains no NaN or inf values'''
+    return bool(numpy.isfinite(results).all())
+
+
+def reward(error, maximum=1000.0):
+    '''
+    Turns an error into a fitness value, as maximum / (1 + error)
+    @param error:   error measure, with 0 for a perfect solution
+    @param maximum: fitness of a perfect solution
+    @return:        fitness value between 0 and maximum
+    '''
+    if error - error != 0: # NaN or inf
+        return 0.0
+    return maximum / (1.0 + error)
+
+
+@_quiet
+def rmse(results, target):
+    '''@return: root mean squared error of results, or inf if inviable'''
+    results, target = _arrays(results, target)
+    if not viable(results):
+        return INF
+    return float(numpy.sqrt(numpy.mean(numpy.square(results - target))))
+
+
+@_quiet
+def mae(results, target):
+    '''@return: mean absolute error of results, or inf if inviable'''
+    results, target = _arrays(results, target)
+    if not viable(results):
+        return INF
+    return float(numpy.mean(numpy.abs(results - target)))
+
+
+@_quiet
+def relative_error(results, target):
+    '''
+    Mean absolute error relative to the target.  Targets of 0 give inf
+    unless they are matched exactly.
+    @return: mean relative error of results, or inf if inviable
+    '''
+    results, target = _arrays(results, target)
+    if not viable(results):
+        return INF
+    errors = numpy.abs(results - target) / numpy.abs(target)
+    errors[results == target] = 0 # including 0 / 0
+    return float(numpy.mean(errors))
+
+
+@_quiet
+def log_loss(results, target, epsilon=1e-15):
+    '''
+    Cross entropy of predicted probabilities against targets of 0 or 1.
+    Probabilities are clipped to [epsilon, 1 - epsilon].
+    @param results: predicted probabilities of the positive class
+    @param target:  1 for positive fitness cases, else 0
+    @param epsilon: clipping bound keeping the loss finite
+    @return:        mean log loss, or inf if inviable
+    '''
+    results, target = _arrays(results, target)
+    if not viable(results):
+        return INF
+    results = numpy.clip(results, epsilon, 1 - epsilon)
+    return float(-numpy.mean(target * numpy.log(results) + 
+                             (1 - target) * numpy.log(1 - results)))
+
+
+@_quiet
+def r_squared(results, target):
+    '''
+    Squared Pearson correlation of results and target, as in Ferreira's
+    R-square fitness.  Constant results do not correlate with anything.
+    @return: value between 0 and 1, or 0 if inviable
+    '''
+    results, target = _arrays(results, target)
+    if not viable(results):
+        return 0.0
+    results = results - results.mean()
+    target  = target - target.mean()
+    product = numpy.sum(results * results) * numpy.sum(target * target)
+    if not product:
+        return 0.0
+    return float(min(1.0, numpy.sum(results * target) ** 2 / product))
+
+
+@_quiet
+def hits(results, target, tolerance=0.01, relative=False):
+    '''
+    @param results:   results of batch evaluation
+    @param target:    expected results
+    @param tolerance: largest error of a hit
+    @param relative:  if True, tolerance is relative to the target
+    @return:          number of results within tolerance of the target
+    '''
+    results, target = _arrays(results, target)
+    if relative:
+        tolerance = tolerance * numpy.abs(target)
+    return int(numpy.sum(numpy.abs(results - target) <= tolerance))
+
+
+@_quiet
+def accuracy(results, target, threshold=0):
+    '''
+    @param results:   results of batch evaluation
+    @param target:    true (nonzero) for positive fitness cases
+    @param threshold: results above threshold are positive predictions
+    @return:          share of fitness cases classified correctly
+    '''
+    predicted, actual, finite = _classes(results, target, threshold)
+    if not len(actual):
+        return 0.0
+    return float(numpy.sum((predicted == actual) & finite)) / len(actual)
+
+
+@_quiet
+def sensitivity(results, target, threshold=0):
+    '''
+    True positive rate, or 1 if there are no positive fitness cases
+    @param results:   results of batch evaluation
+    @param target:    true (nonzero) for positive fitness cases
+    @param threshold: results above threshold are positive predictions
+    @return:          share of positive fitness cases predicted positive
+    '''
+    predicted, actual, finite = _classes(results, target, threshold)
+    positives = numpy.sum(actual)
+    if not positives:
+        return 1.0
+    return float(numpy.sum(predicted & actual & finite)) / positives
+
+
+@_quiet
+def specificity(results, target, threshold=0):
+    '''
+    True negative rate, or 1 if there are no negative fitness cases
+    @param results:   results of batch evaluation
+    @param target:    true (nonzero) for positive fitness cases
+    @param threshold: results above threshold are positive predictions
+    @return:          share of negative fitness cases predicted negative
+    '''
+    predicted, actual, finite = _classes(results, target, threshold)
+    negatives = numpy.sum(~actual)
+    if not negatives:
+        return 1.0
+    return float(numpy.sum(~predicted & ~actual & finite)) / negatives
@@ -19,6 +19,7 @@
 Provides pre-packaged GEP function libraries:
     - pygep.functions.mathematical
     - pygep.functions.logical
+    - pygep.functions.protected: mathematics returning NaN or inf
     
 And linkers for multigenic chromosomes:
     -pygep.functions.linkers
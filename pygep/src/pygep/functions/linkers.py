@@ -27,9 +27,13 @@ Most common linkers:
 '''
 
 
+from pygep.util.registry import register
+
+
 __all__ = 'default_linker', 'sum_linker', 'or_linker'
 
 
+@register
 def default_linker(*args):
     '''@return: either a single value or a tuple, depending on context'''
     if len(args) == 1:
@@ -37,11 +41,13 @@ def default_linker(*args):
     return args
 
 
+@register
 def sum_linker(*args):
     '''@return: the sum of all sub-ETs'''
     return sum(args)
 
 
+@register
 def or_linker(*args):
     '''@return: the OR of all given args'''
     for arg in args:
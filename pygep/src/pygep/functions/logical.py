@@ -25,9 +25,12 @@ Common logic non-terminal functions:
     - (|) or_op:  i or j or 0
     - (!) not_op: 0 if i else 1
     - (I) if_op:  j if i else k
+
+The binary operators and if_op have lazy forms that only evaluate their
+later arguments when the result depends on them (see LazyKarvaGene).
 '''
 
-from pygep.chromosome import symbol
+from pygep.chromosome import lazy, symbol
 
 
 __all__ = 'LOGIC_ALL', 'LOGIC_ARITY_1', 'LOGIC_ARITY_2', 'LOGIC_ARITY_3'
@@ -39,6 +42,23 @@ not_op = symbol('!')(lambda i: 0 if i else 1)
 if_op  = symbol('I')(lambda i, j, k: j if i else k)
 
 
+@lazy(and_op)
+def and_lazy(i, j):
+    '''@return: and_op, evaluating j only if i is true'''
+    i = i()
+    return i if i and j() else 0
+
+@lazy(or_op)
+def or_lazy(i, j):
+    '''@return: or_op, evaluating j only if i is false'''
+    return i() or j() or 0
+
+@lazy(if_op)
+def if_lazy(i, j, k):
+    '''@return: if_op, evaluating only the branch chosen by i'''
+    return j() if i() else k()
+
+
 LOGIC_ARITY_1 = not_op,
 LOGIC_ARITY_2 = and_op, or_op
 LOGIC_ARITY_3 = if_op,
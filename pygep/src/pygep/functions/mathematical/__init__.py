@@ -20,7 +20,9 @@ Provides basic arithmetic non-terminals for use in Chromosomes.
 Any semantic exceptions (ZeroDivisionError, etc.) are passed up
 the call chain to the user.  Typically one should catch any
 exceptions when calling chromosome.evaluate() and set the fitness
-of nonviable organisms to 0.
+of nonviable organisms to 0.  Alternatively, the protected versions
+of these functions in pygep.functions.protected return NaN or inf
+instead of raising.
 
 Provides pre-packaged GEP mathematics functions:
     - pygep.functions.mathematical.arithmetic
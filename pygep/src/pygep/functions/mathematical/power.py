@@ -27,13 +27,60 @@ Common exponential and logarithmic non-terminal functions and symbols:
     - (Q    ) root_op:      math.sqrt(x)
     - (Q3   ) cube_root_op: x ** (1./3)
     - (^-1  ) inverse_op:   1 / x
+
+Integer arguments make integer results, which can grow without bound when
+powers are nested.  The bounded versions of the exponential functions
+compare the logarithm of the magnitude of a result to that of 
+MAX_MAGNITUDE before computing it, and return inf (or -inf) instead of 
+an unreasonably large number or an OverflowError:
+    - (^    ) bounded_power_op:  x ** y
+    - (E^   ) bounded_exp_op:    e ** x
+    - (10^  ) bounded_pow10_op:  10 ** x
+    - (^2   ) bounded_square_op: x ** 2
+    - (^3   ) bounded_cube_op:   x ** 3
 '''
 
 from pygep.chromosome import symbol
 import math
 
 
-__all__ = 'POWER_ALL', 'POWER_ARITY_1', 'POWER_ARITY_2'
+__all__ = 'POWER_ALL', 'POWER_ARITY_1', 'POWER_ARITY_2', \
+          'POWER_BOUNDED_ALL', 'POWER_BOUNDED_ARITY_1', \
+          'POWER_BOUNDED_ARITY_2'
+
+
+MAX_MAGNITUDE = 1e300 # well within float range, so results still convert
+_MAX_LOG = math.log(MAX_MAGNITUDE)
+_INF = float('inf')
+
+
+def _bounded(i, j):
+    '''@return: i ** j, or +/-inf if its magnitude exceeds MAX_MAGNITUDE'''
+    try:
+        exponent = float(j)
+    except OverflowError: # ints beyond float range
+        exponent = _INF if j > 0 else -_INF
+
+    if i and exponent * math.log(abs(i)) > _MAX_LOG:
+        if i < 0 and j % 2 == 1:
+            return -_INF
+        return _INF
+
+    if exponent - exponent != 0 and not isinstance(j, float):
+        if abs(i) in (0, 1): # same result for a small j of the same parity
+            return i ** ((2 if j > 0 else -2) + j % 2)
+        return 0.0 # magnitude too small for a float
+
+    try:
+        return i ** j
+    except OverflowError: # int bases beyond float range
+        magnitude = math.exp(exponent * math.log(abs(i)))
+        if i < 0 and j % 1:
+            raise ValueError('negative number cannot be raised to a '
+                             'fractional power')
+        if i < 0 and j % 2:
+            return -magnitude
+        return magnitude
 
 
 ln_op        = symbol('LN'   )(lambda i: math.log(i))
@@ -48,7 +95,21 @@ cube_root_op = symbol('Q3'   )(lambda i: i ** (1./3))
 inverse_op   = symbol('^-1'  )(lambda i: 1. / i)
 
 
+bounded_power_op  = symbol('^'  )(_bounded)
+bounded_exp_op    = symbol('E^' )(
+    lambda i: _INF if i > _MAX_LOG else math.exp(max(i, -1000))) # 0.0
+bounded_pow10_op  = symbol('10^')(lambda i: _bounded(10, i))
+bounded_square_op = symbol('^2' )(lambda i: _bounded(i, 2))
+bounded_cube_op   = symbol('^3' )(lambda i: _bounded(i, 3))
+
+
 POWER_ARITY_1 = ln_op, log10_op, root_op, exp_op, pow10_op, square_op, \
                 cube_op, inverse_op
 POWER_ARITY_2 = power_op,
 POWER_ALL = POWER_ARITY_1 + POWER_ARITY_2
+
+POWER_BOUNDED_ARITY_1 = ln_op, log10_op, root_op, bounded_exp_op, \
+                        bounded_pow10_op, bounded_square_op, \
+                        bounded_cube_op, inverse_op
+POWER_BOUNDED_ARITY_2 = bounded_power_op,
+POWER_BOUNDED_ALL = POWER_BOUNDED_ARITY_1 + POWER_BOUNDED_ARITY_2
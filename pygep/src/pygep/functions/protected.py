@@ -0,0 +1,226 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Provides protected versions of the pygep.functions.mathematical functions
+that can fail.  Rather than raising ZeroDivisionError, ValueError or 
+OverflowError, these return the IEEE 754 values that NumPy would: inf for
+division by zero and overflow, NaN for arguments outside of a domain.  
+Semantic errors are thus never raised in the middle of an evaluation, and
+a Chromosome with finite = True is marked inviable by the first NaN or
+inf it produces.  Results are floats, except that +, - and * keep ints
+when they can.  Ints beyond float range, as from multiplying large ints,
+count as inf.
+
+Protected non-terminal functions, with the same symbols as the originals:
+    - (+    ) add_op:          x + y
+    - (-    ) subtract_op:     x - y
+    - (*    ) multiply_op:     x * y
+    - (/    ) divide_op:       x / y
+    - (%    ) modulus_op:      x % y
+    - (LN   ) ln_op:           math.log(x)
+    - (LOG10) log10_op:        math.log10(x)
+    - (^    ) power_op:        x ** y
+    - (E^   ) exp_op:          e ** x
+    - (10^  ) pow10_op:        10 ** x
+    - (^2   ) square_op:       x ** 2
+    - (^3   ) cube_op:         x ** 3
+    - (Q    ) root_op:         math.sqrt(x)
+    - (Q3   ) cube_root_op:    x ** (1./3)
+    - (^-1  ) inverse_op:      1 / x
+    - (SINH ) sineh_op:        math.sinh(x)
+    - (COSH ) cosineh_op:      math.cosh(x)
+    - (CSCH ) cosecanth_op:    1 / math.sinh(x)
+    - (SECH ) secanth_op:      1 / math.cosh(x)
+    - (TANH ) tangenth_op:     math.tanh(x)
+    - (COTH ) cotangenth_op:   1 / math.tanh(x)
+    - (SIN  ) sine_op:         math.sin(x)
+    - (COS  ) cosine_op:       math.cos(x)
+    - (TAN  ) tangent_op:      math.tan(x)
+    - (CSC  ) cosecant_op:     1 / math.sin(x)
+    - (SEC  ) secant_op:       1 / math.cos(x)
+    - (COT  ) cotangent_op:    1 / math.tan(x)
+    - (ASIN ) arcsine_op:      math.asin(x)
+    - (ACOS ) arccosine_op:    math.acos(x)
+    - (ATAN ) arctangent_op:   math.atan(x)
+    - (ACSC ) arccosecant_op:  1 / math.asin(x)
+    - (ASEC ) arcsecant_op:    1 / math.acos(x)
+    - (ACOT ) arccotangent_op: 1 / math.atan(x)
+    - (FLOOR) floor_op:        math.floor(x)
+    - (CEIL ) ceil_op:         math.ceil(x)
+    - (ROUND) round_op:        round(x)
+
+The PROTECTED tuples stand in for the MATH tuples, and include the 
+mathematical functions that never raise as they are.
+'''
+
+from pygep.chromosome import symbol
+from pygep.functions.mathematical import comparison, constants, rounding
+import math, operator, sys
+
+
+__all__ = 'INF', 'NAN', 'finite', 'PROTECTED_ALL', 'PROTECTED_ARITY_0', \
+          'PROTECTED_ARITY_1', 'PROTECTED_ARITY_2'
+
+
+INF = float('inf')
+NAN = INF - INF
+
+_MAX_LOG = math.log(sys.float_info.max) # largest x for which e**x is finite
+_MAX_HYP = _MAX_LOG + math.log(2)       # same for sinh(x) and cosh(x)
+
+
+def finite(x):
+    '''@return: True if x is neither NaN nor inf'''
+    return x - x == 0 # inf - inf and NaN - NaN are both NaN
+
+
+def _float(x):
+    '''@return: x as a float, +/-inf for ints beyond float range'''
+    try:
+        return float(x)
+    except OverflowError:
+        return INF if x > 0 else -INF
+
+
+def _divide(i, j):
+    '''@return: i / j as a float, inf or NaN if j is 0'''
+    if j:
+        return _float(i) / _float(j)
+    if i and i == i:
+        return math.copysign(INF, _float(i)) * math.copysign(1, j)
+    return NAN
+
+
+def _arithmetic(op, i, j):
+    '''@return: op(i, j), computed with floats if ints overflow them'''
+    try:
+        return op(i, j)
+    except OverflowError: # an int beyond float range and a float
+        return op(_float(i), _float(j))
+
+
+def _log(log, i):
+    '''@return: log(i), -inf if i is 0 and NaN if i is negative'''
+    if i > 0:
+        return log(i)
+    if i == 0:
+        return -INF
+    return NAN
+
+
+def _power(i, j):
+    '''@return: i ** j as a float, inf on overflow, NaN outside its domain'''
+    i, j = _float(i), _float(j)
+    if i == 0 and j < 0:
+        return INF
+    if i and finite(i) and finite(j):
+        if i < 0 and j % 1: # fractional powers of negatives
+            return NAN
+        if j * math.log(abs(i)) > _MAX_LOG:
+            if i < 0 and j % 2:
+                return -INF
+            return INF
+    return i ** j
+
+
+def _trigonometric(func, i):
+    '''@return: func(i), NaN if i is inf or NaN'''
+    i = _float(i)
+    if finite(i):
+        return func(i)
+    return NAN
+
+
+def _inverse(func, i):
+    '''@return: asin(i) or acos(i), NaN if i is outside [-1, 1]'''
+    if -1 <= i <= 1:
+        return func(i)
+    return NAN
+
+
+# Arithmetic
+add_op      = symbol('+')(lambda i, j: _arithmetic(operator.add, i, j))
+subtract_op = symbol('-')(lambda i, j: _arithmetic(operator.sub, i, j))
+multiply_op = symbol('*')(lambda i, j: _arithmetic(operator.mul, i, j))
+divide_op   = symbol('/')(_divide)
+modulus_op  = symbol('%')(lambda i, j: _float(i) % _float(j) if j else NAN)
+
+
+# Power
+ln_op        = symbol('LN'   )(lambda i: _log(math.log, i))
+log10_op     = symbol('LOG10')(lambda i: _log(math.log10, i))
+power_op     = symbol('^'    )(_power)
+exp_op       = symbol('E^'   )(
+    lambda i: INF if i > _MAX_LOG else math.exp(_float(i)))
+pow10_op     = symbol('10^'  )(lambda i: _power(10, i))
+square_op    = symbol('^2'   )(lambda i: _float(i) * _float(i))
+cube_op      = symbol('^3'   )(lambda i: _float(i) * _float(i) * _float(i))
+root_op      = symbol('Q'    )(
+    lambda i: math.sqrt(_float(i)) if i >= 0 else NAN)
+cube_root_op = symbol('Q3'   )(lambda i: _power(i, 1./3))
+inverse_op   = symbol('^-1'  )(lambda i: _divide(1, i))
+
+
+# Hyperbolic
+sineh_op      = symbol('SINH')(
+    lambda i: math.copysign(INF, _float(i)) if abs(i) > _MAX_HYP else 
+              math.sinh(i))
+cosineh_op    = symbol('COSH')(
+    lambda i: INF if abs(i) > _MAX_HYP else math.cosh(i))
+cosecanth_op  = symbol('CSCH')(lambda i: _divide(1, sineh_op(i)))
+secanth_op    = symbol('SECH')(lambda i: _divide(1, cosineh_op(i)))
+tangenth_op   = symbol('TANH')(lambda i: math.tanh(_float(i)))
+cotangenth_op = symbol('COTH')(lambda i: _divide(1, math.tanh(_float(i))))
+
+
+# Trigonometry
+sine_op         = symbol('SIN' )(lambda i: _trigonometric(math.sin, i))
+cosine_op       = symbol('COS' )(lambda i: _trigonometric(math.cos, i))
+tangent_op      = symbol('TAN' )(lambda i: _trigonometric(math.tan, i))
+cosecant_op     = symbol('CSC' )(lambda i: _divide(1, sine_op(i)))
+secant_op       = symbol('SEC' )(lambda i: _divide(1, cosine_op(i)))
+cotangent_op    = symbol('COT' )(lambda i: _divide(1, tangent_op(i)))
+arcsine_op      = symbol('ASIN')(lambda i: _inverse(math.asin, i))
+arccosine_op    = symbol('ACOS')(lambda i: _inverse(math.acos, i))
+arctangent_op   = symbol('ATAN')(lambda i: math.atan(_float(i)))
+arccosecant_op  = symbol('ACSC')(lambda i: _divide(1, arcsine_op(i)))
+arcsecant_op    = symbol('ASEC')(lambda i: _divide(1, arccosine_op(i)))
+arccotangent_op = symbol('ACOT')(lambda i: _divide(1, math.atan(_float(i))))
+
+
+# Rounding
+floor_op = symbol('FLOOR')(lambda i: math.floor(_float(i)))
+ceil_op  = symbol('CEIL' )(lambda i: math.ceil(_float(i)))
+round_op = symbol('ROUND')(lambda i: round(_float(i)))
+
+
+PROTECTED_ARITY_0 = constants.CONSTANTS_ARITY_0
+PROTECTED_ARITY_1 = ln_op, log10_op, root_op, exp_op, pow10_op, square_op, \
+                    cube_op, inverse_op, sineh_op, cosineh_op, \
+                    tangenth_op, cosecanth_op, secanth_op, \
+                    cotangenth_op, sine_op, cosine_op, tangent_op, \
+                    cosecant_op, secant_op, cotangent_op, arcsine_op, \
+                    arccosine_op, arctangent_op, \
+                    arccosecant_op, arcsecant_op, arccotangent_op, \
+                    floor_op, ceil_op, round_op, rounding.abs_op
+PROTECTED_ARITY_2 = add_op, subtract_op, multiply_op, divide_op, modulus_op, \
+                    power_op, comparison.equal_op, comparison.unequal_op, \
+                    comparison.less_op, comparison.greater_op, \
+                    comparison.less_or_equal_op, \
+                    comparison.greater_or_equal_op
+PROTECTED_ALL = PROTECTED_ARITY_0 + PROTECTED_ARITY_1 + PROTECTED_ARITY_2
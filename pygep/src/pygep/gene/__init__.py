@@ -16,10 +16,20 @@
 # 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 
 '''
-Package for gene implementations.  At the moment this consists
-of nothing more than the standard KarvaGene.
+Package for gene implementations:
+    - KarvaGene:         the standard interpreted Karva gene
+    - CompiledKarvaGene: Karva gene compiled to Python code
+    - CompactGene:       Karva gene stored as an array of symbol codes
+    - LazyKarvaGene:     Karva gene evaluated top-down, skipping subtrees
+
+As well as the SymbolTable built for each chromosome type.
 '''
 
+from pygep.gene.compact import CompactGene
+from pygep.gene.compiled import CompiledKarvaGene
 from pygep.gene.karva import KarvaGene
+from pygep.gene.lazy import LazyKarvaGene
+from pygep.gene.table import SymbolTable
 
-__all__ = 'KarvaGene',
+__all__ = 'KarvaGene', 'CompiledKarvaGene', 'CompactGene', 'LazyKarvaGene', \
+          'SymbolTable'
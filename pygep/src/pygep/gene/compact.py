@@ -0,0 +1,176 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Provides compact Karva genes, which store their alleles as an array of
+small integer codes rather than as a list of Python objects.  To use
+compact genes in a chromosome type:
+
+    class Calculation(Chromosome):
+        gene_type = CompactGene
+        ...
+'''
+
+from array import array
+from copy import copy
+from itertools import count, izip
+from pygep.gene.karva import KarvaGene
+from pygep.gene.table import SymbolTable
+
+
+class CompactGene(KarvaGene):
+    '''
+    A Karva gene that stores its alleles in gene.codes, an array('B') or
+    array('H') of indexes into the symbol table of its chromosome type.
+    RNC indexes are stored as they are.  Variation copies and slices this 
+    buffer directly, and gene.alleles decodes it on demand.  Evaluation
+    works exactly as for a KarvaGene.
+    '''
+    def __init__(self, alleles, head, dc=None, arities=None):
+        '''
+        Instantiates a compact Karva gene
+        @param alleles: list of individual loci for a given chromosome
+        @param head:    head length
+        @param dc:      pregenerated RNC domain
+        @param arities: SymbolTable of the chromosome type.  If missing, a
+                        new table is built from the alleles.
+        '''
+        if not isinstance(arities, SymbolTable):
+            arities = SymbolTable(
+                [a for a in alleles if callable(a)],
+                [a for a in alleles if not callable(a)]
+            )
+
+        super(CompactGene, self).__init__(alleles, head, dc, arities)
+
+
+    def _get_alleles(self):
+        '''@return: list of alleles decoded from self.codes'''
+        return self._unpack(self.codes, 0)
+
+
+    def _set_alleles(self, alleles):
+        '''Encodes a list of alleles into self.codes'''
+        # Codes must fit both the symbol table and any RNC indexes
+        largest = max(len(self.arities.symbols), len(self.dc or ()))
+        typecode = 'B' if largest < 256 else 'H'
+        self.codes = self._pack(alleles, 0, typecode)
+
+    alleles = property(_get_alleles, _set_alleles, doc='Decoded alleles')
+
+
+    def _pack(self, alleles, start, typecode=None):
+        '''
+        Encodes alleles found at a given position in the gene
+        @param alleles:  list of alleles
+        @param start:    index of the first allele in the gene
+        @param typecode: array type (default: that of self.codes)
+        @return:         array of codes
+        '''
+        codes = array(typecode or self.codes.typecode)
+        table = self.arities
+        for i, allele in izip(count(start), alleles):
+            # RNC indexes are stored as is
+            if self.dc and i >= self.rnc:
+                codes.append(allele)
+            else:
+                codes.append(table.add(allele))
+        return codes
+
+
+    def _unpack(self, codes, start):
+        '''
+        Decodes codes found at a given position in the gene
+        @param codes: array of codes
+        @param start: index of the first code in the gene
+        @return:      list of alleles
+        '''
+        symbols = self.arities.symbols
+        if not self.dc:
+            return [symbols[c] for c in codes]
+        
+        return [
+            symbols[c] if i < self.rnc else c 
+            for i, c in izip(count(start), codes)
+        ]
+
+
+    def __len__(self):
+        '''@return: number of alleles in the gene'''
+        return len(self.codes)
+    
+    
+    def __iter__(self):
+        '''@return: iterator over gene alleles'''
+        return iter(self.alleles)
+    
+    
+    def __getitem__(self, i):
+        '''@return: an individual allele from the gene'''
+        if i < 0:
+            i += len(self.codes)
+        return self._unpack(self.codes[i:i+1], i)[0]
+    
+    
+    def __getslice__(self, i, j):
+        '''@return: a slice of alleles'''
+        return self._unpack(self.codes[i:j], i)
+
+
+    def derive(self, changes):
+        '''
+        Derives a gene from self, exactly as KarvaGene.derive does, but by 
+        copying and assigning slices of the code buffer.
+
+        @param changes: sequence of (index, alleles) tuples
+        @return: new CompactGene
+        '''
+        new  = None # new code buffer
+        same = not self._stale # whether or not the coding region is the same
+        for index, alleles in changes:
+            codes  = self._pack(alleles, index)
+            length = len(codes)
+
+            if self.codes[index:index+length] != codes:
+                # Copy the buffer on first change
+                if new is None:
+                    new = self.codes[:index] + codes + \
+                          self.codes[index+length:]
+                else:
+                    new[index:index+length] = codes
+
+                # Does this change the coding region?
+                if same and index <= self.coding:
+                    same = False
+
+        if new is None: # Nothing changed!
+            return self
+
+        # Create the new gene
+        gene = copy(self)
+        gene.codes = new
+
+        # See if any of the used RNCs changed.
+        if same and self._rncs_used:
+            end = self.rnc + self._rncs_used
+            if self.codes[self.rnc:end] != new[self.rnc:end]:
+                same = False
+
+        if not same: # Recalculate coding region & kill memoized results
+            gene._recode()
+
+        return gene
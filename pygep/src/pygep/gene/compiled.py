@@ -0,0 +1,145 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Provides Karva genes that compile their coding regions to Python code.
+Rather than interpreting the Karva expression on every call, a compiled
+gene generates the source of an equivalent Python function whenever its
+coding region is found.  Evaluation is then a single nested call.  To use
+compiled genes in a chromosome type:
+
+    class Calculation(Chromosome):
+        gene_type = CompiledKarvaGene
+        ...
+
+Compiled functions are cached by the signature of the coding region, so
+genes with equivalent expressions share them.
+'''
+
+from pygep.gene.karva import KarvaGene
+from pygep.util import memoize
+import keyword, re
+
+
+# Terminals that can be accessed as obj.terminal in generated source
+_identifier = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+# Deepest nesting of calls in a single generated expression
+_max_depth = 32
+
+
+class CompiledKarvaGene(KarvaGene):
+    '''
+    A Karva gene that is evaluated via generated Python code.  The source
+    of that code is available as gene.source, for instance:
+
+        def gene(obj):
+            t0 = obj.a
+            return f0(f1(c3, t0), t0)
+
+    Functions are bound to f{index} and constants to c{index}, where the
+    index is the position of the allele in the gene.  Attribute terminals
+    are read from the object once each, into t0, t1, etc.  Very deep subtrees
+    are assigned to temporaries v{index} before the return statement.
+    '''
+    cache_size = 10000 # maximum number of cached compiled functions
+    _compiled  = {}    # coding region signature -> (source, function)
+
+    _coding_attrs = KarvaGene._coding_attrs + ('source', '_function')
+    
+
+    @memoize
+    def __call__(self, obj):
+        '''
+        Evaluates a compiled Karva gene against some instance.  The string
+        terminals in the gene are assumed to be attributes on the object.
+
+        @param obj: some object instance
+        @return:    result of evaluating the gene
+        '''
+        return self._function(obj)
+
+
+    def _find_coding(self):
+        '''
+        Finds the coding region of the gene as a KarvaGene does and then
+        compiles it, assigning its source to self.source.
+        '''
+        super(CompiledKarvaGene, self)._find_coding()
+
+        # Constants are part of the signature along with their types, so
+        # that 1 and 1.0 do not share compiled functions.
+        signature = tuple((type(a), a) for a in self._evaluation)
+        try:
+            self.source, self._function = self._compiled[signature]
+        except KeyError:
+            if len(self._compiled) >= self.cache_size:
+                self._compiled.clear()
+
+            self.source, self._function = self._compiled[signature] = \
+                self._compile()
+    
+    
+    def _compile(self):
+        '''
+        Generates and compiles the source for the current coding region
+        @return: (source, function)
+        '''
+        # The evaluation plan already knows where the arguments are
+        evaluation = self._evaluation
+        children = {}
+        for _, start, stop, dest in self._plan:
+            children[dest] = xrange(start, stop)
+
+        namespace, terminals, statements = {}, {}, []
+        def expression(i, depth=0):
+            '''@return: Python expression for the subtree at index i'''
+            allele = evaluation[i]
+            if i in children:
+                # The parser limits nesting, so deep subtrees get temporaries
+                if depth >= _max_depth:
+                    statements.append('v%d = %s' % (i, expression(i)))
+                    return 'v%d' % i
+
+                namespace['f%d' % i] = allele
+                return 'f%d(%s)' % (i, ', '.join(
+                    [expression(j, depth+1) for j in children[i]]
+                ))
+            
+            elif isinstance(allele, str):
+                if allele not in terminals:
+                    terminals[allele] = 't%d' % len(terminals)
+                return terminals[allele]
+
+            namespace['c%d' % i] = allele
+            return 'c%d' % i
+
+        body = expression(0)
+
+        # Pull each attribute terminal from the object only once
+        lines = ['def gene(obj):']
+        for terminal, name in sorted(terminals.items()):
+            if _identifier.match(terminal) and not keyword.iskeyword(terminal):
+                lines.append('    %s = obj.%s' % (name, terminal))
+            else:
+                lines.append('    %s = getattr(obj, %r)' % (name, terminal))
+        lines.extend('    ' + s for s in statements)
+        lines.append('    return %s' % body)
+
+        source = '\n'.join(lines)
+        exec source in namespace
+        return source, namespace['gene']
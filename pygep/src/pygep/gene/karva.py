@@ -21,10 +21,21 @@ for multigenic chromosomes.  This allows one to cache chromosome
 evaluation more efficiently.
 '''
 
+from array import array
 from copy import copy
 from itertools import groupby
 from operator import itemgetter
-from pygep.util import memoize
+from pygep.util import memoize, registry, stats
+from weakref import WeakValueDictionary
+
+
+# Genes with distinct coding regions: (type, signature) -> gene
+_interned = WeakValueDictionary()
+
+
+def _decode(cls, encoding):
+    '''@return: gene of type cls decoded from its compact encoding'''
+    return cls.decode(*encoding)
 
 
 class KarvaGene(object):
@@ -33,21 +44,45 @@ class KarvaGene(object):
     These are intended only for internal use by the Chromosome class,
     which will generate the gene contents and link together one or 
     more genes.  Genes, in turn, are responsible for generating and
-    caching evaluation results.
+    caching evaluation results.  The memo_policy attribute creates the
+    memo of those results for each gene (see pygep.util.memo).
+
+    Genes with identical coding regions (including the values of the RNCs
+    they use) share one evaluation list and one set of memos, even if they
+    were created independently.  Each gene with a new coding region counts
+    as 'coding_unique' in pygep.util.stats.counters and each gene that
+    joins an existing one as 'coding_shared'.  Set share_coding to False
+    to turn this off.
+
+    Derived genes with new coding regions only find them when first used,
+    so a gene that goes through several variation operators in a row is 
+    only analyzed once.  The 'coding_avoided' counter goes up for each
+    analysis deferred this way and down for each one later carried out.
     '''
-    def __init__(self, alleles, head, dc=None):
+    memo_policy  = dict
+    share_coding = True
+
+    # Attributes assigned by _find_coding
+    _coding_attrs = 'coding', '_evaluation', '_plan', '_terminals', \
+                    '_rncs_used'
+    _stale = False # coding region not yet found
+
+    def __init__(self, alleles, head, dc=None, arities=None):
         '''
         Instantiates a Karva style unigenic GEP chromosome
         @param alleles: list of individual loci for a given chromosome
         @param head:    head length
+        @param dc:      pregenerated RNC domain
+        @param arities: table of function arities (and terminals as None)
         '''
-        self.alleles = alleles
         self.head    = head
         self.coding  = 0
-        self.rnc     = len(alleles) - head - 1 # RNC region offset
+        self.rnc     = (len(alleles) + head) // 2 # RNC offset: head + tail
         self.dc      = dc
+        self.arities = arities if arities is not None else {}
+        self.alleles = alleles
         
-        self._evaluation = self._terminals = []
+        self._evaluation = self._terminals = self._plan = []
         self._find_coding()
 
     
@@ -63,21 +98,139 @@ class KarvaGene(object):
         '''
         self._prepare_eval_attrs(obj)
         
-        # Evaluate the gene against obj in reverse
-        index = self.coding + 1
-        for i in reversed(xrange(index)):
-            allele = self.alleles[i]
+        # Evaluate the gene against obj by running through the plan and
+        # replacing each operation in eval with its return value.
+        evaluation = self._evaluation
+        for function, start, stop, dest in self._plan:
+            evaluation[dest] = function(*evaluation[start:stop])
 
-            if callable(allele):
-                num  = allele.func_code.co_argcount
-                args = self._evaluation[index-num:index]
+        # Expression results will always be stored in the first index
+        return evaluation[0]
 
-                # Replace the operation in eval with its return val
-                self._evaluation[i] = allele(*args)
-                index -= num
 
-        # Expression results will always be stored in the first index
-        return self._evaluation[0]
+    def batch(self, columns):
+        '''
+        Evaluates a Karva gene once over a whole columnar dataset, using the
+        vector forms of its functions.  Requires NumPy.  See pygep.vector.
+        The result vector for a registered dataset (pygep.vector.Columns)
+        is memoized like any other evaluation, so it is computed once per
+        coding region and shared by every chromosome with the gene.
+
+        @param columns: mapping of terminal name to NumPy array
+        @return:        NumPy array of results, one per row
+        '''
+        from pygep.vector import Columns, evaluate # only needed for batches
+        if isinstance(columns, Columns):
+            return self._batch(columns)
+        return evaluate(self, columns)
+
+
+    @memoize
+    def _batch(self, columns):
+        '''@return: result vector for a registered dataset'''
+        return columns.evaluate(self)
+
+
+    def memos(self):
+        '''@return: list of the memos of evaluation results held by self'''
+        names = type(self).__call__.memo, type(self)._batch.memo
+        return [self.__dict__[n] for n in names if n in self.__dict__]
+
+
+    def _forget(self):
+        '''Drops all memoized results, as when the coding region changes'''
+        for name in type(self).__call__.memo, type(self)._batch.memo:
+            try:
+                delattr(self, name)
+            except AttributeError:
+                pass
+
+
+    def __getattr__(self, name):
+        '''
+        Finds the coding region of a derived gene when one of the 
+        attributes that depend on it is first needed
+        '''
+        if self._stale and (name in self._coding_attrs or 
+            name in (type(self).__call__.memo, type(self)._batch.memo)):
+            self._stale = False
+            stats.count('coding_avoided', -1)
+            self._find_coding()
+            return getattr(self, name)
+        
+        raise AttributeError(name)
+
+
+    def _recode(self):
+        '''
+        Drops memoized results and the coding region of a gene that has
+        been changed, leaving the coding region to be found on demand
+        '''
+        self._forget()
+        for name in self._coding_attrs:
+            self.__dict__.pop(name, None)
+
+        self._stale = True
+        stats.count('coding_avoided')
+
+
+    def __copy__(self):
+        '''@return: shallow copy of the gene, sharing its memoized results'''
+        gene = object.__new__(type(self))
+        gene.__dict__.update(self.__dict__)
+        return gene
+
+
+    def __reduce__(self):
+        '''Pickles genes in their compact encoding.  See encode().'''
+        return _decode, (type(self), self.encode())
+
+    
+    def encode(self):
+        '''
+        Encodes a gene compactly as (head, codes, terminals, dc).  The codes
+        are a string of native unsigned shorts, as from array('H'), holding
+        one entry per allele.  Functions registered by symbol() are stored as
+        their IDs times two.  Other alleles (terminals, RNC indexes and 
+        unregistered functions) are stored once each in the terminals tuple
+        and in codes as twice their index plus one.
+
+        @return: encoded gene
+        '''
+        codes, terminals, seen = array('H'), [], {}
+        for allele in self.alleles:
+            # Keys include types so that, e.g., 1 and 1.0 stay distinct
+            key = type(allele), allele
+            try:
+                code = seen[key]
+            except KeyError:
+                try:
+                    code = seen[key] = registry.identify(allele) << 1
+                except KeyError:
+                    code = seen[key] = len(terminals) << 1 | 1
+                    terminals.append(allele)
+
+            codes.append(code)
+
+        return self.head, codes.tostring(), tuple(terminals), self.dc
+
+
+    @classmethod
+    def decode(cls, head, codes, terminals, dc=None, arities=None):
+        '''
+        Creates a gene from its compact encoding.  See encode().
+        @param head:      head length
+        @param codes:     string of allele codes
+        @param terminals: non-registered alleles referenced by the codes
+        @param dc:        pregenerated RNC domain
+        @param arities:   table of function arities (and terminals as None)
+        @return:          new gene
+        '''
+        alleles = [
+            terminals[c >> 1] if c & 1 else registry.lookup(c >> 1)
+            for c in array('H', codes)
+        ]
+        return cls(alleles, head, dc, arities)
 
 
     def __repr__(self):
@@ -119,36 +272,63 @@ class KarvaGene(object):
         return self.alleles[i:j]
     
     
+    def same_coding(self, other):
+        '''
+        Returns True if other has the same coding region and used RNCs as
+        self.  Such genes share their evaluation lists, which are rebuilt
+        only when the coding changes (unless share_coding is False, in
+        which case only genes derived from one another are recognized).
+        @param other: another gene
+        @return:      boolean
+        '''
+        return self._evaluation is other._evaluation
+    
+    
     def _find_coding(self):
         '''
         Assigns the last coding index to self.coding and creates an 
-        evaluation list from the coding region as self._evaluation
-        and pairs of foreign attributes with locations at self._terminals.
+        evaluation list from the coding region as self._evaluation,
+        pairs of foreign attributes with locations at self._terminals
+        and the evaluation plan at self._plan.
         '''
         # How to find the length of a single coding region:
         #
-        # Start at the first gene and determine how many args it
-        # requires. Then move forward that many args and sum their
-        # required args. Continue this until there are no more
-        # required args. The resulting index will be one gene past
-        # the coding region for the current gene
-        index, args = 0, 1
-        while args:
-            next_args = 0
-            for _ in xrange(args):
-                if callable(self.alleles[index]):
-                    next_args += self.alleles[index].func_code.co_argcount
-                index += 1
-
-            args = next_args
+        # Karva is read breadth first, so the arguments of each function
+        # directly follow the arguments of the functions before it.  Walk
+        # the gene, moving the start of the next unclaimed argument forward
+        # by the arity of each function.  Once the walk catches up to that
+        # index, there are no more required args.
+        #
+        # Along the way this records a plan entry for each function:
+        #
+        #     (function, first arg index, last arg index + 1, index)
+        alleles, arities = self.alleles, self.arities
+        plan, index, i = [], 1, 0
+        while i < index:
+            allele = alleles[i]
+            try:
+                num = arities[allele]
+            except KeyError: # not in the chromosome's symbols
+                num = None
+                if callable(allele):
+                    num = allele.func_code.co_argcount
+
+            if num is not None:
+                plan.append((allele, index, index+num, i))
+                index += num
+            i += 1
 
         self.coding = index - 1
+
+        # Arguments must be evaluated before the functions using them
+        plan.reverse()
+        self._plan = tuple(plan)
  
         
         # The evaluation list only uses the coding region.  Since constants
         # done change from one run to the next, only expression results and
         # attribute values do, this is perfectly safe.
-        self._evaluation = self.alleles[:self.coding+1]
+        self._evaluation = alleles[:self.coding+1]
         
         # Pull out the attribute terminals by terminal name.  This constructs
         # a list of pairs containing attribute name and indexes:
@@ -173,13 +353,41 @@ class KarvaGene(object):
         for terminal, indexes in self._terminals:
             if terminal == '?': # RNC symbol
                 for i in indexes:
-                    num = self.dc[self.alleles[self.rnc + current_rnc]]
+                    num = self.dc[alleles[self.rnc + current_rnc]]
                     self._evaluation[i] = num
                     current_rnc += 1
                 break
 
         # This allows us to detect changes to the used RNCs on derivation
         self._rncs_used = current_rnc
+
+        if self.share_coding:
+            self._share()
+
+
+    def _share(self):
+        '''
+        Shares the evaluation list, plan and memos of a living gene with the
+        same coding region, or registers self as the gene to share with.
+        '''
+        try:
+            key = type(self), tuple((type(a), a) for a in self._evaluation)
+            gene = _interned.setdefault(key, self)
+        except TypeError: # unhashable constants
+            return
+
+        if gene is self:
+            # Memos are created up front so that they can be shared
+            for name in type(self).__call__.memo, type(self)._batch.memo:
+                if not hasattr(self, name):
+                    setattr(self, name, self.memo_policy())
+            stats.count('coding_unique')
+        
+        else:
+            self._evaluation, self._plan = gene._evaluation, gene._plan
+            for name in type(self).__call__.memo, type(self)._batch.memo:
+                setattr(self, name, getattr(gene, name))
+            stats.count('coding_shared')
     
     
     def _prepare_eval_attrs(self, obj):
@@ -209,7 +417,7 @@ class KarvaGene(object):
         @return: new KarvaGene
         '''
         new  = None # new gene
-        same = True # whether or not the coding region is the same
+        same = not self._stale # whether or not the coding region is the same
         for index, alleles in changes:
             length = len(alleles)
             
@@ -232,17 +440,13 @@ class KarvaGene(object):
         gene.alleles = new
         
         # See if any of the used RNCs changed.
-        if self._rncs_used:
+        if same and self._rncs_used:
             my_rncs = self[self.rnc:self.rnc+self._rncs_used] 
             if my_rncs != new[self.rnc:self.rnc+self._rncs_used]:
                 same = False
         
         # TODO: update same for DC changes
         if not same: # Recalculate coding region & kill memoized results
-            gene._find_coding()
-            try:
-                delattr(gene, self.__call__.memo)
-            except AttributeError:
-                pass
+            gene._recode()
             
         return gene
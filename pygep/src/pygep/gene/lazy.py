@@ -0,0 +1,101 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Provides Karva genes that evaluate their expression trees top-down, so
+that functions with lazy forms can skip the subtrees whose results they
+do not need.  A lazy form receives a thunk, a callable without arguments,
+for each argument and calls only those it needs (see the lazy decorator
+in pygep.chromosome).  The conditional and logical functions in 
+pygep.functions.logical have lazy forms.  To use lazy genes in a 
+chromosome type:
+
+    class Classifier(Chromosome):
+        gene_type = LazyKarvaGene
+        ...
+
+Functions without lazy forms receive the values of all their arguments,
+as they do in a KarvaGene.
+'''
+
+from functools import partial
+from pygep.gene.karva import KarvaGene
+from pygep.util import memoize
+
+
+__all__ = 'LazyKarvaGene',
+
+
+class LazyKarvaGene(KarvaGene):
+    '''
+    A Karva gene that walks its expression tree from the root, evaluating
+    each subtree only when the function above it asks for its value.
+    '''
+    _coding_attrs = KarvaGene._coding_attrs + ('_tree',)
+
+
+    @memoize
+    def __call__(self, obj):
+        '''
+        Evaluates a lazy Karva gene against some instance.  The string
+        terminals in the gene are assumed to be attributes on the object.
+
+        @param obj: some object instance
+        @return:    result of evaluating the gene
+        '''
+        tree = self._tree
+
+        def value(i):
+            '''@return: result of the subtree at index i'''
+            function, argument, children = tree[i]
+            if function is None: # terminal
+                return getattr(obj, argument) if children else argument
+
+            elif argument is not None: # lazy form
+                return argument(*[partial(value, c) for c in children])
+
+            return function(*[value(c) for c in children])
+        
+        return value(0)
+
+
+    def _find_coding(self):
+        '''
+        Finds the coding region of the gene as a KarvaGene does and then
+        builds self._tree, which holds a tuple for each index in it:
+            - (function, lazy form or None, child indexes)
+            - (None, terminal attribute name, True)
+            - (None, constant value, False)
+        '''
+        super(LazyKarvaGene, self)._find_coding()
+
+        # Leaves: constants (including the values of RNCs) are already in
+        # the evaluation list, but it may hold old values for attributes
+        tree = [(None, a, False) for a in self._evaluation]
+        for terminal, indexes in self._terminals:
+            if terminal != '?': # terminal attribute - non-RNC
+                for i in indexes:
+                    tree[i] = (None, terminal, True)
+        
+        # Functions: the plan already knows where their arguments are
+        for function, start, stop, dest in self._plan:
+            tree[dest] = (
+                function, getattr(function, 'lazy', None), 
+                tuple(xrange(start, stop))
+            )
+
+        self._tree = tree
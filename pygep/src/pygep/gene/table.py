@@ -0,0 +1,70 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Provides symbol tables, which record the arity of each symbol available
+to a chromosome type and give each symbol a small integer code.
+'''
+
+
+class SymbolTable(dict):
+    '''
+    Table of the symbols of a chromosome type, built once per type by its
+    metaclass.  As a dict it maps each symbol to its arity, or to None for
+    terminals, which is all genes need to know in order to evaluate their
+    alleles.  It also numbers the symbols in the order they were added:
+
+        table.symbols[code] -> symbol
+        table.add(symbol)   -> code
+
+    Symbols of different types that compare equal, such as 1 and 1.0, are 
+    given different codes.
+    '''
+    def __init__(self, functions=(), terminals=()):
+        '''
+        Builds a table of functions and terminals.  Repeated symbols only
+        occur once in the table.
+        @param functions: non-terminal symbols
+        @param terminals: terminal symbols
+        '''
+        dict.__init__(self)
+        self.symbols = []
+        self._codes  = {}
+        for symbol in functions:
+            self.add(symbol)
+        for symbol in terminals:
+            self.add(symbol)
+
+
+    def add(self, symbol):
+        '''
+        Adds a symbol to the table if it is not already there
+        @param symbol: function or terminal
+        @return:       code of the symbol
+        '''
+        key = type(symbol), symbol
+        try:
+            return self._codes[key]
+        except KeyError:
+            if callable(symbol):
+                self[symbol] = symbol.func_code.co_argcount
+            else:
+                self[symbol] = None
+            
+            code = self._codes[key] = len(self.symbols)
+            self.symbols.append(symbol)
+            return code
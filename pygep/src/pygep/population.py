@@ -20,9 +20,11 @@ Provides a Population class for managing multiple GEP chromosomes
 over time, allowing selection, replication, and variation operators.
 '''
 
-from itertools import izip
+from itertools import groupby, izip
+from pygep import evaluation, selection
+from pygep.chromosome import mutation_sites
 from pygep.functions.linkers import default_linker
-from pygep.util import stats
+from pygep.util import memo, stats
 import random, string
 
 
@@ -42,9 +44,40 @@ class Population(object):
         - crossover_one_point_rate: 1-point crossover rate (0.3)
         - crossover_two_point_rate: 2-point crossover rate (0.3)
         - crossover_gene_rate:      full gene crossover (0.1)
+
+        - evaluator:                fitness backend (pygep.evaluation)
+        - selection:                selection strategy (pygep.selection)
+        - memo_limit:               gene results kept per generation
+        - subtrees:                 subtree cache to age (pygep.vector)
+        - sampler:                  fitness case sampler (pygep.sampling)
+        - racing:                   cutoff for racing (pygep.racing)
         
     Mutation, by default, is set to a rate where it will modify
-    about two loci per chromosome.  Example Population usage::
+    about two loci per chromosome.  The fitness attribute holds the 
+    fitness values of the current generation.  After each generation the
+    counts attribute holds the number of times each of the events tracked
+    in pygep.util.stats.counters occurred while it was produced, such as
+    'fitness_evaluated' for fitness values computed, 'fitness_inherited'
+    for fitness evaluations saved by inheritance, and
+    dedup gives the share of new genes that joined an existing coding
+    region (see KarvaGene).
+    The memoized results of genes are unbounded unless memo_limit is set,
+    in which case gene memos are trimmed to that many results (see 
+    pygep.util.memo) once each generation has been evaluated.
+    With a sampler, each generation is evaluated against a batch of the
+    fitness cases, held in the sample attribute and handed to the 
+    chromosome type as its own sample attribute before evaluation.  If 
+    the best individual solves the problem on a batch, the generation is
+    re-scored on the full set, so best and solved are never judged on a
+    batch alone.
+    With racing, a cutoff fitness is computed from the previous generation
+    and held in the cutoff attribute.  The chromosome type is handed the 
+    cutoff while the generation is evaluated, and fitness functions may 
+    stop early for chromosomes that cannot reach it; the fitness cases 
+    they skip are counted as 'cases_skipped' and shown in the repr.  There
+    is no cutoff for a generation evaluated on a new batch of fitness 
+    cases.
+    Example Population usage::
 
         from pygep.functions.linkers import *
         from pygep import *
@@ -71,22 +104,41 @@ class Population(object):
     crossover_two_point_rate = 0.3
     crossover_gene_rate      = 0.1
 
+    evaluator  = staticmethod(evaluation.serial)
+    selection  = staticmethod(selection.roulette)
+    memo_limit = None
+    subtrees   = None
+    sampler    = None
+    racing     = None
+    sample     = None # fitness cases last evaluated on, when sampling
+    cutoff     = None # racing cutoff of the current generation
+
 
-    def __init__(self, cls, size, head, genes=1, linker=default_linker):
+    def __init__(self, cls, size, head, genes=1, linker=default_linker,
+                 evaluator=None, sampler=None):
         '''
         Generates a population of some chromsome class
-        @param cls:    Chromosome type
-        @param size:   population size
-        @param head:   chromosome head length (min=0)
-        @param genes:  number of genes (min=1)
-        @param linker: multigenic results linker function
+        @param cls:       Chromosome type
+        @param size:      population size
+        @param head:      chromosome head length (min=0)
+        @param genes:     number of genes (min=1)
+        @param linker:    multigenic results linker function
+        @param evaluator: fitness evaluation backend (default: serial)
+        @param sampler:   fitness case sampler (default: none)
         '''
         self.size   = size
         self.head   = head
         self.genes  = genes
         self.linker = linker
 
+        if evaluator is not None:
+            self.evaluator = evaluator
+        if sampler is not None:
+            self.sampler = sampler
+
         self.__age = 0
+        self.counts = {}
+        snapshot = dict(stats.counters)
 
         if '?' in cls.terminals:
             popgen = cls.generate(head, genes, linker,
@@ -98,7 +150,6 @@ class Population(object):
         # Start an initial population
         self.population = [i for _, i in izip(xrange(size), popgen)]
         self._next_pop  = [None] * size # placeholder for next generation
-        self._scaled    = [None] * size # fitness scaling
 
         # Header for display purposes
         try:
@@ -114,13 +165,18 @@ class Population(object):
         
         # Compute stats about the initial generation
         self.stdev = self.mean = 0
+        self.fitness = []
         self._update_stats()
+        self.counts = stats.counts_since(snapshot)
 
 
     def __repr__(self):
         '''@return: repr of population with header and statistical info'''
-        header = '[Generation: %s  |  Best: #%s (%s)  |  Mean: %0.1f]\n%s' % \
-            (self.age, self.best.id, self.best.fitness, self.mean, self.header)
+        header = '[Generation: %s  |  Best: #%s (%s)  |  Mean: %0.1f' % \
+            (self.age, self.best.id, self.best.fitness, self.mean)
+        if self.racing is not None:
+            header += '  |  Skipped: %s' % self.counts.get('cases_skipped', 0)
+        header += ']\n' + self.header
         max_id_len = max(len(str(i.id)) for i in self)
         return '\n'.join([header] + [
             '%s [%s]: %s' % (i, str(i.id).rjust(max_id_len), i.fitness)
@@ -144,10 +200,66 @@ class Population(object):
 
 
     def _update_stats(self):
-        '''Assigns to self.mean and stdev population fitness stats'''
+        '''Assigns to self.fitness, mean and stdev population fitness stats'''
+        changed = False
+        if self.sampler is not None:
+            if isinstance(self.evaluator, evaluation.ProcessPool):
+                raise ValueError('ProcessPool workers do not see samples')
+            changed = self._sample(self.sampler.draw())
+        
+        # Racing compares with fitness values on the same fitness cases
+        self.cutoff = None
+        if self.racing is not None and len(self.fitness) and not changed:
+            self.cutoff = self.racing(self)
+        
+        self._evaluate(self.cutoff)
+        if self.sampler is not None:
+            self.sampler.update(max(self.fitness))
+            
+            # Solutions found on a batch must hold on the full set
+            if self.sample is not self.sampler.data and self.best.solved:
+                self._sample(self.sampler.data)
+                self._evaluate()
+                stats.count('sample_verified')
+
+
+    def _evaluate(self, cutoff=None):
+        '''
+        Evaluates the population, assigning fitness, mean and stdev
+        @param cutoff: racing cutoff for the chromosome type, if any
+        '''
+        cls = type(self.population[0])
+        cls.cutoff = cutoff
+        try:
+            self.evaluator(self.population)
+        finally:
+            cls.cutoff = None
+        self.fitness = [c.fitness for c in self.population]
         self.mean, self.stdev, _ = stats.fitness_stats(self)
 
 
+    def _sample(self, batch):
+        '''
+        Hands a batch of fitness cases to the chromosome type.  When it is
+        not the batch the population was last evaluated on, the fitness
+        values of the population are dropped and none are inherited from
+        earlier generations.
+        @param batch: Dataset or list of fitness cases
+        @return:      True if the batch changed
+        '''
+        type(self.population[0]).sample = batch
+        if batch is self.sample:
+            return False
+
+        self.sample = batch
+        for chromosome in self.population:
+            chromosome.__dict__.pop(chromosome._fitness.cache, None)
+            chromosome.__dict__.pop('_parent', None)
+            chromosome.__dict__.pop('skipped', None) # racing, if any
+        stats.count('sample_changes')
+        return True
+
+
     age  = property(lambda self: self.__age, doc='Generation number')
     best = property(
         # Gives preference to later individuals tied for best
@@ -156,6 +268,15 @@ class Population(object):
     )
 
 
+    def _dedup(self):
+        '''@return: share of new genes with an existing coding region'''
+        shared = self.counts.get('coding_shared', 0)
+        total  = shared + self.counts.get('coding_unique', 0)
+        return float(shared) / total if total else 0.0
+
+    dedup = property(_dedup, doc='Gene dedup ratio of the last generation')
+
+
     def solve(self, generations):
         '''
         Cycles a number of generations. Stops if self.solved()
@@ -169,57 +290,26 @@ class Population(object):
 
     def cycle(self):
         '''Selects, replicates and recombines the next generation'''
+        snapshot = dict(stats.counters)
+
         # Copy the best individual via simple elitism
         self._next_pop[0] = self.best
 
-        if self.mean > 0:
-            # Fill in the rest through fitness scaling. First compute the
-            # sigma-scaled fitness proportionate value for each chromosome.
-            for i, j in enumerate(self.population):
-                self._scaled[i] = self.exclusion_level * j.fitness / self.mean
-            scaling = sum(self._scaled)
-
-            # Then generate n-1 spins of the roulette wheel
-            select = [random.random() * scaling for _ in xrange(self.size-1)]
-            select.sort()
-
-            # Move through the current population, calculating a window
-            # for each scaled fitness.  However many of the sorted roulette
-            # spins are within that window yields the number of copies.
-            window = self._scaled[0]
-            source, target = 0, 1
-            for scaled in select:
-                # Move to the element that covers our range
-                while window < scaled:
-                    source += 1
-                    try:
-                        window += self._scaled[source]
-                    except IndexError: # possible floating-point errors
-                        source = self.size - 1
-                        break
-
-                # Copy this element to the next generation
-                self._next_pop[target] = self.population[source]
-                target += 1
-
-        else:
-            # Mean fitness <= 0.  Since no chromosome should ever have a
-            # negative fitness, this should mean all organisms are inviable.
-            # In this case we shall content ourselves to choose randomy.
-            for i in xrange(self.size):
-                self._next_pop[i] = random.choice(self.population)
+        # Fill in the rest according to the selection strategy
+        for i, j in enumerate(self.selection(self, self.size-1)):
+            self._next_pop[i+1] = self.population[j]
 
 
         # Recombination section - always exclude best
         #
-        # Mutation occurs potentially for each allele in each chromosome
+        # Mutation occurs potentially for each allele in each chromosome.
+        # The sites are picked for the whole generation at once.
+        if self.mutation_rate:
+            self._mutate()
+
         # Inversion & transposition are considered for each chromosome
         for i in xrange(1, self.size):
-            # Try and mutate each individual
-            if self.mutation_rate:
-                self._next_pop[i] = self._next_pop[i].mutate(self.mutation_rate)
-                
-            # Then inversion
+            # Inversion
             if self.inversion_rate and random.random() < self.inversion_rate:
                 self._next_pop[i] = self._next_pop[i].invert()
 
@@ -256,10 +346,45 @@ class Population(object):
             children   = par1.crossover_gene(par2)
             self._next_pop[i], self._next_pop[j] = children
 
-        # Switch to the next generation and increment age
+        # Switch to the next generation
         self._next_pop, self.population = self.population, self._next_pop
+        self._advance(snapshot)
+
+
+    def _mutate(self):
+        '''Applies point mutation to every individual but the first'''
+        length = len(self._next_pop[0])
+        sites  = mutation_sites(self.mutation_rate, (self.size-1) * length)
+        for i, loci in groupby(sites, lambda site: site // length):
+            offset = i * length
+            self._next_pop[i+1] = self._next_pop[i+1].mutate_at(
+                site - offset for site in loci
+            )
+
+
+    def _advance(self, snapshot):
+        '''
+        Increments age and computes stats once self.population holds the
+        next generation
+        @param snapshot: copy of the stats counters from before the cycle
+        '''
         self.__age += 1
+        if self.subtrees is not None:
+            self.subtrees.advance()
+        
         self._update_stats()
+        if self.memo_limit is not None:
+            self.trim_memos(self.memo_limit)
+        self.counts = stats.counts_since(snapshot)
+
+
+    def trim_memos(self, maxsize=0):
+        '''
+        Trims the memoized results of the genes in the population
+        @param maxsize: number of results to keep per gene (default: none)
+        '''
+        memo.trim((m for c in self.population for g in c.genes
+                     for m in g.memos()), maxsize)
 
 
     def _pairs(self, rate):
@@ -0,0 +1,83 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Provides racing: stopping the evaluation of an individual once it can no
+longer reach the fitness of the better part of the population.  Fitness
+functions take part by reporting an upper bound on their final fitness 
+as they go, along with the number of fitness cases left to evaluate, and
+stop as soon as Chromosome.hopeless says the bound cannot reach the 
+cutoff:
+
+    def _fitness(self):
+        correct = 0
+        for i, row in enumerate(SAMPLE):
+            if self(row) == row.label:
+                correct += 1
+            remaining = len(SAMPLE) - i - 1
+            if self.hopeless(correct + remaining, remaining):
+                break
+        return correct
+
+A Population with a racing policy computes a cutoff from the fitness 
+values of the generation before, and sets it on its chromosome type only
+while the next generation is evaluated.  Fitness values computed at other
+times, on a held-out set for instance, are never cut short.  Populations
+with a sampler (see pygep.sampling) do without a cutoff whenever the 
+batch of fitness cases changes.  A policy is any callable accepting a 
+population and returning a cutoff:
+    - mean:     mean fitness of the population
+    - Quantile: fitness at some quantile of the population
+
+Skipped fitness cases are counted as 'cases_skipped' in the population
+counts.  The fitness of an individual stopped early is whatever its 
+fitness function returns at that point, and is never kept in a fitness
+store.  Racing assumes higher fitness values are better.
+'''
+
+
+__all__ = 'mean', 'Quantile'
+
+
+def mean(population):
+    '''@return: mean fitness of a population'''
+    return population.mean
+
+
+class Quantile(object):
+    '''
+    Cutoff at a quantile of the fitness values of a population.  Higher
+    quantiles stop more individuals early: 0.5 is the median, and 1.0 the
+    fitness of the best individual.
+    '''
+    def __init__(self, quantile=0.5):
+        '''
+        Configures a quantile cutoff
+        @param quantile: fraction of the population at or below the cutoff
+        '''
+        if not 0 <= quantile <= 1:
+            raise ValueError('Quantiles must be between 0 and 1')
+        self.quantile = quantile
+
+
+    def __call__(self, population):
+        '''
+        @param population: population with its fitness values computed
+        @return:           fitness value at the quantile
+        '''
+        fitness = sorted(population.fitness)
+        return fitness[int(round(self.quantile * (len(fitness) - 1)))]
@@ -0,0 +1,165 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Provides mini-batch and progressive sampling of fitness cases.  Rather
+than evaluating every new individual against the whole training set, a
+Population with a Sampler evaluates each generation against a random 
+subsample of it, and grows the subsample as the run converges:
+
+    p = Population(Regression, 100, 6, 4, sum_linker,
+                   sampler=Sampler(DataPoint.SAMPLE, 100))
+
+Before evaluating each generation, the Population hands the sampler's 
+current batch to its chromosome type as the sample attribute, which 
+_fitness evaluates over:
+
+    def _fitness(self):
+        return sum(abs(self(row) - row.y) for row in self.sample)
+
+Fitness values are only comparable within one batch, so when the batch
+changes the cached fitness values of the population are dropped, and
+children no longer inherit from parents scored on another batch.  
+Survivors and the elite are thus re-scored only when a new batch is drawn
+(every few generations, if every > 1), and not at all once the sample 
+has grown to the full set.  A generation whose best individual solves the
+problem on its batch is re-scored on the full set before its best and 
+solved are reported, so runs do not stop on a batch that happens to be 
+easy.  The sample grows by a factor of growth whenever the best fitness
+on it has not improved for patience generations.  Samples may be 
+stratified by a function of the rows, so that each stratum (a class 
+label, for instance) is represented in proportion to its size in the 
+full set.
+
+The data may be a pygep.data.Dataset or any sequence of fitness cases.
+Batches are Datasets or lists, in the order of the full set.  The rows 
+of each new batch are new keys for the memoized results of genes, so 
+setting Population.memo_limit is advisable.  Since the batch is a class
+attribute, populations of the same chromosome type can take turns with
+their own samplers, but a chromosome evaluated outside of its population
+sees the batch of whichever population was evaluated last.  Fitness
+stores and fitness functions that ignore the sample attribute cannot be
+used with a sampler, nor can evaluators that do not run in the current 
+process, since they do not see the sample change.  A Population raises 
+ValueError if its sampler is combined with a ProcessPool evaluator.
+'''
+
+import random
+
+
+__all__ = 'Sampler',
+
+
+class Sampler(object):
+    '''
+    Draws the batches of fitness cases for a population, one per 
+    generation.  The size attribute holds the current batch size, and
+    full is True once batches are the full set.
+    '''
+    def __init__(self, data, size, growth=2.0, patience=5, every=1,
+                 strata=None):
+        '''
+        Creates a sampler for a set of fitness cases
+        @param data:     Dataset or sequence of fitness cases
+        @param size:     initial number of fitness cases per batch
+        @param growth:   factor the batch size grows by (min=1)
+        @param patience: generations without improvement before growing
+        @param every:    generations a batch is used for (min=1)
+        @param strata:   function of a row returning its stratum, or None
+        '''
+        self.data     = data
+        self.size     = min(size, len(data))
+        self.growth   = growth
+        self.patience = patience
+        self.every    = every
+
+        self.batch = None
+        self._age  = 0     # generations the batch has been used
+        self._best = None  # best fitness since the size last changed
+        self._wait = 0     # generations without improvement
+
+        self._strata = None
+        if strata is not None: # row indexes by stratum
+            self._strata = {}
+            for i, row in enumerate(data):
+                self._strata.setdefault(strata(row), []).append(i)
+
+
+    full = property(lambda self: self.size >= len(self.data),
+                    doc='True if batches are the full set')
+
+
+    def draw(self):
+        '''
+        Provides the batch for the next generation: the previous batch if
+        it has been used for fewer than every generations, the full set
+        if the sample has grown to it, or a new random sample
+        @return: Dataset or list of fitness cases
+        '''
+        if self.full:
+            self.batch = self.data
+        elif self.batch is None or self._age >= self.every:
+            self.batch = self._take(self._indexes())
+            self._age  = 0
+
+        self._age += 1
+        return self.batch
+
+
+    def update(self, best):
+        '''
+        Records the best fitness of a generation evaluated on the current 
+        batch, growing the batch size if it has stopped improving
+        @param best: best fitness value of the generation
+        @return:     True if the batch size grew
+        '''
+        if self._best is None or best > self._best:
+            self._best, self._wait = best, 0
+            return False
+
+        self._wait += 1
+        if self._wait < self.patience or self.full:
+            return False
+
+        # Converged at this batch size: grow the sample and redraw
+        self.size = min(len(self.data), int(self.size * self.growth) + 1)
+        self._best, self._wait = None, 0
+        self.batch = None
+        return True
+
+
+    def _indexes(self):
+        '''@return: sorted random indexes of a batch, stratified if needed'''
+        total = len(self.data)
+        if self._strata is None:
+            indexes = random.sample(xrange(total), self.size)
+        else: # proportional allocation, at least one case per stratum
+            indexes = []
+            for members in self._strata.itervalues():
+                share = self.size * len(members) / float(total)
+                share = min(len(members), max(1, int(round(share))))
+                indexes.extend(random.sample(members, share))
+        indexes.sort() # in order, for locality in mapped datasets
+        return indexes
+
+
+    def _take(self, indexes):
+        '''@return: the fitness cases at some indexes of the data'''
+        take = getattr(self.data, 'take', None)
+        if take is not None:
+            return take(indexes)
+        return [self.data[i] for i in indexes]
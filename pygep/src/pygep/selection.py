@@ -0,0 +1,162 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Provides selection strategies for populations.  A strategy is any callable
+accepting a population and a number of individuals to select that returns
+the indexes of the individuals chosen, with repetition:
+    - roulette:   fitness proportionate selection (the default)
+    - Tournament: best of a few individuals chosen at random
+    - rank:       selection proportionate to fitness rank
+
+Strategies work from population.fitness, the list of the fitness values
+of the current generation, rather than from the chromosomes themselves.
+Selection is O(n log n) for each, and tournaments do not need the mean
+fitness at all.  When population.fitness is a NumPy array, as it is for
+a pygep.vector.MatrixPopulation, every strategy selects with whole-array
+operations and returns an array of indexes instead.  Example usage:
+
+    from pygep.selection import Tournament
+    p = Population(Regression, 1000, 6, 4, sum_linker)
+    p.selection = Tournament(3)
+'''
+
+from bisect import bisect_left
+import random
+
+
+__all__ = 'roulette', 'Tournament', 'rank'
+
+
+def spin(cumulative, count):
+    '''
+    Spins a roulette wheel with windows given by cumulative weights
+    @param cumulative: running totals of the window sizes
+    @param count:      number of spins
+    @return:           list of window indexes
+    '''
+    last, total = len(cumulative) - 1, cumulative[-1]
+    return [
+        # The bound guards against floating-point errors at the end
+        min(bisect_left(cumulative, random.random() * total), last)
+        for _ in xrange(count)
+    ]
+
+
+def vector_spin(cumulative, count):
+    '''
+    Spins a roulette wheel with windows given by a NumPy array of 
+    cumulative weights, all at once
+    @param cumulative: running totals of the window sizes
+    @param count:      number of spins
+    @return:           array of window indexes
+    '''
+    import numpy
+    spins = numpy.random.random_sample(count) * cumulative[-1]
+    return numpy.minimum(
+        numpy.searchsorted(cumulative, spins), len(cumulative)-1 # rounding
+    )
+
+
+def running(values):
+    '''@return: list of running totals of some values'''
+    total, totals = 0, [None] * len(values)
+    for i, value in enumerate(values):
+        total += value
+        totals[i] = total
+    return totals
+
+
+def roulette(population, count):
+    '''
+    Fitness scaling roulette: each individual is selected with probability
+    proportionate to its fitness, scaled by the exclusion level over the 
+    mean fitness.  If the mean fitness is not positive, all organisms
+    should be inviable, in which case they are selected at random.
+    @param population: population to select from
+    @param count:      number of selections
+    @return:           list of indexes
+    '''
+    fitness = population.fitness
+    vector  = hasattr(fitness, 'cumsum') # NumPy array
+    if population.mean <= 0:
+        if vector:
+            import numpy
+            return numpy.random.randint(0, population.size, count)
+        return [random.randrange(population.size) for _ in xrange(count)]
+
+    scale = population.exclusion_level / population.mean
+    if vector:
+        return vector_spin(fitness.cumsum() * scale, count)
+    return spin(running([f * scale for f in fitness]), count)
+
+
+def rank(population, count):
+    '''
+    Linear rank selection: the worst individual has one share of the 
+    roulette wheel, the next worst two shares and so on up to the best.
+    @param population: population to select from
+    @param count:      number of selections
+    @return:           list of indexes
+    '''
+    fitness = population.fitness
+    if hasattr(fitness, 'argsort'): # NumPy array
+        import numpy
+        order  = fitness.argsort(kind='mergesort') # stable, like sorted
+        shares = numpy.arange(1, len(order)+1, dtype=float).cumsum()
+        return order[vector_spin(shares, count)]
+
+    order  = sorted(xrange(len(fitness)), key=fitness.__getitem__)
+    shares = running(xrange(1, len(order)+1))
+    return [order[i] for i in spin(shares, count)]
+
+
+class Tournament(object):
+    '''
+    Tournament selection: each selection is the fittest of a number of 
+    individuals chosen at random.  Larger tournaments give more pressure.
+    '''
+    def __init__(self, size=2):
+        '''
+        Configures tournament selection
+        @param size: number of competitors per tournament (min=1)
+        '''
+        if size < 1:
+            raise ValueError('Tournaments must have at least 1 competitor')
+        self.size = size
+
+
+    def __call__(self, population, count):
+        '''
+        Runs a tournament for each selection
+        @param population: population to select from
+        @param count:      number of selections
+        @return:           list of indexes
+        '''
+        fitness, size = population.fitness, population.size
+        if hasattr(fitness, 'argmax'): # NumPy array
+            import numpy
+            competitors = numpy.random.randint(0, size, (count, self.size))
+            winners = fitness[competitors].argmax(axis=1)
+            return competitors[numpy.arange(count), winners]
+
+        choose = random.randrange
+        competitors = xrange(self.size)
+        return [
+            max((choose(size) for _ in competitors), key=fitness.__getitem__)
+            for _ in xrange(count)
+        ]
@@ -0,0 +1,276 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Provides a persistent fitness store, so that runs of the same problem
+with different seeds or parameters do not re-evaluate expressions that
+earlier runs already evaluated.  Fitness values are kept in a local 
+SQLite database, keyed by a digest of the canonical form of each
+chromosome (see canonical) and a fingerprint of the data it is evaluated
+against.  Chromosome types opt in through their store attribute:
+
+    from pygep.store import FitnessStore, fingerprint
+    Regression.store = FitnessStore('fitness.db', fingerprint(samples))
+
+Chromosome.fitness then consults the store before calling _fitness and
+saves what it computes, and the evaluators in pygep.evaluation look up 
+the chromosomes of a generation in batches.  Writes are batched too, and
+the least recently used values are evicted once the store holds more
+than maxsize of them.  Call close() at the end of a run to write out any
+pending values.  Found and missing values are counted as 'store_hits' and
+'store_misses' in pygep.util.stats.counters.
+
+Fitness values must be numbers.  Fitness functions that depend on more
+than the expressions the chromosomes encode and the fingerprinted data 
+should not use a store.
+'''
+
+from pygep.util import stats
+import cPickle, hashlib, os, sqlite3, sys
+
+
+__all__ = 'FitnessStore', 'canonical', 'fingerprint'
+
+
+_names = {} # function -> qualified name
+
+
+def _name(allele):
+    '''@return: qualified name of a function or repr of a terminal'''
+    if not callable(allele):
+        return repr(allele)
+
+    try:
+        return _names[allele]
+    except KeyError:
+        pass
+
+    # Library functions are lambdas, or bound to names other than their
+    # own: name them by the public name they are bound to in their module
+    module = getattr(allele, '__module__', None)
+    name   = getattr(allele, '__name__', '<lambda>')
+    bound  = [n for n, v in sorted(vars(sys.modules[module]).items())
+              if v is allele] if module in sys.modules else []
+    public = [n for n in bound if not n.startswith('_')]
+    if public and name not in public:
+        name = public[0]
+    elif not bound and name == '<lambda>': # symbol and line number
+        name = '%s@%s' % (getattr(allele, 'symbol', name), 
+                          allele.func_code.co_firstlineno)
+
+    _names[allele] = name = '%s.%s' % (module, name)
+    return name
+
+
+def canonical(chromosome):
+    '''
+    Describes a chromosome by what determines its fitness: its type, the
+    coding regions of its genes, the RNC values they use and its linker.
+    Functions are named by module and the name they are bound to there,
+    so the description is the same from one run to the next.
+    @param chromosome: chromosome to describe
+    @return:           canonical string
+    '''
+    genes = []
+    for gene in chromosome.genes:
+        alleles = gene.alleles
+        rncs    = alleles[gene.rnc:gene.rnc+gene._rncs_used]
+        genes.append((
+            tuple(_name(a) for a in alleles[:gene.coding+1]),
+            tuple(repr(gene.dc[i]) for i in rncs)
+        ))
+
+    return repr((_name(type(chromosome)), genes, _name(chromosome.linker)))
+
+
+def fingerprint(data):
+    '''
+    Computes a fingerprint of the data used by a fitness function
+    @param data: any picklable object, such as a list of samples
+    @return:     hex digest
+    '''
+    return hashlib.sha1(cPickle.dumps(data, 2)).hexdigest()
+
+
+class FitnessStore(object):
+    '''
+    A size-capped, least recently used store of fitness values in SQLite.
+    A store only works in the process that opened it, so that worker 
+    processes forked by an evaluator leave it alone.
+    '''
+    def __init__(self, path, fingerprint='', maxsize=1000000, batch=1000):
+        '''
+        Opens or creates a fitness store
+        @param path:        database file name
+        @param fingerprint: fingerprint of the fitness data
+        @param maxsize:     maximum number of fitness values kept
+        @param batch:       number of changes to write at once
+        '''
+        self.fingerprint = fingerprint
+        self.maxsize     = maxsize
+        self.batch       = batch
+
+        self._pid = os.getpid()
+        self._db  = sqlite3.connect(path)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS fitness '
+            '(key BLOB PRIMARY KEY, fitness, used INTEGER)'
+        )
+        self._db.execute(
+            'CREATE INDEX IF NOT EXISTS fitness_used ON fitness (used)'
+        )
+        
+        # Use counter for LRU eviction
+        self._tick = self._db.execute(
+            'SELECT MAX(used) FROM fitness'
+        ).fetchone()[0] or 0
+
+        self._writes = {} # key -> fitness
+        self._uses   = {} # key -> tick
+
+
+    def key(self, chromosome):
+        '''@return: digest of a chromosome and the fingerprint'''
+        return hashlib.sha1(self.fingerprint + canonical(chromosome)).digest()
+
+
+    def __len__(self):
+        '''@return: number of fitness values stored'''
+        self.flush()
+        return self._db.execute('SELECT COUNT(*) FROM fitness').fetchone()[0]
+
+
+    def __getitem__(self, chromosome):
+        '''
+        Looks up the fitness of a chromosome
+        @param chromosome: chromosome to look up
+        @return:           fitness value
+        @raise KeyError:   if the fitness is not known
+        '''
+        found = self.fetch([chromosome])
+        if not found:
+            raise KeyError(chromosome)
+        return found[0]
+
+
+    def __setitem__(self, chromosome, fitness):
+        '''
+        Saves the fitness of a chromosome
+        @param chromosome: evaluated chromosome
+        @param fitness:    its fitness
+        '''
+        if os.getpid() == self._pid:
+            key = self.key(chromosome)
+            self._writes[key] = fitness
+            self._use(key)
+
+
+    def _use(self, key):
+        '''Records the use of a key, writing changes out in batches'''
+        self._tick += 1
+        self._uses[key] = self._tick
+        if len(self._uses) >= self.batch:
+            self.flush()
+
+
+    def fetch(self, chromosomes):
+        '''
+        Looks up the fitness of some chromosomes at once
+        @param chromosomes: chromosomes to look up
+        @return:            dict of index in chromosomes -> fitness value
+        '''
+        if os.getpid() != self._pid:
+            return {}
+
+        keys, found = [self.key(c) for c in chromosomes], {}
+        for i, key in enumerate(keys):
+            if key in self._writes:
+                found[i] = self._writes[key]
+
+        # SQLite limits the number of parameters to each query
+        missing = {} # key -> indexes
+        for i, key in enumerate(keys):
+            if i not in found:
+                missing.setdefault(key, []).append(i)
+
+        blobs = [buffer(k) for k in missing]
+        for start in xrange(0, len(blobs), 500):
+            chunk  = blobs[start:start+500]
+            result = self._db.execute(
+                'SELECT key, fitness FROM fitness WHERE key IN (%s)'
+                % ','.join('?' * len(chunk)), chunk
+            )
+            for key, fitness in result:
+                for i in missing[str(key)]:
+                    found[i] = fitness
+        
+        for i in found:
+            self._use(keys[i])
+        
+        stats.count('store_hits', len(found))
+        stats.count('store_misses', len(keys) - len(found))
+        return found
+
+
+    def restore(self, chromosomes):
+        '''
+        Caches the stored fitness values of some chromosomes
+        @param chromosomes: chromosomes without cached fitness values
+        @return:            list of the chromosomes not in the store
+        '''
+        found = self.fetch(chromosomes)
+        for i, fitness in found.iteritems():
+            chromosome = chromosomes[i]
+            setattr(chromosome, chromosome._fitness.cache, fitness)
+        
+        return [c for i, c in enumerate(chromosomes) if i not in found]
+
+
+    def flush(self):
+        '''Writes out pending changes and evicts values over maxsize'''
+        if os.getpid() != self._pid:
+            return
+
+        db = self._db
+        db.executemany(
+            'INSERT OR REPLACE INTO fitness VALUES (?, ?, ?)', 
+            [(buffer(k), f, self._uses.get(k, self._tick))
+             for k, f in self._writes.iteritems()]
+        )
+        db.executemany(
+            'UPDATE fitness SET used = ? WHERE key = ?',
+            [(t, buffer(k)) for k, t in self._uses.iteritems() 
+             if k not in self._writes]
+        )
+        self._writes.clear()
+        self._uses.clear()
+
+        # Least recently used values go first
+        excess = db.execute('SELECT COUNT(*) FROM fitness').fetchone()[0] \
+               - self.maxsize
+        if excess > 0:
+            db.execute(
+                'DELETE FROM fitness WHERE key IN '
+                '(SELECT key FROM fitness ORDER BY used LIMIT ?)', (excess,)
+            )
+        db.commit()
+
+
+    def close(self):
+        '''Writes out pending changes and closes the database'''
+        self.flush()
+        self._db.close()
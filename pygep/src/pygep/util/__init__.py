@@ -27,7 +27,8 @@ def cache(func):
     Decorator for caching the return value of an instance level method in self.
     Assumes that there are no arguments passed to the method (not memoization).
     The return value is cached on self._{method}_cache where {method} is the
-    name of the method.
+    name of the method.  The name of the cached attribute is stored on the 
+    decorated method as method.cache.
     
         @cache
         def _get_something(self):
@@ -46,6 +47,7 @@ def cache(func):
             setattr(self, cache_name, func(self))
             return getattr(self, cache_name)
 
+    wrapper.cache = cache_name
     return wrapper
 
 
@@ -55,7 +57,8 @@ def memoize(func):
     self).  Results are stored in self._{method}_memo where {method} is the 
     name of the method.  Note that the arg must be hashable, thus lists can't 
     be memoized.  The name of the memoized attribute is stored on the method 
-    itself as func.memo.
+    itself as func.memo.  If self has a memo_policy attribute, it is called
+    to create the memo instead of dict (see pygep.util.memo).
     
         @memoize
         def _compute_something(self, arg):
@@ -71,7 +74,7 @@ def memoize(func):
             memo = getattr(self, memo_name)
         except AttributeError:
             # Haven't memoized anything yet
-            memo = {}
+            memo = getattr(self, 'memo_policy', dict)()
             setattr(self, memo_name, memo)
         
         try:
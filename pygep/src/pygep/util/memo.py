@@ -0,0 +1,195 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Provides memo policies, which limit the memory used by the results that
+pygep.util.memoize keeps for each object.  A policy is any callable that
+returns a new, empty memo supporting memo[key], memo[key] = value, len and
+clear.  Objects choose their policy with a memo_policy attribute, so every
+Karva gene can be limited at once:
+
+    KarvaGene.memo_policy = functools.partial(LRUMemo, 1000)
+    KarvaGene.memo_policy = WeakMemo
+    KarvaGene.memo_policy = MemoBudget(1000000)
+
+The policies available are:
+    - dict:       unbounded (the default)
+    - LRUMemo:    keeps a maximum number of recently used results
+    - WeakMemo:   drops results once their keys are garbage collected
+    - MemoBudget: bounds the total number of results across all memos,
+                  clearing the least recently extended memos first
+
+Memos can also be trimmed from the outside with trim(), which is how 
+Population.memo_limit is applied between generations.
+'''
+
+from collections import OrderedDict
+from functools import partial
+from weakref import WeakKeyDictionary
+import weakref
+
+
+__all__ = 'LRUMemo', 'WeakMemo', 'MemoBudget', 'trim'
+
+
+class LRUMemo(object):
+    '''Memo holding at most maxsize results, evicting the least recent'''
+    def __init__(self, maxsize):
+        '''@param maxsize: maximum number of results (min=1)'''
+        self.maxsize = maxsize
+        self._data   = OrderedDict()
+
+
+    def __len__(self):
+        return len(self._data)
+
+
+    def __contains__(self, key):
+        return key in self._data
+
+
+    def __getitem__(self, key):
+        '''@return: memoized value, which becomes the most recently used'''
+        value = self._data.pop(key)
+        self._data[key] = value
+        return value
+
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+    def clear(self):
+        self._data.clear()
+
+
+    def trim(self, maxsize):
+        '''
+        Evicts the least recently used results down to some size
+        @param maxsize: number of results to keep
+        '''
+        while len(self._data) > maxsize:
+            self._data.popitem(last=False)
+
+
+class WeakMemo(WeakKeyDictionary):
+    '''
+    Memo that does not keep its keys alive.  Keys that cannot be weakly 
+    referenced, such as ints and tuples, are simply not memoized.
+    '''
+    def __getitem__(self, key):
+        try:
+            return WeakKeyDictionary.__getitem__(self, key)
+        except TypeError: # cannot be weakly referenced
+            raise KeyError(key)
+
+
+    def __setitem__(self, key, value):
+        try:
+            WeakKeyDictionary.__setitem__(self, key, value)
+        except TypeError: # cannot be weakly referenced
+            pass
+
+
+class MemoBudget(object):
+    '''
+    Policy sharing a budget of maxsize results between all of its memos.
+    When the budget is exceeded, whole memos are cleared, starting with 
+    the one that has gone longest without a new result.  The number of 
+    results currently held is given by the size attribute.
+    '''
+    def __init__(self, maxsize):
+        '''@param maxsize: maximum number of results in all memos'''
+        self.maxsize = maxsize
+        self.size    = 0
+        self._memos  = OrderedDict() # id -> [weakref to memo, results]
+
+
+    def __call__(self):
+        '''@return: new memo charged to this budget'''
+        return BudgetMemo(self)
+
+
+    def charge(self, memo):
+        '''
+        Accounts for a new result in a memo, then clears the least recently
+        extended memos until the budget is met
+        @param memo: BudgetMemo receiving a result
+        '''
+        key = id(memo)
+        try:
+            entry = self._memos.pop(key)
+        except KeyError:
+            entry = [weakref.ref(memo, partial(self.forget, key)), 0]
+        
+        entry[1] += 1
+        self._memos[key] = entry
+        self.size += 1
+        
+        while self.size > self.maxsize and self._memos:
+            ref, results = self._memos.popitem(last=False)[1]
+            self.size -= results
+            if ref() is not None:
+                dict.clear(ref())
+
+
+    def forget(self, key, _=None):
+        '''
+        Stops accounting for a memo that was cleared or garbage collected
+        @param key: id of the memo
+        '''
+        try:
+            self.size -= self._memos.pop(key)[1]
+        except KeyError: # already evicted
+            pass
+
+
+class BudgetMemo(dict):
+    '''Memo whose results are charged to a MemoBudget'''
+    def __init__(self, budget):
+        dict.__init__(self)
+        self.budget = budget
+
+
+    def __setitem__(self, key, value):
+        new = key not in self
+        dict.__setitem__(self, key, value)
+        if new:
+            self.budget.charge(self)
+
+
+    def clear(self):
+        self.budget.forget(id(self))
+        dict.clear(self)
+
+
+def trim(memos, maxsize=0):
+    '''
+    Trims some memos.  Memos that know how to trim themselves (like an 
+    LRUMemo) are cut down to maxsize results, and any other memo larger
+    than that is cleared entirely.
+    @param memos:   memos to trim
+    @param maxsize: number of results to keep per memo (default: none)
+    '''
+    for memo in memos:
+        if len(memo) > maxsize:
+            if hasattr(memo, 'trim'):
+                memo.trim(maxsize)
+            else:
+                memo.clear()
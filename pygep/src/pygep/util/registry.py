@@ -0,0 +1,65 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Provides a global registry of GEP functions and linkers.  Each registered 
+function receives a stable integer ID, assigned in order of registration,
+which allows genes and chromosomes to be sent across process boundaries 
+(or saved) as compact arrays of IDs rather than as function objects.  All
+functions decorated with symbol() are registered, as are the linkers in 
+pygep.functions.linkers.
+
+IDs are stable as long as the same modules are imported in the same order,
+which is always true for worker processes forked from a running program.
+'''
+
+
+__all__ = 'register', 'identify', 'lookup'
+
+
+_functions = [] # registered functions by ID
+_ids       = {} # function -> ID
+
+
+def register(func):
+    '''
+    Registers a function, giving it an ID.  May be used as a decorator.
+    Registering a function more than once keeps its original ID.
+    @param func: function to register
+    @return:     func
+    '''
+    if func not in _ids:
+        _ids[func] = len(_functions)
+        _functions.append(func)
+    return func
+
+
+def identify(func):
+    '''
+    @param func: registered function
+    @return:     ID of the function
+    @raise KeyError: if the function is not registered
+    '''
+    return _ids[func]
+
+
+def lookup(func_id):
+    '''
+    @param func_id: ID of a registered function
+    @return:        the function
+    '''
+    return _functions[func_id]
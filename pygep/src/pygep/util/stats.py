@@ -17,12 +17,39 @@
 
 '''
 Provides a functions for computating fitness statistics about
-a given population
+a given population, as well as named event counters for reporting
+the effects of various optimizations.
 '''
 
+from collections import defaultdict
 import math
 
 
+# Named event counters: name -> number of occurrences
+counters = defaultdict(int)
+
+
+def count(name, num=1):
+    '''
+    Increments a named event counter
+    @param name: counter name
+    @param num:  number of events
+    '''
+    counters[name] += num
+
+
+def counts_since(snapshot):
+    '''
+    Computes counter changes since a snapshot of the counters
+    @param snapshot: dict copy of the counters taken earlier
+    @return:         dict of counter name -> number of new events
+    '''
+    return dict(
+        (name, num - snapshot.get(name, 0))
+        for name, num in counters.iteritems() if num != snapshot.get(name, 0)
+    )
+
+
 def fitness_stats(population):
     '''
     Computes fitness statistics for a given population
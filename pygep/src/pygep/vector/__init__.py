@@ -0,0 +1,64 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Provides batch evaluation of GEP genes and chromosomes over columnar
+data using NumPy.  A columnar dataset is any mapping of terminal names
+to equal length NumPy arrays:
+
+    columns = {'x': numpy.array([1., 2., 3.]), 'y': ...}
+    results = chromosome.batch(columns)
+
+Evaluating a gene in this fashion walks its coding region once, with 
+each function applied to entire arrays rather than to single values.
+Datasets registered by building them as Columns rather than dicts are
+hashed by identity, and genes memoize their result vectors for them:
+
+    columns = Columns(x=numpy.array([1., 2., 3.]), y=...)
+
+A gene shared by many chromosomes is then evaluated once per dataset.
+Identical subtrees in different genes can be evaluated once as well by
+giving a registered dataset a pygep.vector.subtrees.SubtreeCache.
+Importing this package attaches vector forms to the functions in the
+standard libraries:
+    - pygep.vector.mathematical
+    - pygep.vector.logical
+    - pygep.vector.linkers
+
+Functions without a vector form are applied element-wise via NumPy.
+Semantic errors such as division by zero do not raise exceptions in
+batch evaluation.  They result in NaN or inf values in the results.
+
+Boolean problems can be packed into Bits, which evaluate the logical
+functions over many fitness cases at a time as bitwise operations on
+integers.  See pygep.vector.bitwise.
+
+Very large populations can be kept as matrices of symbol codes and varied
+a generation at a time with pygep.vector.population.MatrixPopulation.
+'''
+
+from pygep.vector.bitwise import bitwise, Bits
+from pygep.vector.engine import vector, vectorize, Columns, evaluate, link
+from pygep.vector.population import MatrixPopulation
+from pygep.vector.subtrees import SubtreeCache
+import pygep.vector.linkers
+import pygep.vector.logical
+import pygep.vector.mathematical
+
+
+__all__ = 'vector', 'vectorize', 'Columns', 'evaluate', 'link', \
+          'MatrixPopulation', 'SubtreeCache', 'bitwise', 'Bits'
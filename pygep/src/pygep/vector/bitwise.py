@@ -0,0 +1,218 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Provides bit-parallel evaluation of boolean GEP genes and chromosomes.  
+A Bits dataset packs the truth values of each terminal across all of the
+fitness cases into a single arbitrary-precision integer, bit i holding
+fitness case i.  The logical operators then run as bitwise operations on
+whole words of cases at a time:
+
+    table   = Bits.truth_table('a', 'b', 'c')
+    results = chromosome.batch(table)
+    hits    = table.hits(results, target)
+
+Bits are registered datasets (see pygep.vector.Columns), so gene results
+are memoized for them.  Packed results are truth values only: bit i is
+set when the result for fitness case i is true.  Since Python integers
+behave as infinite two's complement words, results are only masked to
+the number of rows once each gene has been evaluated.  Importing this
+module attaches bitwise forms to these functions:
+    - pygep.functions.logical: and_op, or_op, not_op, if_op
+    - pygep.functions.linkers: or_linker
+
+Functions without a bitwise form are applied to each row in turn, with 
+their arguments unpacked to 0 or 1.  Linkers without a bitwise form are
+applied to the packed results as they are.
+'''
+
+from pygep.functions import linkers, logical
+from pygep.vector.engine import Columns, rows
+
+
+__all__ = 'bitwise', 'pack', 'unpack', 'popcount', 'Bits', 'evaluate', \
+          'link'
+
+
+def bitwise(scalar):
+    '''
+    Decorator that assigns a bitwise form to a boolean function for 
+    bit-parallel evaluation.  The bitwise form is stored in scalar.bitwise
+    and must accept and return packed integers.
+
+        @bitwise(xor_op)
+        def xor(i, j):
+            return i ^ j
+
+    @param scalar: function the decorated function works on packed bits
+    '''
+    def decorator(func):
+        '''
+        Attaches func to the scalar function as its 'bitwise' attribute
+        @param func: bitwise function
+        '''
+        scalar.bitwise = func
+        return func
+
+    return decorator
+
+
+def pack(values):
+    '''
+    @param values: sequence of truth values, one per row
+    @return:       integer with bit i set if values[i] is true
+    '''
+    digits = ''.join(v and '1' or '0' for v in reversed(values))
+    return int(digits or '0', 2)
+
+
+def unpack(bits, rows):
+    '''
+    @param bits: packed truth values
+    @param rows: number of rows packed into bits
+    @return:     list of 1s and 0s, one per row
+    '''
+    digits = bin(bits & ((1 << rows) - 1))[2:].zfill(rows)
+    return [int(d) for d in reversed(digits)]
+
+
+def popcount(bits):
+    '''@return: number of bits set in a non-negative integer'''
+    return bin(bits).count('1')
+
+
+class Bits(Columns):
+    '''
+    A boolean dataset packed for bit-parallel evaluation.  Maps terminal
+    names to packed integers, and knows its number of rows and the mask 
+    covering them.
+    '''
+    def __init__(self, rows, columns=()):
+        '''
+        Creates a packed dataset
+        @param rows:    number of rows (fitness cases) in the dataset
+        @param columns: mapping of terminal name to packed truth values
+        '''
+        Columns.__init__(self, columns)
+        self.rows = rows
+        self.mask = (1 << rows) - 1
+
+
+    @classmethod
+    def from_columns(cls, columns):
+        '''
+        Packs a columnar dataset of truth values
+        @param columns: mapping of terminal name to sequence of values
+        @return:        new Bits instance
+        '''
+        return cls(rows(columns), 
+            ((name, pack(values)) for name, values in columns.iteritems()))
+
+
+    @classmethod
+    def truth_table(cls, *names):
+        '''
+        Packs every combination of truth values for a set of terminals.
+        The first name is the most significant bit of the row number, as
+        when a truth table is written out by hand.
+        @param names: terminal names
+        @return:      new Bits instance with 2**len(names) rows
+        '''
+        table = cls(1 << len(names))
+        for i, name in enumerate(reversed(names)):
+            period = 1 << i # runs of 0s then 1s, period rows long
+            block  = ((1 << period) - 1) << period
+            table[name] = block * (table.mask // ((1 << 2*period) - 1))
+        return table
+
+
+    def hits(self, results, target):
+        '''
+        @param results: packed results, as from Chromosome.batch
+        @param target:  packed expected results
+        @return:        number of rows where results matches target
+        '''
+        return popcount(~(results ^ target) & self.mask)
+
+
+    def evaluate(self, gene):
+        '''@return: packed result of evaluating a Karva gene'''
+        return evaluate(gene, self)
+
+
+    def link(self, linker, results):
+        '''@return: linked packed results of the genes of a chromosome'''
+        return link(linker, results, self)
+
+
+def _elementwise(function, args, rows):
+    '''@return: packed results of applying function to each row of args'''
+    columns = [unpack(a, rows) for a in args]
+    return pack([function(*values) for values in zip(*columns)])
+
+
+def evaluate(gene, bits):
+    '''
+    Evaluates the coding region of a Karva gene once over a packed boolean
+    dataset.  Terminals are looked up as packed columns, constants become
+    all 1s or all 0s, and the functions of the gene are replaced with
+    their bitwise forms.
+
+    @param gene: KarvaGene instance
+    @param bits: Bits instance
+    @return:     packed results, masked to the rows of bits
+    '''
+    evaluation = [v and -1 or 0 for v in gene._evaluation]
+    for terminal, indexes in gene._terminals:
+        if terminal != '?': # terminal attribute - non-RNC
+            column = bits[terminal]
+            for i in indexes:
+                evaluation[i] = column
+
+    for function, start, stop, dest in gene._plan:
+        args = evaluation[start:stop]
+        form = getattr(function, 'bitwise', None)
+        if form is not None:
+            evaluation[dest] = form(*args)
+        else:
+            evaluation[dest] = _elementwise(function, args, bits.rows)
+
+    return evaluation[0] & bits.mask
+
+
+def link(linker, results, bits):
+    '''
+    Links the packed results of multiple genes with the bitwise form of a
+    linker, if one is available, or with the linker itself.
+    @param linker:  multigenic results linker function
+    @param results: list of packed results, one per gene
+    @param bits:    Bits instance the results were computed over
+    @return:        linked results
+    '''
+    form = getattr(linker, 'bitwise', None)
+    if form is not None:
+        return form(*results) & bits.mask
+    return linker(*results)
+
+
+and_op = bitwise(logical.and_op)(lambda i, j: i & j)
+or_op  = bitwise(logical.or_op )(lambda i, j: i | j)
+not_op = bitwise(logical.not_op)(lambda i: ~i)
+if_op  = bitwise(logical.if_op )(lambda i, j, k: (i & j) | (~i & k))
+
+or_linker = bitwise(linkers.or_linker)(
+    lambda *args: reduce(lambda i, j: i | j, args, 0))
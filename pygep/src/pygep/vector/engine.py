@@ -0,0 +1,162 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Provides the vector decorator for attaching NumPy forms to GEP functions,
+registered columnar datasets, the batch evaluation of Karva genes over
+columnar datasets and the linking of their results.
+'''
+
+import numpy
+
+
+def vector(scalar):
+    '''
+    Decorator that assigns a vectorized form to a scalar function for
+    batch evaluation.  The vector form is stored in scalar.vector and 
+    must accept and return NumPy arrays (or scalars, for constants).
+
+        @vector(divide_op)
+        def divide(x, y):
+            return numpy.true_divide(x, y)
+
+    @param scalar: function the decorated function vectorizes
+    '''
+    def decorator(func):
+        '''
+        Attaches func to the scalar function as its 'vector' attribute
+        @param func: vectorized function
+        '''
+        scalar.vector = func
+        return func
+
+    return decorator
+
+
+def vectorize(func):
+    '''
+    Returns the vector form of a function.  Functions that do not provide
+    one are applied element-wise and receive a vector form on demand.
+    Their results are converted from object arrays to numeric (or bool)
+    arrays, so that NumPy functions can be applied to them in turn.
+    @param func: GEP function or linker
+    @return:     vectorized function
+    '''
+    try:
+        return func.vector
+    except AttributeError:
+        pass
+
+    elementwise = numpy.frompyfunc(func, func.func_code.co_argcount, 1)
+    def vector(*args):
+        '''Applies func element-wise, giving a numeric array if possible'''
+        results = elementwise(*args)
+        if getattr(results, 'dtype', None) == object:
+            results = numpy.array(results.tolist()) # infers the type
+        return results
+
+    func.vector = vector
+    return vector
+
+
+class Columns(dict):
+    '''
+    A columnar dataset registered for result caching.  Unlike a plain dict,
+    Columns compare and hash by identity, so genes can memoize the result 
+    vectors they compute for one.  The columns should not be modified once
+    they have been used.
+
+        columns = Columns(x=numpy.array([1., 2., 3.]), y=...)
+    '''
+    __hash__ = object.__hash__
+
+    def __eq__(self, other):
+        return self is other
+
+    def __ne__(self, other):
+        return self is not other
+
+
+    def evaluate(self, gene):
+        '''@return: result of evaluating a Karva gene over the dataset'''
+        return evaluate(gene, self)
+
+
+    def link(self, linker, results):
+        '''@return: linked results of the genes of a chromosome'''
+        return link(linker, results)
+
+
+def rows(columns):
+    '''@return: number of rows in a columnar dataset'''
+    for column in columns.itervalues():
+        return len(column)
+    raise ValueError('Columnar datasets must have at least one column')
+
+
+def evaluate(gene, columns):
+    '''
+    Evaluates the coding region of a Karva gene once over a columnar 
+    dataset.  Terminals are looked up as column names and the functions
+    of the gene are replaced with their vector forms.  If the dataset has
+    a subtrees attribute, the plan is run through that SubtreeCache.
+    
+    @param gene:    KarvaGene instance
+    @param columns: mapping of terminal name to NumPy array
+    @return:        NumPy array with one result per row
+    '''
+    # Constants and RNCs are already filled in.  We only need columns.
+    evaluation = list(gene._evaluation)
+    for terminal, indexes in gene._terminals:
+        if terminal != '?': # terminal attribute - non-RNC
+            column = columns[terminal]
+            for i in indexes:
+                evaluation[i] = column
+
+    # Semantic errors turn into NaN or inf instead of exceptions
+    errors   = numpy.seterr(all='ignore')
+    subtrees = getattr(columns, 'subtrees', None)
+    try:
+        if subtrees is not None: # common subexpression cache
+            subtrees.run(gene, evaluation)
+        else:
+            for function, start, stop, dest in gene._plan:
+                evaluation[dest] = vectorize(function)(*evaluation[start:stop])
+
+    finally:
+        numpy.seterr(**errors)
+
+    # Genes of constants still need one result per row
+    results = numpy.asarray(evaluation[0])
+    if not results.ndim:
+        results = numpy.repeat(results, rows(columns))
+    return results
+
+
+def link(linker, results):
+    '''
+    Links the batch results of multiple genes with the vector form of a
+    linker, if one is available, or with the linker itself.
+    @param linker:  multigenic results linker function
+    @param results: list of NumPy arrays, one per gene
+    @return:        linked results
+    '''
+    errors = numpy.seterr(all='ignore')
+    try:
+        return getattr(linker, 'vector', linker)(*results)
+    finally:
+        numpy.seterr(**errors)
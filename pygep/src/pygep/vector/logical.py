@@ -0,0 +1,36 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Vector forms of the pygep.functions.logical library.  As with the scalar
+operators, these return either 1, 0 or the values passed in to them.
+'''
+
+from pygep.functions import logical
+from pygep.vector.engine import vector
+import numpy
+
+
+__all__ = ()
+
+
+and_op = vector(logical.and_op)(
+    lambda i, j: numpy.where(numpy.logical_and(i, j), i, 0))
+or_op  = vector(logical.or_op )(
+    lambda i, j: numpy.where(i, i, numpy.where(j, j, 0)))
+not_op = vector(logical.not_op)(lambda i: numpy.where(i, 0, 1))
+if_op  = vector(logical.if_op )(lambda i, j, k: numpy.where(i, j, k))
@@ -0,0 +1,125 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Vector forms of the pygep.functions.mathematical library.  Each name in 
+this module is the NumPy equivalent of the function of the same name in
+the scalar library, and is attached to it as its vector attribute.
+'''
+
+from pygep.functions.mathematical import arithmetic, comparison, constants
+from pygep.functions.mathematical import hyperbolic, power, rounding
+from pygep.functions.mathematical import trigonometry
+from pygep.functions import protected
+from pygep.vector.engine import vector
+import math, numpy
+
+
+__all__ = ()
+
+
+# Arithmetic
+add_op      = vector(arithmetic.add_op     )(numpy.add)
+subtract_op = vector(arithmetic.subtract_op)(numpy.subtract)
+multiply_op = vector(arithmetic.multiply_op)(numpy.multiply)
+divide_op   = vector(arithmetic.divide_op  )(numpy.true_divide)
+modulus_op  = vector(arithmetic.modulus_op )(numpy.mod)
+
+
+# Comparison: i if the comparison holds else j
+equal_op            = vector(comparison.equal_op)(
+    lambda i, j: numpy.where(numpy.equal(i, j), i, j))
+unequal_op          = vector(comparison.unequal_op)(
+    lambda i, j: numpy.where(numpy.not_equal(i, j), i, j))
+less_op             = vector(comparison.less_op)(
+    lambda i, j: numpy.where(numpy.less(i, j), i, j))
+greater_op          = vector(comparison.greater_op)(
+    lambda i, j: numpy.where(numpy.greater(i, j), i, j))
+less_or_equal_op    = vector(comparison.less_or_equal_op)(
+    lambda i, j: numpy.where(numpy.less_equal(i, j), i, j))
+greater_or_equal_op = vector(comparison.greater_or_equal_op)(
+    lambda i, j: numpy.where(numpy.greater_equal(i, j), i, j))
+
+
+# Constants broadcast against any columns they are combined with
+zero_op = vector(constants.zero_op)(lambda: 0)
+one_op  = vector(constants.one_op )(lambda: 1)
+pi_op   = vector(constants.pi_op  )(lambda: math.pi)
+e_op    = vector(constants.e_op   )(lambda: math.e)
+
+
+# Hyperbolic
+sineh_op      = vector(hyperbolic.sineh_op     )(numpy.sinh)
+cosineh_op    = vector(hyperbolic.cosineh_op   )(numpy.cosh)
+tangenth_op   = vector(hyperbolic.tangenth_op  )(numpy.tanh)
+cosecanth_op  = vector(hyperbolic.cosecanth_op )(lambda i: 1. / numpy.sinh(i))
+secanth_op    = vector(hyperbolic.secanth_op   )(lambda i: 1. / numpy.cosh(i))
+cotangenth_op = vector(hyperbolic.cotangenth_op)(lambda i: 1. / numpy.tanh(i))
+
+
+# Power: exponents are computed as floats, since NumPy refuses negative
+# integer powers of integers where Python would return a float.
+ln_op        = vector(power.ln_op       )(numpy.log)
+log10_op     = vector(power.log10_op    )(numpy.log10)
+power_op     = vector(power.power_op    )(
+    lambda i, j: numpy.power(numpy.asarray(i, float), j))
+exp_op       = vector(power.exp_op      )(numpy.exp)
+pow10_op     = vector(power.pow10_op    )(lambda i: numpy.power(10., i))
+square_op    = vector(power.square_op   )(numpy.square)
+cube_op      = vector(power.cube_op     )(lambda i: numpy.power(i, 3))
+root_op      = vector(power.root_op     )(numpy.sqrt)
+cube_root_op = vector(power.cube_root_op)(lambda i: numpy.power(i, 1./3))
+inverse_op   = vector(power.inverse_op  )(lambda i: numpy.true_divide(1., i))
+
+
+# Rounding: Python rounds half away from zero, NumPy half to even
+floor_op = vector(rounding.floor_op)(numpy.floor)
+ceil_op  = vector(rounding.ceil_op )(numpy.ceil)
+round_op = vector(rounding.round_op)(
+    lambda i: numpy.copysign(numpy.floor(numpy.abs(i) + .5), i))
+abs_op   = vector(rounding.abs_op  )(numpy.abs)
+
+
+# Trigonometry
+sine_op         = vector(trigonometry.sine_op        )(numpy.sin)
+cosine_op       = vector(trigonometry.cosine_op      )(numpy.cos)
+tangent_op      = vector(trigonometry.tangent_op     )(numpy.tan)
+cosecant_op     = vector(trigonometry.cosecant_op    )(
+    lambda i: 1. / numpy.sin(i))
+secant_op       = vector(trigonometry.secant_op      )(
+    lambda i: 1. / numpy.cos(i))
+cotangent_op    = vector(trigonometry.cotangent_op   )(
+    lambda i: 1. / numpy.tan(i))
+arcsine_op      = vector(trigonometry.arcsine_op     )(numpy.arcsin)
+arccosine_op    = vector(trigonometry.arccosine_op   )(numpy.arccos)
+arctangent_op   = vector(trigonometry.arctangent_op  )(numpy.arctan)
+arccosecant_op  = vector(trigonometry.arccosecant_op )(
+    lambda i: 1. / numpy.arcsin(i))
+arcsecant_op    = vector(trigonometry.arcsecant_op   )(
+    lambda i: 1. / numpy.arccos(i))
+arccotangent_op = vector(trigonometry.arccotangent_op)(
+    lambda i: 1. / numpy.arctan(i))
+
+
+# Protected and bounded functions return what NumPy does (floats bound 
+# results anyway), so share the vector forms
+for _module in arithmetic, hyperbolic, power, rounding, trigonometry:
+    for _name, _func in vars(_module).items():
+        if _name.endswith('_op') and hasattr(protected, _name):
+            vector(getattr(protected, _name))(_func.vector)
+        if _name.endswith('_op') and hasattr(power, 'bounded_' + _name):
+            vector(getattr(power, 'bounded_' + _name))(_func.vector)
@@ -0,0 +1,499 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Provides an array backed population for very large numbers of chromosomes.
+Each generation is held as a 2-D matrix of symbol codes, one row per 
+individual and one column per locus, and variation is applied to whole
+generations at once with NumPy random masks and fancy indexing.
+'''
+
+from pygep.functions.linkers import default_linker
+from pygep.population import Population
+from pygep.util import stats
+import numpy
+
+
+__all__ = 'MatrixPopulation',
+
+
+class MatrixPopulation(Population):
+    '''
+    A Population that stores its generations in self.matrix, an array of
+    the codes of each allele in the SymbolTable of its chromosome type
+    (RNC indexes are stored as they are) and, when RNCs are used, the RNC
+    values of each gene in self.dcs.  Configuration and usage are the same
+    as for a Population, including the variation rates and selection,
+    though the fitness attribute is a NumPy array so that selection 
+    strategies work on whole arrays (see pygep.selection):
+
+        p = MatrixPopulation(Chromosome, 100000, head-length, 
+                             number-genes, ET-linker-function)
+
+    The variation operators have the same effects as their counterparts 
+    in Chromosome, but draw from numpy.random rather than random.  For 
+    fitness evaluation, chromosome objects are built for new rows only.
+    Rows without changes to any coding region inherit their parents'
+    fitness values, as chromosomes normally do.
+    '''
+    def __init__(self, cls, size, head, genes=1, linker=default_linker,
+                 evaluator=None):
+        '''
+        Generates a matrix population of some chromsome class
+        @param cls:       Chromosome type
+        @param size:      population size
+        @param head:      chromosome head length (min=0)
+        @param genes:     number of genes (min=1)
+        @param linker:    multigenic results linker function
+        @param evaluator: fitness evaluation backend (default: serial)
+        '''
+        super(MatrixPopulation, self).__init__(
+            cls, size, head, genes, linker, evaluator
+        )
+        self.cls   = cls
+        table      = cls.arities
+        first_gene = self.population[0].genes[0]
+
+        # Gene layout: head, tail and possibly an RNC region
+        self.tail = head * (cls.arity - 1) + 1
+        self.gene_length = len(first_gene)
+        self.rnc_length  = self.gene_length - head - self.tail
+
+        # Lookup arrays by symbol code
+        self._symbols   = numpy.empty(len(table.symbols), object)
+        self._symbols[:] = table.symbols
+        self._args      = numpy.array([table[s] or 0 for s in table.symbols])
+        self._functions = numpy.array(
+            [table[s] is not None for s in table.symbols]
+        )
+
+        # Codes to draw from in the head and tail, keeping repetitions
+        self._head_codes = numpy.array([table.add(s) for s in cls.symbols])
+        self._tail_codes = numpy.array([table.add(s) for s in cls.terminals])
+
+        # Column layout: gene number and index within the gene
+        columns = numpy.arange(self.gene_length * genes)
+        self._gene, self._locus = divmod(columns, self.gene_length)
+
+        self.matrix = numpy.array(
+            [self._encode(c) for c in self.population], numpy.uint16
+        )
+        if self.rnc_length:
+            self.dcs = numpy.array(
+                [[g.dc for g in c.genes] for c in self.population]
+            )
+        else:
+            self.dcs = None
+
+
+    def _encode(self, chromosome):
+        '''@return: list of codes for the alleles of a chromosome'''
+        codes, symbolic = [], self.head + self.tail
+        for gene in chromosome.genes:
+            alleles = list(gene)
+            codes.extend(self.cls.arities.add(a) for a in alleles[:symbolic])
+            codes.extend(alleles[symbolic:])
+        return codes
+
+
+    def _decode(self, row, dcs=None):
+        '''
+        Builds a chromosome from a row of the matrix
+        @param row: array of codes
+        @param dcs: RNC values of each gene, if any
+        @return:    new chromosome
+        '''
+        cls, symbolic = self.cls, self.head + self.tail
+        genes, dc = [], []
+        for g in xrange(self.genes):
+            codes   = row[g*self.gene_length:(g+1)*self.gene_length]
+            alleles = self._symbols[codes[:symbolic]].tolist()
+            if dcs is not None:
+                alleles.extend(codes[symbolic:].tolist())
+                dc = dcs[g].tolist()
+            genes.append(cls.gene_type(alleles, self.head, dc, cls.arities))
+
+        return cls(genes, self.head, self.linker, dc)
+
+
+    def coding(self, matrix=None):
+        '''
+        Computes the coding regions of every gene of every row at once
+        @param matrix: matrix of codes (default: self.matrix)
+        @return:       (rows x genes) array of last coding indexes
+        '''
+        if matrix is None:
+            matrix = self.matrix
+
+        rows = len(matrix)
+        ends = numpy.empty((rows, self.genes), int)
+        for g in xrange(self.genes):
+            # As in KarvaGene: move the next unclaimed argument index forward
+            # by the arity of each locus until the walk catches up to it
+            offset = g * self.gene_length
+            index  = numpy.ones(rows, int)
+            for i in xrange(self.head + self.tail):
+                active = i < index
+                if not active.any():
+                    break
+                index += active * self._args[matrix[:, offset+i]]
+            ends[:, g] = index - 1
+
+        return ends
+
+
+    def cycle(self):
+        '''Selects, replicates and recombines the next generation'''
+        snapshot = dict(stats.counters)
+
+        parents = self._select()
+        matrix  = self.matrix[parents]
+        dcs     = self.dcs[parents] if self.dcs is not None else None
+
+        # Recombination section - always exclude best
+        if self.mutation_rate:
+            self._mutate(matrix)
+        if self.inversion_rate:
+            self._invert(matrix)
+        if self.is_transposition_rate:
+            self._transpose_is(matrix)
+        if self.ris_transposition_rate:
+            self._transpose_ris(matrix)
+        if self.gene_transposition_rate:
+            self._transpose_gene(matrix, dcs)
+        if self.crossover_one_point_rate:
+            self._crossover_one_point(matrix)
+        if self.crossover_two_point_rate:
+            self._crossover_two_point(matrix, dcs)
+        if self.crossover_gene_rate:
+            self._crossover_gene(matrix, dcs)
+
+        self._replace(parents, matrix, dcs)
+        self._advance(snapshot)
+
+
+    def _evaluate(self, cutoff=None):
+        '''Evaluates the population, keeping its fitness values in an array'''
+        super(MatrixPopulation, self)._evaluate(cutoff)
+        self.fitness = numpy.array(self.fitness)
+
+
+    def _select(self):
+        '''
+        Chooses the rows of the next generation: the best individual first,
+        then the rest according to the selection strategy
+        @return: array of parent row indexes
+        '''
+        parents = numpy.empty(self.size, int)
+
+        # Gives preference to later individuals tied for best
+        parents[0]  = self.size - 1 - numpy.argmax(self.fitness[::-1])
+        parents[1:] = self.selection(self, self.size-1)
+        return parents
+
+
+    def _chosen(self, rate):
+        '''@return: indexes of the rows (excluding the first) chosen at rate'''
+        return 1 + numpy.flatnonzero(
+            numpy.random.random_sample(self.size-1) < rate
+        )
+
+
+    def _pairs(self, rate):
+        '''
+        Generates random row pairs for crossover
+        @param rate: crossover rate
+        @return:     (first rows, second rows)
+        '''
+        # Crossover requires at least 3 individuals since the first isn't used
+        if self.size < 3:
+            return numpy.array([], int), numpy.array([], int)
+
+        rows = self._chosen(rate)
+        numpy.random.shuffle(rows)
+        rows = rows[:len(rows) // 2 * 2].reshape(-1, 2)
+        return rows[:, 0], rows[:, 1]
+
+
+    def _mutate(self, matrix):
+        '''Applies point mutation to every locus of every row but the first'''
+        sample = numpy.random.random_sample(matrix[1:].shape)
+        rows, columns = numpy.nonzero(sample < self.mutation_rate)
+        rows += 1
+        
+        # Heads draw from all symbols, tails from terminals only and RNC
+        # regions from RNC indexes
+        locus = self._locus[columns]
+        head  = locus < self.head
+        tail  = (locus >= self.head) & (locus < self.head + self.tail)
+        rnc   = locus >= self.head + self.tail
+
+        new = numpy.empty(len(columns), matrix.dtype)
+        new[head] = self._head_codes[
+            numpy.random.randint(0, len(self._head_codes), head.sum())
+        ]
+        new[tail] = self._tail_codes[
+            numpy.random.randint(0, len(self._tail_codes), tail.sum())
+        ]
+        if self.rnc_length:
+            new[rnc] = numpy.random.randint(0, self.dcs.shape[2], rnc.sum())
+        
+        matrix[rows, columns] = new
+
+
+    def _rearrange(self, matrix, rows, sources):
+        '''
+        Rewrites rows of the matrix from their own loci
+        @param rows:    indexes of rows to rewrite
+        @param sources: (rows x columns) array of source columns
+        '''
+        matrix[rows] = matrix[rows[:, numpy.newaxis], sources]
+
+
+    def _invert(self, matrix):
+        '''Reverses a random sequence in the head of one gene of some rows'''
+        if self.head < 2: # Head inversion does nothing in this case
+            return
+
+        rows = self._chosen(self.inversion_rate)
+        num  = len(rows)
+
+        # Choose a random gene and two distinct points within the head
+        offset = numpy.random.randint(0, self.genes, num) * self.gene_length
+        start  = numpy.random.randint(0, self.head, num)
+        stop   = numpy.random.randint(0, self.head-1, num)
+        stop  += stop >= start
+        start, stop = numpy.minimum(start, stop), numpy.maximum(start, stop)
+        start, stop = (offset + start)[:, None], (offset + stop)[:, None]
+
+        columns = numpy.arange(matrix.shape[1])[None, :]
+        inside  = (columns >= start) & (columns <= stop)
+        self._rearrange(
+            matrix, rows, numpy.where(inside, start + stop - columns, columns)
+        )
+
+
+    def _insert(self, matrix, rows, target, offset, source, length):
+        '''
+        Inserts sequences into gene heads, shifting the rest of each head
+        to the right.  Anything pushed past the end of the head is lost.
+        @param rows:   indexes of rows to modify
+        @param target: first column of the target gene for each row
+        @param offset: position of the insertion within each target head
+        @param source: first column of the inserted sequence for each row
+        @param length: length of the inserted sequence for each row
+        '''
+        length = numpy.minimum(length, self.head - offset)[:, None]
+        target, offset, source = \
+            target[:, None], offset[:, None], source[:, None]
+
+        locus  = numpy.arange(self.head)[None, :]
+        moved  = numpy.where(
+            locus < offset, target + locus, numpy.where(
+                locus < offset + length,
+                source + locus - offset,
+                target + locus - length
+            )
+        )
+
+        sources = numpy.tile(numpy.arange(matrix.shape[1]), (len(rows), 1))
+        sources[numpy.arange(len(rows))[:, None], target + locus] = moved
+        self._rearrange(matrix, rows, sources)
+
+
+    def _transpose_is(self, matrix):
+        '''Applies IS transposition to some rows'''
+        # Since IS does not transpose to the root, it has no purpose
+        # if the head length is less than 2.
+        if self.head < 2:
+            return
+
+        rows = self._chosen(self.is_transposition_rate)
+        num  = len(rows)
+
+        # Pick source and target genes, and a sequence to transpose that is
+        # truncated at the end of the head
+        source = numpy.random.randint(0, self.genes, num) * self.gene_length
+        target = numpy.random.randint(0, self.genes, num) * self.gene_length
+        start  = numpy.random.randint(0, self.gene_length, num)
+        length = numpy.random.choice(self.is_transposition_length, num)
+        length = numpy.maximum(numpy.minimum(start+length, self.head)-start, 0)
+
+        # Offset into target gene: in the head but not the root
+        offset = numpy.random.randint(1, self.head, num)
+        self._insert(matrix, rows, target, offset, source + start, length)
+
+
+    def _transpose_ris(self, matrix):
+        '''Applies RIS transposition to some rows'''
+        rows = self._chosen(self.ris_transposition_rate)
+        num  = len(rows)
+
+        # Pick source and target genes
+        source = numpy.random.randint(0, self.genes, num) * self.gene_length
+        target = numpy.random.randint(0, self.genes, num) * self.gene_length
+
+        # The sequence must begin with a function, so pick one at random
+        # in the source head of each row.  Rows without any are left alone.
+        heads = source[:, None] + numpy.arange(self.head)[None, :]
+        functions = self._functions[matrix[rows[:, None], heads]]
+        start = numpy.argmax(
+            functions * numpy.random.random_sample(functions.shape), axis=1
+        )
+        has = functions.any(axis=1)
+        rows, source, target, start = \
+            rows[has], source[has], target[has], start[has]
+
+        length = numpy.random.choice(self.ris_transposition_length, len(rows))
+        length = numpy.minimum(start + length, self.head) - start
+
+        # Insert into the target gene's head at position 0
+        offset = numpy.zeros(len(rows), int)
+        self._insert(matrix, rows, target, offset, source + start, length)
+
+
+    def _transpose_gene(self, matrix, dcs):
+        '''Switches the first gene of some rows with another gene'''
+        if self.genes < 2:
+            return
+
+        rows  = self._chosen(self.gene_transposition_rate)
+        which = numpy.random.randint(1, self.genes, len(rows))
+
+        gene    = self._gene[None, :]
+        sources = numpy.where(
+            gene == 0, which[:, None] * self.gene_length + self._locus,
+            numpy.where(gene == which[:, None], self._locus, 
+                        numpy.arange(matrix.shape[1]))
+        )
+        self._rearrange(matrix, rows, sources)
+
+        if dcs is not None:
+            first = dcs[rows, 0].copy()
+            dcs[rows, 0] = dcs[rows, which]
+            dcs[rows, which] = first
+
+
+    def _swap(self, matrix, first, second, start, stop):
+        '''
+        Swaps a range of columns between pairs of rows
+        @param first:  indexes of first rows in each pair
+        @param second: indexes of second rows in each pair
+        @param start:  first column to swap for each pair
+        @param stop:   column after the last to swap for each pair
+        '''
+        columns = numpy.arange(matrix.shape[1])[None, :]
+        inside  = (columns >= start[:, None]) & (columns < stop[:, None])
+        rows1, rows2 = matrix[first], matrix[second]
+        matrix[first]  = numpy.where(inside, rows2, rows1)
+        matrix[second] = numpy.where(inside, rows1, rows2)
+
+
+    def _crossover_one_point(self, matrix):
+        '''Swaps the end of one gene, from a random index, between pairs'''
+        first, second = self._pairs(self.crossover_one_point_rate)
+        num   = len(first)
+        gene  = numpy.random.randint(0, self.genes, num)
+        index = numpy.random.randint(0, self.gene_length, num)
+        start = gene * self.gene_length + index
+        self._swap(matrix, first, second, start, (gene+1) * self.gene_length)
+
+
+    def _crossover_two_point(self, matrix, dcs):
+        '''Swaps the loci between two random points between pairs'''
+        if matrix.shape[1] < 2:
+            return
+
+        first, second = self._pairs(self.crossover_two_point_rate)
+        num   = len(first)
+        start = numpy.random.randint(0, matrix.shape[1], num)
+        stop  = numpy.random.randint(0, matrix.shape[1]-1, num)
+        stop += stop >= start
+        start, stop = numpy.minimum(start, stop), numpy.maximum(start, stop)
+        self._swap(matrix, first, second, start, stop)
+
+        # Genes strictly between the two points are swapped whole
+        if dcs is not None:
+            gene  = numpy.arange(self.genes)[None, :]
+            whole = (gene > (start // self.gene_length)[:, None]) & \
+                    (gene < (stop  // self.gene_length)[:, None])
+            rows1, rows2 = dcs[first], dcs[second]
+            whole = whole[:, :, None]
+            dcs[first]  = numpy.where(whole, rows2, rows1)
+            dcs[second] = numpy.where(whole, rows1, rows2)
+
+
+    def _crossover_gene(self, matrix, dcs):
+        '''Swaps one whole gene between pairs'''
+        first, second = self._pairs(self.crossover_gene_rate)
+        gene  = numpy.random.randint(0, self.genes, len(first))
+        start = gene * self.gene_length
+        self._swap(matrix, first, second, start, start + self.gene_length)
+
+        if dcs is not None:
+            dc = dcs[first, gene].copy()
+            dcs[first, gene]  = dcs[second, gene]
+            dcs[second, gene] = dc
+
+
+    def _replace(self, parents, matrix, dcs):
+        '''
+        Makes the varied matrix the current generation, reusing the 
+        chromosomes of parents for unchanged rows and letting rows with
+        unchanged coding regions inherit their parents' fitness values.
+        @param parents: row index of the parent of each new row
+        @param matrix:  new generation
+        @param dcs:     RNC values of the new generation
+        '''
+        before  = self.matrix[parents]
+        changed = matrix != before
+
+        # Where are the changes relative to the parents' coding regions?
+        # Changes in the RNC region count if RNCs are in use at all.
+        coding    = self.coding(before)
+        in_coding = self._locus[None, :] <= coding[:, self._gene]
+        if self.rnc_length:
+            in_coding |= self._locus[None, :] >= self.head + self.tail
+
+        recoded = (changed & in_coding).any(axis=1)
+        changed = changed.any(axis=1)
+        if dcs is not None:
+            dc_changed = (dcs != self.dcs[parents]).reshape(self.size, -1)
+            changed |= dc_changed.any(axis=1)
+            recoded |= dc_changed.any(axis=1)
+
+        population = [None] * self.size
+        for i, parent in enumerate(parents):
+            parent = self.population[parent]
+            if not changed[i]:
+                population[i] = parent
+                continue
+
+            population[i] = child = self._decode(
+                matrix[i], dcs[i] if dcs is not None else None
+            )
+
+            if not recoded[i] and child.inherit_fitness:
+                try:
+                    fitness = getattr(parent, parent._fitness.cache)
+                except AttributeError: # not evaluated
+                    pass
+                else:
+                    setattr(child, child._fitness.cache, fitness)
+                    stats.count('fitness_inherited')
+
+        self.matrix, self.dcs, self.population = matrix, dcs, population
@@ -0,0 +1,158 @@
+# PyGEP: Gene Expression Programming for Python
+# Copyright (C) 2007  Ryan J. O'Neil
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+'''
+Provides a common subexpression cache for batch evaluation.  Converged
+populations are full of identical subtrees in different genes, positions
+and chromosomes.  A SubtreeCache attached to a registered dataset keeps 
+the result vector of every subtree evaluated over it, so that each one is
+computed once:
+
+    columns = Columns(x=numpy.array([1., 2., 3.]), y=...)
+    columns.subtrees = SubtreeCache()
+
+Subtrees are identified by canonical signatures built from their
+functions, terminal names and constant values, so the same subtree has
+the same signature wherever it occurs.  Results that have not been used
+for max_age generations are evicted whenever the cache advances to a new
+generation, which Population does for its subtrees attribute:
+
+    p.subtrees = columns.subtrees
+
+Hits and misses are counted as 'subtree_hits' and 'subtree_misses' in
+pygep.util.stats.counters.  The cache also records the evaluation time 
+the hits saved, in seconds.
+'''
+
+from pygep.util import stats
+from pygep.vector.engine import vectorize
+import itertools, time
+
+
+__all__ = 'SubtreeCache',
+
+
+class SubtreeCache(object):
+    '''
+    Subtree results for one dataset.  Entries are lists of the form
+    [ID, result, last generation used, cost], where cost is the time taken
+    to compute the subtree from scratch.  The attributes hits, misses and
+    saved summarize its use.
+    '''
+    def __init__(self, max_age=1):
+        '''
+        Creates an empty subtree cache
+        @param max_age: generations a result may go unused (min=0)
+        '''
+        self.max_age    = max_age
+        self.generation = 0
+        self.hits = self.misses = 0
+        self.saved = 0.0
+
+        self._entries = {} # signature -> entry
+        self._ids     = itertools.count() # entry IDs are never reused
+
+
+    def __len__(self):
+        '''@return: number of signatures held'''
+        return len(self._entries)
+
+
+    hit_rate = property(
+        lambda self: float(self.hits) / (self.hits + self.misses or 1),
+        doc='Share of subtree evaluations found in the cache'
+    )
+
+
+    def advance(self):
+        '''Moves to a new generation, evicting results gone unused'''
+        self.generation += 1
+        oldest = self.generation - self.max_age
+        for signature, entry in self._entries.items():
+            if entry[2] < oldest:
+                del self._entries[signature]
+
+
+    def _entry(self, signature):
+        '''@return: entry for a signature, created if needed, marked used'''
+        try:
+            entry = self._entries[signature]
+        except KeyError:
+            entry = self._entries[signature] = \
+                [self._ids.next(), None, self.generation, 0.0]
+        
+        entry[2] = self.generation
+        return entry
+
+
+    def run(self, gene, evaluation):
+        '''
+        Runs the plan of a gene, reusing the results of cached subtrees.
+        See pygep.vector.engine.evaluate.
+        @param gene:       KarvaGene instance
+        @param evaluation: evaluation list with the columns filled in
+        '''
+        plan = gene._plan
+        
+        # Leaves are identified by terminal name or by constant value
+        ids = [None] * len(evaluation)
+        for terminal, indexes in gene._terminals:
+            if terminal != '?': # terminal attribute - non-RNC
+                leaf = self._entry(terminal)[0]
+                for i in indexes:
+                    ids[i] = leaf
+
+        # Signatures are built bottom-up from the IDs of the children
+        nodes = {}
+        for function, start, stop, dest in plan:
+            for i in xrange(start, stop):
+                if ids[i] is None: # constant
+                    value  = evaluation[i]
+                    ids[i] = self._entry((type(value), value))[0]
+
+            signature = (function,) + tuple(ids[start:stop])
+            nodes[dest] = entry = self._entry(signature)
+            ids[dest] = entry[0]
+
+        # Only subtrees below cache misses need evaluating
+        needed = set([0])
+        for function, start, stop, dest in reversed(plan):
+            if dest in needed and nodes[dest][1] is None:
+                needed.update(xrange(start, stop))
+
+        for function, start, stop, dest in plan:
+            if dest not in needed:
+                continue
+            
+            entry = nodes[dest]
+            if entry[1] is not None:
+                evaluation[dest] = entry[1]
+                self.hits  += 1
+                self.saved += entry[3]
+                stats.count('subtree_hits')
+                continue
+
+            began = time.time()
+            evaluation[dest] = entry[1] = \
+                vectorize(function)(*evaluation[start:stop])
+            
+            # The cost includes computing the children from scratch
+            entry[3] = time.time() - began + sum(
+                nodes[i][3] for i in xrange(start, stop) if i in nodes
+            )
+            self.misses += 1
+            stats.count('subtree_misses')
@@ -1,8 +1,18 @@
+from pygep.functions.mathematical.arithmetic import add_op
+from pygep.functions.protected import INF, divide_op
 from pygep.gene import KarvaGene
+from pygep.util import stats
 from tests.base import Computation
 import unittest
 
 
+class Counted(Computation):
+    evaluations = 0
+    def _fitness(self):
+        Counted.evaluations += 1
+        return 1
+
+
 class ChromosomeTest(unittest.TestCase):
     '''Tests basic components and functionality of a chromosomes'''
     head  = 5
@@ -20,6 +30,14 @@ class ChromosomeTest(unittest.TestCase):
         # Max arity of functions
         self.assertEqual(Computation.ARITY, Computation.arity)
 
+        # Arity table
+        for function in Computation.functions:
+            self.assertEqual(2, Computation.arities[function])
+        for terminal in Computation.terminals:
+            self.assertEqual(None, Computation.arities[terminal])
+        for gene in self.chromosome.genes:
+            self.assertTrue(gene.arities is Computation.arities)
+
 
     def testLength(self):
         # Head / tail / gene length
@@ -61,6 +79,86 @@ class ChromosomeTest(unittest.TestCase):
 
         # Evaluation
         self.assertEqual((1, 1), c(Foo()))
+
+
+    def testInviable(self):
+        class Foo(object):
+            a = 0
+        
+        class Finite(Computation):
+            finite = True
+        
+        # Only chromosomes checking their results become inviable
+        genes = [KarvaGene([divide_op, 1, 'a'], 1)]
+        for cls, inviable in (Computation, False), (Finite, True):
+            c = cls(genes, 1)
+            self.assertFalse(c.inviable)
+            self.assertEqual(INF, c(Foo)) # not an error
+            self.assertEqual(inviable, c.inviable)
+        
+        c = Finite([KarvaGene([add_op, 1, 'a'], 1)], 1)
+        c(Foo)
+        self.assertFalse(c.inviable)
+        
+        # Multigenic chromosomes with the default linker give tuples
+        for first, inviable in (add_op, False), (divide_op, True):
+            c = Finite([KarvaGene([add_op, 1, 'a'], 1),
+                        KarvaGene([first, 1, 'a'], 1)], 1)
+            self.assertEqual(2, len(c(Foo)))
+            self.assertEqual(inviable, c.inviable)
+
+
+    def testGuard(self):
+        class Foo(object):
+            a = 2
+        
+        class Guarded(Computation):
+            budget = 1
+        
+        c = Guarded([KarvaGene([add_op, 1, 'a'], 1)], 1)
+        self.assertEqual(3, c(Foo))
+        self.assertFalse(c.inviable)
+        self.assertTrue(0 <= c.spent < 1)
+        
+        # Individuals are killed once, when they first exceed the budget
+        killed = stats.counters['guard_killed']
+        c.budget = -1
+        for _ in xrange(2):
+            self.assertEqual(3, c(Foo))
+            self.assertTrue(c.inviable)
+            self.assertEqual(killed + 1, stats.counters['guard_killed'])
+        
+
+    def testFitnessInheritance(self):
+        gene = KarvaGene([add_op, 'a', 1, 2, 'a'], 2)
+        parent = Counted([gene, gene], 2)
+        self.assertEqual(1, parent.fitness)
+        self.assertEqual(1, Counted.evaluations)
+        inherited = stats.counters['fitness_inherited']
+        
+        # Non-coding changes keep the fitness value
+        child = parent._child([gene.derive([(4, [2])]), gene])
+        self.assertEqual(1, child.fitness)
+        self.assertEqual(1, Counted.evaluations)
+        self.assertEqual(inherited+1, stats.counters['fitness_inherited'])
+        
+        # Even through ancestors that were never evaluated
+        child = parent._child([gene, gene.derive([(3, [1])])])
+        child = child._child([gene.derive([(4, [1])]), child.genes[1]])
+        self.assertEqual(1, child.fitness)
+        self.assertEqual(1, Counted.evaluations)
+        inherited += 1
+        
+        # But coding changes and moving genes around do not
+        child = parent._child([gene.derive([(1, [2])]), gene])
+        self.assertEqual(1, child.fitness)
+        self.assertEqual(2, Counted.evaluations)
+        
+        other = KarvaGene(['a', 1, 2, 1, 2], 2)
+        child = parent._child([other, gene])._child([gene, other])
+        self.assertEqual(1, child.fitness)
+        self.assertEqual(3, Counted.evaluations)
+        self.assertEqual(inherited+1, stats.counters['fitness_inherited'])
     
 
 if __name__ == '__main__':
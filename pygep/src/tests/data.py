@@ -0,0 +1,135 @@
+from array import array
+from pygep.data import Dataset, Row, ingest, open_columns
+from pygep.functions.linkers import sum_linker
+from pygep.functions.mathematical.arithmetic import add_op, divide_op
+from pygep.gene import KarvaGene
+from pygep.vector import Columns
+from tests.vector.evaluation import MathComputation
+import cPickle, numpy, os, shutil, tempfile, unittest
+
+
+class DatasetTest(unittest.TestCase):
+    '''Tests columnar datasets and their row views'''
+    def setUp(self):
+        self.data = Dataset(a=array('d', [1, 2, 3, 4]), 
+                            b=numpy.array([.5, 1., 1.5, 2.]))
+
+
+    def testRows(self):
+        self.assertEqual(4, len(self.data))
+        self.assertEqual(['a', 'b'], sorted(self.data.names))
+        self.assertEqual([1, 2, 3, 4], [r.a for r in self.data])
+        self.assertEqual(2., self.data[-1].b)
+        self.assertTrue(type(self.data[0].b) is float) # not numpy.float64
+        self.assertRaises(IndexError, self.data.__getitem__, 4)
+        self.assertRaises(AttributeError, getattr, self.data[0], 'c')
+        self.assertEqual('Row(a=1.0, b=0.5)', repr(self.data[0]))
+        
+        # Views of the same row are interchangeable
+        self.assertEqual(self.data[1], self.data[1])
+        self.assertEqual(hash(self.data[1]), hash(self.data[1]))
+        self.assertNotEqual(self.data[1], self.data[2])
+        self.assertNotEqual(self.data[1], self.data[1:][0])
+
+
+    def testColumns(self):
+        self.assertTrue(self.data['a'] is self.data._columns['a'])
+        self.assertTrue(isinstance(Dataset(a=[1, 2])['a'], numpy.ndarray))
+        self.assertRaises(ValueError, Dataset, a=[1, 2], b=[1])
+        self.assertEqual(0, len(Dataset()))
+        
+        # Slices are datasets
+        part = self.data[1:3]
+        self.assertEqual(2, len(part))
+        self.assertEqual([2, 3], [r.a for r in part])
+        self.assertEqual([1., 1.5], [r.b for r in part])
+        
+        # Taking rows copies them, whatever the columns are
+        taken = self.data.take([0, 3])
+        self.assertEqual([(1, .5), (4, 2.)], [(r.a, r.b) for r in taken])
+        self.assertTrue(isinstance(taken['a'], array))
+        
+        # Batch columns share memory with the dataset and are registered
+        columns = self.data.columns
+        self.assertTrue(isinstance(columns, Columns))
+        self.assertTrue(columns is self.data.columns)
+        columns['a'][0] = 10
+        self.assertEqual(10, self.data[0].a)
+
+
+    def testEvaluation(self):
+        generator = MathComputation.generate(4, 2, sum_linker)
+        for _ in xrange(20):
+            chromosome = generator.next()
+            results = chromosome.batch(self.data.columns)
+            for result, row in zip(results, self.data):
+                try:
+                    self.assertAlmostEqual(chromosome(row), result)
+                except (ArithmeticError, ValueError):
+                    pass
+        
+        # Scalar errors are still raised, and results are memoized by row
+        gene = KarvaGene([divide_op, 'a', 0], 1)
+        self.assertRaises(ZeroDivisionError, gene, self.data[0])
+        gene = KarvaGene([add_op, 'a', 'b'], 1)
+        self.assertEqual(1.5, gene(self.data[0]))
+        memo = getattr(gene, gene.__call__.memo)
+        self.assertTrue(Row(self.data, 0) in memo)
+
+
+    def testPickle(self):
+        row = cPickle.loads(cPickle.dumps(self.data[1], 2))
+        self.assertEqual(2, row.a)
+        self.assertEqual([1., 1.5], list(row.dataset[1:3]['b']))
+
+
+class IngestTest(unittest.TestCase):
+    '''Tests conversion of delimited files to memory mapped columns'''
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'sample.dt')
+        sample = open(self.path, 'w')
+        sample.write('a b label\n')
+        for i in xrange(25):
+            sample.write('%d %s x %d %d\n' % (i, i / 2., i % 2, 1 - i % 2))
+            if i == 10:
+                sample.write('\n')
+        sample.close()
+
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+    def testIngest(self):
+        columns = os.path.join(self.directory, 'columns')
+        derived = {'odd': lambda fields: fields[-2:] == ['1', '0']}
+        data = ingest(self.path, columns, ('a', 'b'), skip=1, 
+                      derived=derived, chunksize=4)
+        
+        self.assertEqual(25, len(data))
+        self.assertEqual(['a', 'b', 'odd'], sorted(data.names))
+        self.assertTrue(isinstance(data['a'], numpy.memmap))
+        self.assertEqual(range(25), list(data['a']))
+        self.assertEqual([i / 2. for i in xrange(25)], [r.b for r in data])
+        self.assertEqual([i % 2 for i in xrange(25)], list(data['odd']))
+        self.assertEqual(5, data[10:20][0].b)
+        
+        # Columns can be opened again, and in single precision
+        self.assertEqual(range(25), list(open_columns(columns)['a']))
+        data = ingest(self.path, columns + '32', (None, 'b'), skip=1, 
+                      typecode='f')
+        self.assertEqual(['b'], data.names)
+        self.assertEqual(numpy.float32, data['b'].dtype)
+        self.assertEqual(12, data[24].b)
+
+
+    def testEmpty(self):
+        columns = os.path.join(self.directory, 'columns')
+        data = ingest(self.path, columns, ('a', 'b'), skip=100)
+        self.assertEqual(0, len(data))
+        self.assertEqual(['a', 'b'], sorted(data.names))
+
+
+if __name__ == '__main__':
+    unittest.main()
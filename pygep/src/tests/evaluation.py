@@ -0,0 +1,119 @@
+from pygep import Chromosome, Population
+from pygep.evaluation import ProcessPool, serial, uncached
+from pygep.functions.linkers import sum_linker
+from pygep.functions.mathematical.arithmetic import multiply_op
+from pygep.util import stats
+import os, time, unittest
+
+
+def add(x, y):
+    return x + y
+
+def subtract(x, y):
+    return x - y
+
+
+class Data(object):
+    a, b = 3, 4
+
+
+class Picklable(Chromosome):
+    '''Chromosomes with module level functions can be pickled'''
+    functions = add, subtract, multiply_op
+    terminals = 'a', 'b'
+
+    def _fitness(self):
+        return abs(self(Data()))
+
+
+class Pid(Picklable):
+    def _fitness(self):
+        return os.getpid()
+
+
+class SlowData(Data):
+    '''Takes time to read terminals from'''
+    @property
+    def a(self):
+        time.sleep(.01)
+        return 3
+
+    @property
+    def b(self):
+        time.sleep(.01)
+        return 4
+
+
+class Guarded(Picklable):
+    budget = .005 # less than any evaluation takes
+
+    def _fitness(self):
+        return abs(self(SlowData()))
+
+
+class Unhurried(Guarded):
+    budget = 60
+
+
+class EvaluationTest(unittest.TestCase):
+    '''Tests fitness evaluation backends'''
+    def setUp(self):
+        generator = Picklable.generate(4, 2, sum_linker)
+        self.population = [generator.next() for _ in xrange(20)]
+        
+    
+    def testUncached(self):
+        self.population.append(self.population[0])
+        self.assertEqual(20, len(uncached(self.population)))
+        serial(self.population[:5])
+        self.assertEqual(15, len(uncached(self.population)))
+        
+        
+    def testProcessPool(self):
+        pool = ProcessPool(2, chunksize=3)
+        try:
+            pool(self.population)
+            self.assertEqual([], uncached(self.population))
+            for chromosome in self.population:
+                self.assertEqual(
+                    abs(chromosome(Data())), chromosome._fitness()
+                )
+            
+            # Fitness values computed in the workers
+            pids = list(Pid.generate(4, 2).next() for _ in xrange(10))
+            pool(pids)
+            self.assertFalse(os.getpid() in [c.fitness for c in pids])
+            
+            # Kills by the evaluation guard are counted by the original
+            generator = Guarded.generate(4, 2, sum_linker)
+            guarded = [generator.next() for _ in xrange(5)]
+            killed  = stats.counters['guard_killed']
+            pool(guarded)
+            self.assertEqual(killed + 5, stats.counters['guard_killed'])
+            self.assertTrue(all(c.inviable for c in guarded))
+            self.assertTrue(all(c.spent >= .01 for c in guarded))
+            
+            # Time spent in workers is charged to the originals
+            generator = Unhurried.generate(4, 2, sum_linker)
+            unhurried = [generator.next() for _ in xrange(5)]
+            pool(unhurried)
+            self.assertEqual(killed + 5, stats.counters['guard_killed'])
+            self.assertFalse(any(c.inviable for c in unhurried))
+            self.assertTrue(all(.01 <= c.spent < 60 for c in unhurried))
+        finally:
+            pool.close()
+    
+    
+    def testPopulation(self):
+        pool = ProcessPool(2)
+        try:
+            p = Population(Pid, 10, 4, 2, evaluator=pool)
+            p.cycle()
+            self.assertTrue(p.evaluator is pool)
+            self.assertFalse(os.getpid() in [c.fitness for c in p])
+        finally:
+            pool.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
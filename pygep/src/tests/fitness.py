@@ -0,0 +1,100 @@
+from pygep import Chromosome, Dataset
+from pygep.fitness import *
+from pygep.functions.linkers import sum_linker
+from pygep.functions.mathematical.arithmetic import add_op, multiply_op
+from pygep.functions.protected import NAN, divide_op
+import math, numpy, unittest
+
+
+SAMPLE = Dataset(x=numpy.arange(1., 11.), y=numpy.arange(1., 11.) ** 2)
+
+
+class Squared(Chromosome):
+    functions = add_op, multiply_op, divide_op
+    terminals = 'x',
+
+    def _fitness(self):
+        results = self.batch(SAMPLE.columns)
+        return reward(rmse(results, SAMPLE['y']))
+
+
+class FitnessTest(unittest.TestCase):
+    '''Tests the vectorized fitness measures'''
+    def setUp(self):
+        self.target  = numpy.array([1., 2., 4., -2.])
+        self.results = numpy.array([1., 3., 4., -4.])
+        self.nan     = numpy.array([1., NAN, 4., -2.])
+
+
+    def testErrors(self):
+        self.assertAlmostEqual(math.sqrt(5 / 4.), 
+                               rmse(self.results, self.target))
+        self.assertAlmostEqual(.75, mae(self.results, self.target))
+        self.assertAlmostEqual(.375, relative_error(self.results, 
+                                                    self.target))
+        self.assertEqual(0, rmse(self.target, self.target))
+        self.assertEqual(0, relative_error([0, 1], [0, 1]))
+        self.assertEqual(INF, relative_error([1, 1], [0, 1]))
+        self.assertAlmostEqual(4 / 3., mae(3, self.target[:3])) # constant
+        for measure in rmse, mae, relative_error, log_loss:
+            self.assertEqual(INF, measure(self.nan, self.target))
+
+
+    def testLogLoss(self):
+        self.assertAlmostEqual(-math.log(.8), log_loss([.8, .2], [1, 0]))
+        self.assertTrue(0 < log_loss([1, 0], [1, 0]) < 1e-10)
+        self.assertTrue(log_loss([0, 1], [1, 0]) < INF)
+
+
+    def testRSquared(self):
+        self.assertAlmostEqual(1, r_squared(2 * self.target + 1, 
+                                            self.target))
+        self.assertAlmostEqual(1, r_squared(-self.target, self.target))
+        self.assertEqual(0, r_squared(5, self.target))
+        self.assertEqual(0, r_squared(self.nan, self.target))
+        self.assertTrue(0 < r_squared(self.results, self.target) < 1)
+
+
+    def testHits(self):
+        self.assertEqual(2, hits(self.results, self.target))
+        self.assertEqual(3, hits(self.results, self.target, 1))
+        self.assertEqual(2, hits(self.results, self.target, .4, True))
+        self.assertEqual(3, hits(self.nan, self.target))
+
+
+    def testClassification(self):
+        results = numpy.array([1., -1., 2., NAN, -3., 4.])
+        target  = numpy.array([1, 0, 0, 1, 0, 1], bool)
+        self.assertAlmostEqual(4 / 6., accuracy(results, target))
+        self.assertAlmostEqual(2 / 3., sensitivity(results, target))
+        self.assertAlmostEqual(2 / 3., specificity(results, target))
+        self.assertAlmostEqual(3 / 6., accuracy(results, target, 1.5))
+        self.assertEqual(1, sensitivity(results, [0] * 6))
+        self.assertEqual(1, specificity(results, [1] * 6))
+        
+        # Any nonzero target is positive, negative ones included
+        signed = numpy.array([-1, 0, 0, 2, 0, -3])
+        self.assertAlmostEqual(2 / 3., sensitivity(results, signed))
+        self.assertAlmostEqual(4 / 6., accuracy(results, signed))
+
+
+    def testReward(self):
+        self.assertEqual(1000, reward(0))
+        self.assertEqual(500, reward(1))
+        self.assertEqual(10, reward(4, 50))
+        self.assertEqual(0, reward(INF))
+        self.assertEqual(0, reward(NAN))
+        self.assertTrue(viable(self.results))
+        self.assertFalse(viable(self.nan))
+
+
+    def testChromosome(self):
+        c = Squared.generate(3, 2, sum_linker).next()
+        results = numpy.array([c(row) for row in SAMPLE])
+        expected = reward(math.sqrt(numpy.mean((results - SAMPLE['y']) ** 2)))
+        self.assertAlmostEqual(expected, c.fitness)
+        self.assertTrue(0 <= c.fitness <= 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
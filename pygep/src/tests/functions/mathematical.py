@@ -64,6 +64,49 @@ class MathNonterminalTest(unittest.TestCase):
         self.assertEqual(1. / 5, power.inverse_op(5))
 
 
+    def testBounded(self):
+        # Same results as the originals while they stay within bounds
+        self.assertEqual(8, power.bounded_power_op(2, 3))
+        self.assertTrue(isinstance(power.bounded_power_op(2, 3), int))
+        self.assertEqual(math.exp(2), power.bounded_exp_op(2))
+        self.assertEqual(10 ** 2, power.bounded_pow10_op(2))
+        self.assertEqual(10 ** 2, power.bounded_square_op(10))
+        self.assertEqual(-10 ** 3, power.bounded_cube_op(-10))
+        self.assertEqual(.25, power.bounded_power_op(2, -2))
+        
+        # Huge results are inf rather than huge integers or errors
+        inf = float('inf')
+        self.assertEqual(inf, power.bounded_power_op(3, 10 ** 6))
+        self.assertEqual(-inf, power.bounded_power_op(-3, 10 ** 6 + 1))
+        self.assertEqual(inf, power.bounded_power_op(.5, -10000))
+        self.assertEqual(inf, power.bounded_exp_op(1000))
+        self.assertEqual(inf, power.bounded_pow10_op(301))
+        self.assertEqual(inf, power.bounded_square_op(10 ** 200))
+        self.assertEqual(-inf, power.bounded_cube_op(-10 ** 200))
+        self.assertEqual(0, power.bounded_square_op(0))
+        
+        # Even with exponents beyond float range
+        huge = 10 ** 400
+        self.assertEqual(inf, power.bounded_power_op(2, huge))
+        self.assertEqual(-inf, power.bounded_power_op(-2., huge + 1))
+        self.assertEqual(inf, power.bounded_power_op(.5, -huge))
+        self.assertEqual(0, power.bounded_power_op(.5, huge))
+        self.assertEqual(0, power.bounded_power_op(2, -huge))
+        self.assertEqual(0, power.bounded_power_op(0., huge))
+        self.assertEqual(1, power.bounded_power_op(1., huge))
+        self.assertEqual(-1, power.bounded_power_op(-1., huge + 1))
+        self.assertEqual(inf, power.bounded_pow10_op(huge))
+        
+        # And with bases beyond float range
+        self.assertEqual(0, power.bounded_power_op(huge, -1))
+        self.assertEqual(0, power.bounded_power_op(2 ** 1100, -2))
+        self.assertAlmostEqual(1, power.bounded_power_op(huge, .5) / 1e200)
+        self.assertEqual(0, power.bounded_power_op(-huge, -1))
+        self.assertRaises(ValueError, power.bounded_power_op, -huge, .5)
+        self.assertEqual(0, power.bounded_exp_op(-huge))
+        self.assertEqual(math.exp(-5), power.bounded_exp_op(-5))
+        
+
     def testRounding(self):
         self.assertEqual(5, rounding.floor_op(5.9))
         self.assertEqual(5, rounding.ceil_op(4.1))
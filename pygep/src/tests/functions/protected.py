@@ -0,0 +1,64 @@
+from pygep.functions import protected
+from pygep.functions.protected import INF, NAN, PROTECTED_ALL, finite
+from pygep.functions.mathematical import power, trigonometry
+import itertools, math, unittest
+
+
+VALUES = 0, 1, -1, 2, .5, -.5, 1e300, -1e300, 710., -800., INF, -INF, NAN, \
+         10 ** 400, -10 ** 400
+
+
+class ProtectedTest(unittest.TestCase):
+    '''Tests the protected mathematical non-terminals'''
+    def testNoErrors(self):
+        for function in PROTECTED_ALL:
+            arity = function.func_code.co_argcount
+            for args in itertools.product(VALUES, repeat=arity):
+                function(*args) # never raises
+
+
+    def testSameResults(self):
+        # Wherever the originals succeed, the protected versions agree
+        for name in 'ln_op', 'root_op', 'power_op', 'exp_op', 'arcsine_op':
+            function = getattr(protected, name)
+            original = getattr(power, name, getattr(trigonometry, name, 0))
+            arity = function.func_code.co_argcount
+            for args in itertools.product((1, 2, .5, -.5, 3), repeat=arity):
+                try:
+                    expected = original(*args)
+                except (ArithmeticError, ValueError):
+                    continue
+                self.assertAlmostEqual(expected, function(*args))
+
+
+    def testValues(self):
+        self.assertEqual(2, protected.divide_op(4, 2))
+        self.assertEqual(INF, protected.divide_op(1, 0))
+        self.assertEqual(-INF, protected.divide_op(-1, 0))
+        self.assertFalse(finite(protected.divide_op(0, 0)))
+        self.assertFalse(finite(protected.modulus_op(1, 0)))
+        self.assertEqual(-INF, protected.ln_op(0))
+        self.assertFalse(finite(protected.ln_op(-1)))
+        self.assertFalse(finite(protected.root_op(-1)))
+        self.assertFalse(finite(protected.power_op(-8, 1./3)))
+        self.assertEqual(INF, protected.power_op(0, -1))
+        self.assertEqual(INF, protected.power_op(10, 400))
+        self.assertEqual(-INF, protected.power_op(-10, 401))
+        self.assertEqual(INF, protected.exp_op(1000))
+        self.assertEqual(INF, protected.square_op(1e200))
+        self.assertEqual(-INF, protected.sineh_op(-1000))
+        self.assertEqual(0, protected.secanth_op(1000))
+        self.assertFalse(finite(protected.sine_op(INF)))
+        self.assertFalse(finite(protected.arccosine_op(2)))
+
+
+    def testFinite(self):
+        self.assertTrue(finite(0))
+        self.assertTrue(finite(-1e300))
+        self.assertFalse(finite(INF))
+        self.assertFalse(finite(-INF))
+        self.assertFalse(finite(NAN))
+
+
+if __name__ == '__main__':
+    unittest.main()
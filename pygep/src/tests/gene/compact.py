@@ -0,0 +1,92 @@
+from pygep import Population
+from pygep.functions.linkers import sum_linker
+from pygep.functions.mathematical.arithmetic import add_op, subtract_op
+from pygep.gene import CompactGene, KarvaGene, SymbolTable
+from tests.base import Computation
+import unittest
+
+
+class Foo(object):
+    a = 5.
+
+
+class CompactComputation(Computation):
+    gene_type = CompactGene
+    terminals = 'a', '?'
+
+    def _fitness(self):
+        try:
+            return abs(self(Foo()))
+        except ZeroDivisionError:
+            return 0
+
+
+class CompactTest(unittest.TestCase):
+    '''Tests genes stored as arrays of symbol codes'''
+    def setUp(self):
+        self.gene = CompactGene([add_op, subtract_op, 'a', 1, 'a'], 2)
+
+
+    def testStorage(self):
+        self.assertEqual('B', self.gene.codes.typecode)
+        self.assertEqual(5, len(self.gene.codes))
+        self.assertEqual([add_op, subtract_op, 'a', 1, 'a'], self.gene.alleles)
+        self.assertEqual([subtract_op, 'a'], self.gene[1:3])
+        self.assertEqual('a', self.gene[-1])
+        self.assertEqual('+-a1a', repr(self.gene))
+
+
+    def testEvaluation(self):
+        self.assertEqual(1, self.gene(Foo()))
+        self.assertEqual(4, self.gene.coding)
+
+
+    def testDerivation(self):
+        karva = KarvaGene(self.gene.alleles, 2)
+        changes = [(0, ['a']), (3, [add_op, add_op])]
+        self.assertEqual(
+            karva.derive(changes).alleles, self.gene.derive(changes).alleles
+        )
+        self.assertTrue(self.gene is self.gene.derive([(2, ['a'])]))
+        
+        # Only coding changes require a new coding region
+        gene = self.gene.derive([(0, ['a'])])
+        self.assertEqual(0, gene.coding)
+        self.assertFalse(self.gene.same_coding(gene))
+        self.assertTrue(gene.same_coding(gene.derive([(1, [add_op])])))
+
+
+    def testSymbolTable(self):
+        table = SymbolTable([add_op, add_op], ['a', 1, 1.])
+        self.assertEqual([add_op, 'a', 1, 1.], table.symbols)
+        self.assertEqual(2, table[add_op])
+        self.assertEqual(None, table['a'])
+        self.assertEqual(3, table.add(1.))
+        self.assertEqual(4, table.add(subtract_op))
+
+
+    def testRNC(self):
+        gene = CompactComputation.generate(3, rnc_len=300).next().genes[0]
+        self.assertEqual('H', gene.codes.typecode)
+        self.assertTrue(gene.arities is CompactComputation.arities)
+        
+        rnc = gene.alleles[gene.rnc:]
+        self.assertEqual(rnc, list(gene.codes[gene.rnc:]))
+        for i in rnc:
+            self.assertTrue(0 <= i < 300)
+
+
+    def testPopulation(self):
+        p = Population(CompactComputation, 20, 4, 2, sum_linker)
+        p.solve(5)
+        for chromosome in p:
+            for gene in chromosome.genes:
+                self.assertTrue(isinstance(gene, CompactGene))
+                self.assertEqual(
+                    KarvaGene(gene.alleles, gene.head, gene.dc).coding,
+                    gene.coding
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+from pygep.functions.mathematical.arithmetic import add_op, subtract_op
+from pygep.gene import CompiledKarvaGene, KarvaGene
+from tests.base import Computation
+import unittest
+
+
+class Foo(object):
+    a = 5.
+
+
+class CompiledComputation(Computation):
+    gene_type = CompiledKarvaGene
+
+
+class CompiledTest(unittest.TestCase):
+    '''Tests evaluation of Karva genes compiled to Python code'''
+    def setUp(self):
+        self.gene = CompiledKarvaGene([add_op, subtract_op, 'a', 1, 'a'], 2)
+
+
+    def testEvaluation(self):
+        f = Foo()
+        self.assertEqual(1, self.gene(f))
+        self.assertTrue(f in getattr(self.gene, self.gene.__call__.memo))
+
+
+    def testSource(self):
+        self.assertEqual(
+            'def gene(obj):\n    t0 = obj.a\n    return f0(f1(c3, t0), t0)',
+            self.gene.source
+        )
+
+
+    def testSharedCompilation(self):
+        other = CompiledKarvaGene([add_op, subtract_op, 'a', 1, 'a'], 2)
+        self.assertTrue(self.gene._function is other._function)
+
+        # Constants of different types do not share code
+        other = CompiledKarvaGene([add_op, subtract_op, 'a', 1., 'a'], 2)
+        self.assertFalse(self.gene._function is other._function)
+
+
+    def testDerivation(self):
+        gene = self.gene.derive([(0, [subtract_op])])
+        self.assertEqual(-9, gene(Foo()))
+        self.assertEqual(0, self.gene.derive([(0, ['a'])]).coding)
+
+
+    def testDeepNesting(self):
+        alleles = [add_op] * 100 + ['a'] * 101
+        gene = CompiledKarvaGene(alleles, 100)
+        self.assertEqual(KarvaGene(alleles, 100)(Foo()), gene(Foo()))
+
+
+    def testInterpretedEquivalence(self):
+        generator = CompiledComputation.generate(6, 3)
+        for _ in xrange(100):
+            chromosome = generator.next()
+            for gene in chromosome.genes:
+                interpreted = KarvaGene(gene.alleles, gene.head)
+                try:
+                    expected = interpreted(Foo())
+                except ZeroDivisionError:
+                    self.assertRaises(ZeroDivisionError, gene, Foo())
+                else:
+                    self.assertEqual(expected, gene(Foo()))
+
+
+if __name__ == '__main__':
+    unittest.main()
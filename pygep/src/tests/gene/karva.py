@@ -1,5 +1,6 @@
 from pygep.functions.mathematical.arithmetic import add_op, subtract_op
 from pygep.gene import KarvaGene
+from pygep.util import stats
 import unittest
 
 
@@ -38,5 +39,44 @@ class KarvaTest(unittest.TestCase):
         self.assertEqual(self.gene._terminals, [('a', [2,4])])
 
 
+    def testPlan(self):
+        self.assertEqual(
+            ((subtract_op, 3, 5, 1), (add_op, 1, 3, 0)), self.gene._plan
+        )
+        
+        # Arity tables replace introspection of the alleles
+        gene = KarvaGene([add_op, 'a', 'a'], 1, arities={add_op: 1})
+        self.assertEqual(1, gene.coding)
+        self.assertEqual(((add_op, 1, 2, 0),), gene._plan)
+
+
+    def testSharing(self):
+        class Unshared(KarvaGene):
+            share_coding = False
+
+        # Genes built separately share when their coding regions match
+        gene = KarvaGene([add_op, subtract_op, 'a', 1, 'a', 'b', 'b'], 3)
+        self.assertTrue(gene.same_coding(self.gene))
+        self.assertTrue(gene._evaluation is self.gene._evaluation)
+        self.assertEqual(self.gene.memos(), gene.memos())
+        
+        self.gene(Foo)
+        self.assertTrue(Foo in getattr(gene, gene.__call__.memo))
+        self.assertFalse(gene.same_coding(Unshared(self.gene.alleles, 2)))
+        self.assertFalse(gene.same_coding(KarvaGene(['a'], 0)))
+
+
+    def testLazyCoding(self):
+        snapshot = dict(stats.counters)
+        gene = self.gene.derive([(0, ['a'])]).derive([(0, [add_op])])
+        self.assertFalse('coding' in gene.__dict__)
+        self.assertEqual(2, stats.counts_since(snapshot)['coding_avoided'])
+        
+        # The coding region is found once, on first use
+        self.assertEqual(1, gene(Foo))
+        self.assertEqual(4, gene.coding)
+        self.assertEqual(1, stats.counts_since(snapshot)['coding_avoided'])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,52 @@
+from pygep.functions.logical import LOGIC_ALL, and_op, if_op, or_op
+from pygep.functions.mathematical.arithmetic import ARITHMETIC_ALL, add_op
+from pygep.gene import KarvaGene, LazyKarvaGene
+from pygep.chromosome import Chromosome
+import unittest
+
+
+class Foo(object):
+    a, b, c = 1, 0, 2.
+
+    @property
+    def boom(self):
+        raise AssertionError('unused subtree evaluated')
+
+
+class LazyComputation(Chromosome):
+    gene_type = LazyKarvaGene
+    functions = LOGIC_ALL + ARITHMETIC_ALL
+    terminals = 'a', 'b', 'c', '?'
+
+
+class LazyTest(unittest.TestCase):
+    '''Tests top-down evaluation of Karva genes'''
+    def testShortCircuit(self):
+        f = Foo()
+        gene = LazyKarvaGene([if_op, 'a', 'c', add_op, 'boom', 'a'], 3)
+        self.assertEqual(2, gene(f))
+        self.assertTrue(f in getattr(gene, gene.__call__.memo))
+        
+        self.assertEqual(0, LazyKarvaGene([and_op, 'b', 'boom'], 1)(f))
+        self.assertEqual(1, LazyKarvaGene([or_op, 'a', 'boom'], 1)(f))
+        self.assertEqual(2, LazyKarvaGene([or_op, 'b', 'c'], 1)(f))
+        self.assertRaises(
+            AssertionError, LazyKarvaGene([add_op, 'a', 'boom'], 1), f
+        )
+
+
+    def testInterpretedEquivalence(self):
+        generator = LazyComputation.generate(6, 3, rnc_len=4)
+        for _ in xrange(100):
+            chromosome = generator.next()
+            for gene in chromosome.genes:
+                interpreted = KarvaGene(gene.alleles, gene.head, gene.dc)
+                try:
+                    expected = interpreted(Foo())
+                except ZeroDivisionError:
+                    continue
+                self.assertEqual(expected, gene(Foo()))
+
+
+if __name__ == '__main__':
+    unittest.main()
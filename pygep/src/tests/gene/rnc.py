@@ -22,7 +22,7 @@ class KarvaTest(unittest.TestCase):
         # And that changes to the used RNCs eliminate that cache
         gene2 = gene.derive([(4, [1])])
         self.assertNotEqual(gene2._evaluation, gene._evaluation)
-        self.assertRaises(AttributeError, getattr, gene2, '___call___memo')
+        self.assertFalse(o in getattr(gene2, '___call___memo', {}))
         
         
     def testDCDerivation(self):
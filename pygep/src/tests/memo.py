@@ -0,0 +1,123 @@
+from functools import partial
+from pygep import Population
+from pygep.gene import KarvaGene
+from pygep.util import memoize
+from pygep.util.memo import LRUMemo, WeakMemo, MemoBudget, trim
+from tests.population import SillyComputation, SillyData
+import gc, unittest
+
+
+class Key(object):
+    '''Weakly referenceable memo key'''
+
+
+class Foo(object):
+    '''A dummy class with a configurable memo policy'''
+    def __init__(self, policy):
+        self.memo_policy = policy
+    
+    @memoize
+    def baz(self, z):
+        return object()
+
+
+class LRUGene(KarvaGene):
+    memo_policy = partial(LRUMemo, 10)
+
+
+class ManyComputation(SillyComputation):
+    '''Evaluates each chromosome on several instances'''
+    gene_type = LRUGene
+    instances = [SillyData() for _ in xrange(5)]
+    
+    def _fitness(self):
+        try:
+            return sum(max(self(i), 0) for i in self.instances)
+        except ZeroDivisionError:
+            return 0
+
+
+class MemoTest(unittest.TestCase):
+    '''Tests memo policies'''
+    def testLRU(self):
+        memo = LRUMemo(2)
+        memo[1], memo[2] = 'a', 'b'
+        self.assertEqual('a', memo[1])
+        memo[3] = 'c'
+        self.assertEqual(2, len(memo))
+        self.assertTrue(1 in memo and 3 in memo and 2 not in memo)
+        
+        memo.trim(1)
+        self.assertTrue(3 in memo and 1 not in memo)
+        self.assertRaises(KeyError, memo.__getitem__, 1)
+
+
+    def testMemoize(self):
+        f = Foo(partial(LRUMemo, 3))
+        results = [f.baz(i) for i in xrange(5)]
+        self.assertTrue(f.baz(4) is results[4])
+        self.assertFalse(f.baz(0) is results[0])
+        self.assertEqual(3, len(getattr(f, Foo.baz.memo)))
+
+
+    def testWeak(self):
+        f, key = Foo(WeakMemo), Key()
+        result = f.baz(key)
+        self.assertTrue(f.baz(key) is result)
+        self.assertEqual(1, len(getattr(f, Foo.baz.memo)))
+        
+        del key
+        gc.collect()
+        self.assertEqual(0, len(getattr(f, Foo.baz.memo)))
+        
+        # Keys that cannot be weakly referenced are not memoized
+        self.assertFalse(f.baz(1) is f.baz(1))
+
+
+    def testBudget(self):
+        budget = MemoBudget(5)
+        f1, f2 = Foo(budget), Foo(budget)
+        for i in xrange(3):
+            f1.baz(i)
+            f2.baz(i)
+        
+        # The first memo was extended longest ago, so it was cleared
+        self.assertEqual(3, budget.size)
+        self.assertEqual(0, len(getattr(f1, Foo.baz.memo)))
+        self.assertEqual(3, len(getattr(f2, Foo.baz.memo)))
+        
+        del f2
+        gc.collect()
+        self.assertEqual(0, budget.size)
+
+
+    def testTrim(self):
+        memos = {1: 1, 2: 2, 3: 3}, LRUMemo(5)
+        memos[1][1] = memos[1][2] = memos[1][3] = 0
+        trim(memos, 2)
+        self.assertEqual([0, 2], [len(m) for m in memos[:2]])
+
+
+    def testPopulation(self):
+        p = Population(SillyComputation, 10, 5, 1)
+        p.memo_limit = 0
+        p.cycle()
+        for chromosome in p:
+            for gene in chromosome.genes:
+                self.assertFalse(getattr(gene, gene.__call__.memo, None))
+
+
+
+    def testPopulationLimit(self):
+        p = Population(ManyComputation, 10, 5, 1)
+        p.memo_limit = 3
+        for _ in xrange(2):
+            p.cycle()
+            sizes = [len(m) for c in p for g in c.genes for m in g.memos()]
+            self.assertTrue(sizes)
+            self.assertEqual(3, max(sizes))
+            self.assertTrue(all(0 <= size <= 3 for size in sizes))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -80,6 +80,50 @@ class PopulationTest(unittest.TestCase):
             self.assertTrue(repr(c) in p)
             
     
+    def _new(self):
+        '''@return: number of new chromosomes after a cycle'''
+        old = set(id(c) for c in self.pop)
+        self.pop.cycle()
+        return len(set(id(c) for c in self.pop) - old)
+
+
+    def testCounts(self):
+        # Each new chromosome is either evaluated or inherits its fitness
+        new    = self._new()
+        counts = self.pop.counts
+        self.assertEqual(new, counts.get('fitness_evaluated', 0) + 
+                              counts.get('fitness_inherited', 0))
+        for name, num in counts.items():
+            self.assertTrue(num > 0)
+        self.assertTrue(0 <= self.pop.dedup <= 1)
+        
+        # Without variation there is nothing to count
+        for name in dir(self.pop):
+            if name.endswith('_rate'):
+                setattr(self.pop, name, 0)
+        self.assertEqual(0, self._new())
+        self.assertEqual({}, self.pop.counts)
+        self.assertEqual(0, self.pop.dedup)
+
+
+    def testMutationCounts(self):
+        # With mutation alone each new chromosome has one new gene, whose
+        # coding region is only needed if the chromosome is evaluated
+        for name in dir(self.pop):
+            if name.endswith('_rate'):
+                setattr(self.pop, name, 0)
+        self.pop.mutation_rate = .2
+        
+        for _ in xrange(3):
+            new       = self._new()
+            counts    = self.pop.counts
+            evaluated = counts.get('fitness_evaluated', 0)
+            inherited = counts.get('fitness_inherited', 0)
+            self.assertEqual(new, evaluated + inherited)
+            self.assertEqual(evaluated, counts.get('coding_shared', 0) +
+                                        counts.get('coding_unique', 0))
+
+
     def testCrossoverPairs(self):
         seen = set()
         for x, y in self.pop._pairs(1.1):
@@ -0,0 +1,121 @@
+from pygep import Population
+from pygep.functions.mathematical.arithmetic import add_op, subtract_op
+from pygep.functions.linkers import sum_linker
+from pygep.racing import mean, Quantile
+from pygep.sampling import Sampler
+from pygep.util import stats
+from tests.base import Computation
+import unittest
+
+
+class Case(object):
+    def __init__(self, a):
+        self.a = a
+
+
+CASES = [Case(i) for i in xrange(-10, 10)]
+
+
+class Racer(Computation):
+    '''Counts the fitness cases with positive results, racing'''
+    functions = add_op, subtract_op
+
+    def _fitness(self):
+        hits = 0
+        for i, case in enumerate(CASES):
+            if self(case) > 0:
+                hits += 1
+            remaining = len(CASES) - i - 1
+            if self.hopeless(hits + remaining, remaining):
+                break
+        return hits
+
+
+class SampledRacer(Racer):
+    '''Races over the batch of fitness cases of its population'''
+    def _fitness(self):
+        hits = 0
+        for i, case in enumerate(self.sample):
+            if self(case) > 0:
+                hits += 1
+            remaining = len(self.sample) - i - 1
+            if self.hopeless(hits + remaining, remaining):
+                break
+        return hits
+
+
+class RacingTest(unittest.TestCase):
+    '''Tests stopping fitness evaluation early by racing'''
+    def tearDown(self):
+        Racer.cutoff = None
+
+
+    def testHopeless(self):
+        c = Racer.generate(3, 2, sum_linker).next()
+        self.assertFalse(c.hopeless(0, 10)) # no cutoff
+        
+        Racer.cutoff = 5
+        skipped = stats.counters['cases_skipped']
+        self.assertFalse(c.hopeless(5, 10))
+        self.assertFalse(c.hopeless(4, 0))
+        self.assertTrue(c.hopeless(4, 10))
+        self.assertEqual(10, c.skipped)
+        self.assertEqual(10, stats.counters['cases_skipped'] - skipped)
+
+
+    def testPolicies(self):
+        class Fake(object):
+            fitness = [3, 1, 4, 1, 5]
+            mean    = 2.8
+        
+        self.assertEqual(2.8, mean(Fake))
+        self.assertEqual(3, Quantile()(Fake))
+        self.assertEqual(1, Quantile(0)(Fake))
+        self.assertEqual(5, Quantile(1)(Fake))
+        self.assertRaises(ValueError, Quantile, 1.5)
+
+
+    def testPopulation(self):
+        p = Population(Racer, 20, 3, 2, sum_linker)
+        p.racing = Quantile(1)
+        self.assertTrue('Skipped: 0' in repr(p))
+        
+        for _ in xrange(3):
+            p.cycle()
+            skipped = p.counts.get('cases_skipped', 0)
+            self.assertTrue('Skipped: %s' % skipped in repr(p))
+            
+            # Only individuals that can't reach the cutoff stop early
+            for c in p:
+                if c.skipped:
+                    self.assertTrue(c.fitness < p.cutoff)
+                    self.assertTrue(c.fitness + c.skipped < p.cutoff)
+                else:
+                    self.assertEqual(sum(c(x) > 0 for x in CASES), c.fitness)
+            
+            # The chromosome type only has the cutoff during evaluation
+            self.assertTrue(p.cutoff is not None)
+            self.assertTrue(Racer.cutoff is None)
+        
+        c = Racer.generate(3, 2, sum_linker).next()
+        self.assertEqual(sum(c(x) > 0 for x in CASES), c.fitness)
+        self.assertFalse(c.skipped)
+
+
+    def testSampler(self):
+        # No cutoff from fitness values on another batch
+        p = Population(SampledRacer, 20, 3, 2, sum_linker,
+                       sampler=Sampler(CASES, 10, every=2))
+        p.racing = Quantile(1)
+        for i in xrange(4):
+            p.cycle()
+            if i % 2: # new batch
+                self.assertTrue(p.cutoff is None)
+                self.assertFalse(p.counts.get('cases_skipped'))
+                self.assertFalse(any(c.skipped for c in p))
+            else:
+                self.assertTrue(p.cutoff is not None)
+
+
+if __name__ == '__main__':
+    unittest.main()
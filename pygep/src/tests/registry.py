@@ -0,0 +1,65 @@
+from pygep.chromosome import symbol
+from pygep.functions.linkers import sum_linker
+from pygep.functions.mathematical.arithmetic import add_op, subtract_op
+from pygep.gene import KarvaGene
+from pygep.util import registry
+from tests.base import Computation
+import cPickle, unittest
+
+
+def unregistered(x):
+    return x
+
+
+class Foo(object):
+    a = 5.
+
+
+class RegistryTest(unittest.TestCase):
+    '''Tests the symbol registry and compact encoding it allows'''
+    def testRegistration(self):
+        func_id = registry.identify(add_op)
+        self.assertTrue(registry.lookup(func_id) is add_op)
+        self.assertEqual(func_id, registry.identify(registry.register(add_op)))
+        self.assertRaises(KeyError, registry.identify, unregistered)
+
+        func = symbol('~')(lambda x: x)
+        self.assertTrue(registry.lookup(registry.identify(func)) is func)
+
+
+    def testGeneEncoding(self):
+        gene = KarvaGene([add_op, unregistered, 'a', 1., 1], 2, [3, 4])
+        head, codes, terminals, dc = gene.encode()
+        self.assertEqual(2, head)
+        self.assertEqual((unregistered, 'a', 1., 1), terminals)
+        self.assertEqual(10, len(codes))
+        self.assertEqual([3, 4], dc)
+
+        decoded = KarvaGene.decode(head, codes, terminals, dc)
+        self.assertEqual(gene.alleles, decoded.alleles)
+        self.assertTrue(type(decoded.alleles[3]) is float)
+
+        pickled = cPickle.loads(cPickle.dumps(gene, 2))
+        self.assertEqual(gene.alleles, pickled.alleles)
+        self.assertEqual(gene(Foo()), pickled(Foo()))
+
+
+    def testChromosomePickling(self):
+        generator = Computation.generate(5, 3, sum_linker)
+        chromosomes = [generator.next() for _ in xrange(10)]
+        setattr(chromosomes[0], Computation._fitness.cache, 42)
+
+        pickled = cPickle.loads(cPickle.dumps(chromosomes, 2))
+        for original, copy in zip(chromosomes, pickled):
+            self.assertEqual(repr(original), repr(copy))
+            self.assertEqual(original.id, copy.id)
+            self.assertTrue(copy.linker is sum_linker)
+            for gene in copy.genes:
+                self.assertTrue(gene.arities is Computation.arities)
+
+        self.assertEqual(42, pickled[0].fitness)
+        self.assertFalse(hasattr(pickled[1], Computation._fitness.cache))
+
+
+if __name__ == '__main__':
+    unittest.main()
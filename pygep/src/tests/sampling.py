@@ -0,0 +1,160 @@
+from pygep import Population
+from pygep.data import Dataset
+from pygep.evaluation import ProcessPool
+from pygep.functions.mathematical.arithmetic import add_op, subtract_op
+from pygep.functions.linkers import sum_linker
+from pygep.sampling import Sampler
+from pygep.util import stats
+from tests.base import Computation
+import numpy, unittest
+
+
+class Case(object):
+    def __init__(self, a):
+        self.a = a
+
+
+class Sampled(Computation):
+    '''Counts the fitness cases evaluated'''
+    functions = add_op, subtract_op
+    evaluated = 0
+
+    def _fitness(self):
+        Sampled.evaluated += len(self.sample)
+        return sum(self(row) for row in self.sample)
+
+
+class Lucky(Sampled):
+    '''Solved on any batch without the one bad fitness case'''
+    def _fitness(self):
+        return float(all(row.b == 0 for row in self.sample))
+
+    def _solved(self):
+        return self.fitness == 1
+
+
+class SamplerTest(unittest.TestCase):
+    '''Tests mini-batch and progressive sampling of fitness cases'''
+    def setUp(self):
+        self.data = Dataset(a=numpy.arange(100.), b=numpy.arange(100) % 4)
+
+
+    def testDraw(self):
+        sampler = Sampler(self.data, 10)
+        batch = sampler.draw()
+        self.assertEqual(10, len(batch))
+        self.assertTrue(isinstance(batch, Dataset))
+        values = list(batch['a'])
+        self.assertEqual(sorted(set(values)), values)
+        self.assertFalse(sampler.draw() is batch)
+        
+        # Sequences of fitness cases are sampled as lists
+        cases = [Case(i) for i in xrange(20)]
+        batch = Sampler(cases, 5).draw()
+        self.assertEqual(5, len(batch))
+        self.assertTrue(all(case in cases for case in batch))
+
+
+    def testEvery(self):
+        sampler = Sampler(self.data, 10, every=3)
+        batches = [sampler.draw() for _ in xrange(6)]
+        self.assertTrue(batches[0] is batches[1] is batches[2])
+        self.assertTrue(batches[3] is batches[4] is batches[5])
+        self.assertFalse(batches[2] is batches[3])
+
+
+    def testGrowth(self):
+        sampler = Sampler(self.data, 10, growth=2, patience=2)
+        self.assertFalse(sampler.update(1))
+        self.assertFalse(sampler.update(2)) # improved
+        self.assertFalse(sampler.update(2))
+        self.assertTrue(sampler.update(1))
+        self.assertEqual(21, sampler.size)
+        self.assertEqual(21, len(sampler.draw()))
+        
+        # Batches stop changing once the sample is the full set
+        while not sampler.full:
+            sampler.update(0)
+        self.assertEqual(100, sampler.size)
+        self.assertTrue(sampler.draw() is self.data)
+        self.assertTrue(sampler.draw() is self.data)
+        self.assertFalse(sampler.update(-1) or sampler.update(-1))
+
+
+    def testStrata(self):
+        sampler = Sampler(self.data, 20, strata=lambda row: row.b == 0)
+        for _ in xrange(10):
+            batch = sampler.draw()
+            self.assertEqual(20, len(batch))
+            self.assertEqual(5, list(batch['b']).count(0))
+
+
+    def testPopulation(self):
+        Sampled.evaluated = 0
+        sampler = Sampler(self.data, 10, every=2)
+        p = Population(Sampled, 10, 3, 2, sum_linker, sampler=sampler)
+        self.assertTrue(Sampled.sample is sampler.batch)
+        self.assertEqual(100, Sampled.evaluated)
+        self.assertEqual([c.fitness for c in p], p.fitness)
+        
+        # The elite keeps its fitness until the batch changes
+        for i in xrange(4):
+            Sampled.evaluated = 0
+            changes = stats.counters['sample_changes']
+            elite = p.best
+            p.cycle()
+            self.assertTrue(p[0] is elite)
+            self.assertEqual(i % 2, stats.counters['sample_changes'] - changes)
+            for c in p:
+                self.assertEqual(sum(c(row) for row in Sampled.sample), 
+                                 c.fitness)
+            distinct = len(set(id(c) for c in p))
+            if i % 2: # all re-scored, survivors included
+                self.assertEqual(10 * distinct, Sampled.evaluated)
+            else:
+                self.assertTrue(Sampled.evaluated < 10 * distinct)
+
+
+
+    def testVerify(self):
+        data = Dataset(a=numpy.arange(100.), b=numpy.arange(100) // 99)
+        p = Population(Lucky, 10, 3, 2, sum_linker, sampler=Sampler(data, 1))
+        for _ in xrange(5):
+            self.assertFalse(p.best.solved)
+            self.assertEqual([0] * 10, p.fitness)
+            p.cycle()
+
+
+    def testProcessPool(self):
+        pool = ProcessPool(2)
+        try:
+            self.assertRaises(ValueError, Population, Sampled, 10, 3, 2,
+                              sum_linker, pool, Sampler(self.data, 10))
+            p = Population(Sampled, 10, 3, 2, sum_linker,
+                           sampler=Sampler(self.data, 10))
+            p.evaluator = pool
+            self.assertRaises(ValueError, p.cycle)
+        finally:
+            pool.close()
+
+
+    def testPopulations(self):
+        # Populations of the same type keep their own batches
+        p1 = Population(Sampled, 10, 3, 2, sum_linker,
+                        sampler=Sampler(self.data, 10, every=10))
+        p2 = Population(Sampled, 10, 3, 2, sum_linker,
+                        sampler=Sampler(self.data, 20, every=10))
+        for _ in xrange(3):
+            for p in p1, p2:
+                p.cycle()
+                self.assertTrue(Sampled.sample is p.sample)
+                self.assertFalse(p.counts.get('sample_changes'))
+            for p, size in (p1, 10), (p2, 20):
+                self.assertEqual(size, len(p.sample))
+                for c in p:
+                    self.assertEqual(sum(c(row) for row in p.sample), 
+                                     c.fitness)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+from pygep import Population
+from pygep.selection import Tournament, rank, roulette
+from tests.population import SillyComputation
+import numpy, unittest
+
+
+class Fixed(object):
+    '''Stands in for a population with known fitness values'''
+    exclusion_level = 1.5
+    
+    def __init__(self, *fitness):
+        self.fitness = list(fitness)
+        self.size    = len(fitness)
+        self.mean    = sum(fitness) / float(len(fitness))
+
+
+class Vector(Fixed):
+    '''Population with fitness values in an array, like MatrixPopulation'''
+    def __init__(self, *fitness):
+        super(Vector, self).__init__(*fitness)
+        self.fitness = numpy.array(self.fitness)
+
+
+class SelectionTest(unittest.TestCase):
+    '''Tests selection strategies'''
+    def _counts(self, strategy, population, count=1000):
+        counts = [0] * population.size
+        chosen = strategy(population, count)
+        self.assertEqual(count, len(chosen))
+        for i in chosen:
+            counts[i] += 1
+        return counts
+
+
+    def testRoulette(self):
+        counts = self._counts(roulette, Fixed(0, 1, 0, 3))
+        self.assertEqual(0, counts[0])
+        self.assertEqual(0, counts[2])
+        self.assertTrue(counts[3] > counts[1] > 0)
+
+
+    def testRouletteInviable(self):
+        # Special case: mean fitness <= 0 selects randomly
+        counts = self._counts(roulette, Fixed(0, 0, 0))
+        self.assertTrue(all(counts))
+
+
+    def testRank(self):
+        counts = self._counts(rank, Fixed(5, 100, 0, 7))
+        self.assertTrue(counts[1] > counts[3] > counts[0] > counts[2] > 0)
+
+
+    def testTournament(self):
+        counts = self._counts(Tournament(1000), Fixed(5, 100, 0, 7))
+        self.assertEqual(1000, counts[1])
+        
+        counts = self._counts(Tournament(1), Fixed(5, 100, 0, 7))
+        self.assertTrue(all(counts))
+        self.assertRaises(ValueError, Tournament, 0)
+
+
+    def testVector(self):
+        for strategy in roulette, rank, Tournament(3):
+            chosen = strategy(Vector(5, 100, 0, 7), 10)
+            self.assertTrue(isinstance(chosen, numpy.ndarray))
+        
+        counts = self._counts(roulette, Vector(0, 1, 0, 3))
+        self.assertEqual(0, counts[0])
+        self.assertEqual(0, counts[2])
+        self.assertTrue(counts[3] > counts[1] > 0)
+        self.assertTrue(all(self._counts(roulette, Vector(0, 0, 0))))
+        
+        counts = self._counts(rank, Vector(5, 100, 0, 7))
+        self.assertTrue(counts[1] > counts[3] > counts[0] > counts[2] > 0)
+        
+        counts = self._counts(Tournament(1000), Vector(5, 100, 0, 7))
+        self.assertEqual(1000, counts[1])
+        self.assertTrue(all(self._counts(Tournament(1), Vector(5, 100, 0, 7))))
+
+
+    def testPopulation(self):
+        for strategy in Tournament(3), rank:
+            p = Population(SillyComputation, 10, 5, 1)
+            p.selection = strategy
+            best = p.best
+            p.cycle()
+            self.assertTrue(p[0] is best)
+            self.assertEqual(len(p.fitness), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+from pygep.util import stats
 from pygep.util.stats import fitness_stats
 import math, unittest
 
@@ -19,6 +20,15 @@ class FitnessStatsTest(unittest.TestCase):
         self.assertEqual(6.0, total)
 
 
+class CounterTest(unittest.TestCase):
+    '''Tests named event counters'''
+    def testCounts(self):
+        snapshot = dict(stats.counters)
+        stats.count('test_event')
+        stats.count('test_event', 2)
+        self.assertEqual({'test_event': 3}, stats.counts_since(snapshot))
+
+
 if __name__ == '__main__':
     unittest.main()
 
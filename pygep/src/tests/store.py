@@ -0,0 +1,126 @@
+from pygep import Chromosome
+from pygep.evaluation import ProcessPool, serial, uncached
+from pygep.functions.linkers import sum_linker
+from pygep.functions.mathematical.arithmetic import add_op, multiply_op
+from pygep.functions.mathematical.power import power_op, bounded_power_op
+from pygep.gene import KarvaGene
+from pygep.store import FitnessStore, canonical, fingerprint
+from pygep.util import stats
+from tests.evaluation import Data, Picklable
+import os, shutil, tempfile, unittest
+
+
+class Stored(Picklable):
+    '''Counts the chromosomes actually evaluated'''
+    evaluated = 0
+    
+    def _fitness(self):
+        Stored.evaluated += 1
+        return abs(self(Data()))
+
+
+class StoreTest(unittest.TestCase):
+    '''Tests the persistent fitness store'''
+    def setUp(self):
+        self.dir  = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'fitness.db')
+        Stored.store = FitnessStore(self.path, fingerprint((Data.a, Data.b)))
+        
+        generator = Stored.generate(4, 2, sum_linker)
+        self.population = [generator.next() for _ in xrange(20)]
+        
+        
+    def tearDown(self):
+        Stored.store.close()
+        Stored.store = None
+        shutil.rmtree(self.dir)
+
+
+    def _rerun(self, maxsize=1000000, batch=1000):
+        '''@return: copies of the population in a reopened store'''
+        Stored.store.close()
+        Stored.store = FitnessStore(
+            self.path, fingerprint((Data.a, Data.b)), maxsize, batch
+        )
+        Stored.evaluated = 0
+        return [c.encode() for c in self.population]
+
+
+    def testCanonical(self):
+        chromosome = [c for c in self.population # last locus non-coding
+                      if c.genes[0].coding < len(c.genes[0]) - 1][0]
+        gene = chromosome.genes[0]
+        noncoding = gene.derive([(len(gene) - 1, ['b'])])
+        noncoding = Stored([noncoding] + chromosome.genes[1:], 4, sum_linker)
+        self.assertEqual(canonical(chromosome), canonical(noncoding))
+        self.assertNotEqual(canonical(chromosome), canonical(
+            Picklable(chromosome.genes, 4, sum_linker)
+        ))
+
+
+    def testLibraryFunctions(self):
+        # Library functions are lambdas with the same __name__
+        class Library(Chromosome):
+            functions = add_op, multiply_op, power_op, bounded_power_op
+            terminals = 'a',
+        
+        names = set()
+        for function in Library.functions:
+            chromosome = Library([KarvaGene([function, 'a', 'a'], 1)], 1)
+            names.add(canonical(chromosome))
+        self.assertEqual(4, len(names))
+        self.assertTrue('power.bounded_power_op' in canonical(chromosome))
+
+
+    def testPersistence(self):
+        serial(self.population)
+        fitness = [c.fitness for c in self.population]
+        
+        # A new run finds every fitness value without evaluating
+        snapshot = dict(stats.counters)
+        encoded  = self._rerun()
+        copies   = [Stored.decode(*e) for e in encoded]
+        serial(copies)
+        self.assertEqual(0, Stored.evaluated)
+        self.assertEqual(fitness, [c.fitness for c in copies])
+        self.assertEqual(20, stats.counts_since(snapshot)['store_hits'])
+        
+        # Other data has other fitness values
+        Stored.store.close()
+        Stored.store = FitnessStore(self.path, 'other')
+        copies[0] = Stored.decode(*encoded[0])
+        copies[0].fitness
+        self.assertEqual(1, Stored.evaluated)
+
+
+    def testEviction(self):
+        for chromosome in self.population[:10]:
+            chromosome.fitness
+        Stored.store.flush()
+        for chromosome in self.population[10:]:
+            chromosome.fitness
+        
+        # Only the most recently used values remain
+        self._rerun(maxsize=10, batch=1)
+        Stored.store.flush()
+        self.assertTrue(len(Stored.store) <= 10)
+        copies = [Stored.decode(*c.encode()) for c in self.population[10:]]
+        serial(copies)
+        self.assertEqual(0, Stored.evaluated)
+
+
+    def testProcessPool(self):
+        pool = ProcessPool(2)
+        try:
+            pool(self.population)
+        finally:
+            pool.close()
+        
+        self._rerun()
+        copies = [Stored.decode(*c.encode()) for c in self.population]
+        self.assertEqual([], Stored.store.restore(copies))
+        self.assertEqual([], uncached(copies))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+from pygep.chromosome import mutation_sites
 from pygep.gene import KarvaGene
 from tests.base import Computation
 import unittest
@@ -27,5 +28,24 @@ class MutationTest(unittest.TestCase):
         self.assertEqual(self.chromosome.id, newchr.id)
 
 
+    def testMutateAt(self):
+        newchr = self.chromosome.mutate_at([0, 4])
+        self.assertTrue(newchr[0] not in [z, z])
+        self.assertTrue(newchr[4] not in [4])
+        self.assertEqual([z, 'y', 3], list(newchr)[1:4])
+
+
+    def testSites(self):
+        self.assertEqual(range(5), list(mutation_sites(1.1, 5)))
+        self.assertEqual([], list(mutation_sites(0, 5)))
+        
+        # Geometric gaps give each locus the same chance
+        sites = list(mutation_sites(.1, 100000))
+        self.assertEqual(sorted(set(sites)), sites)
+        self.assertTrue(0 <= sites[0] and sites[-1] < 100000)
+        self.assertTrue(9000 < len(sites) < 11000)
+        self.assertTrue(4500 < len([s for s in sites if s % 2]) < 5500)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,84 @@
+from pygep.functions.linkers import or_linker, sum_linker
+from pygep.functions.logical import and_op, not_op
+from pygep.gene import KarvaGene
+from pygep.vector.bitwise import Bits, pack, popcount, unpack
+from tests.vector.evaluation import LogicComputation, Row
+import random, unittest
+
+
+class BitwiseTest(unittest.TestCase):
+    '''Verifies that bit-parallel evaluation matches scalar evaluation'''
+    def setUp(self):
+        self.table = Bits.truth_table('a', 'b', 'c')
+
+
+    def testPacking(self):
+        values = [random.choice((0, 1)) for _ in xrange(100)]
+        self.assertEqual(values, unpack(pack(values), 100))
+        self.assertEqual(sum(values), popcount(pack(values)))
+        self.assertEqual(0, pack([]))
+        self.assertEqual([1, 1, 0], unpack(-1 ^ 4, 3))
+
+
+    def testTruthTable(self):
+        self.assertEqual(8, self.table.rows)
+        self.assertEqual(255, self.table.mask)
+        self.assertEqual([0, 0, 0, 0, 1, 1, 1, 1], unpack(self.table['a'], 8))
+        self.assertEqual([0, 0, 1, 1, 0, 0, 1, 1], unpack(self.table['b'], 8))
+        self.assertEqual([0, 1, 0, 1, 0, 1, 0, 1], unpack(self.table['c'], 8))
+        
+        columns = dict((n, unpack(v, 8)) for n, v in self.table.iteritems())
+        packed  = Bits.from_columns(columns)
+        self.assertEqual(dict(self.table), dict(packed))
+        self.assertEqual(8, packed.rows)
+
+
+    def testLogical(self):
+        rows = [Row(**dict((n, unpack(v, 8)[i]) 
+            for n, v in self.table.iteritems())) for i in xrange(8)]
+        
+        generator = LogicComputation.generate(4, 3, or_linker)
+        for _ in xrange(100):
+            chromosome = generator.next()
+            expected = [bool(chromosome(r)) and 1 or 0 for r in rows]
+            self.assertEqual(expected, unpack(chromosome.batch(self.table), 8))
+
+
+    def testHits(self):
+        gene = KarvaGene([and_op, 'a', 'b'], 1)
+        results = gene.batch(self.table)
+        self.assertEqual(8, self.table.hits(results, results))
+        self.assertEqual(6, self.table.hits(results, self.table['a']))
+        self.assertEqual(0, self.table.hits(results, ~results))
+        self.assertTrue(gene.batch(self.table) is results)
+
+
+    def testElementwise(self):
+        def xor(i, j):
+            return i != j
+        
+        gene = KarvaGene([not_op, xor, 'a', 'b'], 2)
+        self.assertEqual([1, 1, 0, 0, 0, 0, 1, 1], 
+                         unpack(gene.batch(self.table), 8))
+        
+        # Constants are all 1s or all 0s
+        gene = KarvaGene([and_op, 'c', 1], 1)
+        self.assertEqual(self.table['c'], gene.batch(self.table))
+        chromosome = LogicComputation([KarvaGene([not_op, 0], 1)], 1)
+        self.assertEqual(255, chromosome.batch(self.table))
+
+
+    def testLinkers(self):
+        genes = [KarvaGene(['a'], 0), KarvaGene(['b'], 0)]
+        chromosome = LogicComputation(genes, 0, or_linker)
+        self.assertEqual(self.table['a'] | self.table['b'], 
+                         chromosome.batch(self.table))
+        
+        # Linkers without bitwise forms get the packed results as they are
+        chromosome = LogicComputation(genes, 0, sum_linker)
+        self.assertEqual(self.table['a'] + self.table['b'], 
+                         chromosome.batch(self.table))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+from pygep.chromosome import Chromosome
+from pygep.functions.linkers import sum_linker, or_linker
+from pygep.functions.logical import LOGIC_ALL
+from pygep.functions.mathematical import MATH_ALL
+from pygep.functions.mathematical.arithmetic import add_op, divide_op
+from pygep.functions import protected
+from pygep.gene import KarvaGene
+from pygep.vector import Columns
+import math, numpy, unittest
+
+
+class Row(object):
+    def __init__(self, **kwds):
+        self.__dict__.update(kwds)
+
+
+def rows(columns):
+    names = columns.keys()
+    for values in zip(*[c.tolist() for c in columns.values()]):
+        yield Row(**dict(zip(names, values)))
+
+
+class MathComputation(Chromosome):
+    functions = MATH_ALL
+    terminals = 'a', 'b', 1., 2. # ints can grow without bound
+
+
+class LogicComputation(Chromosome):
+    functions = LOGIC_ALL
+    terminals = 'a', 'b', 'c'
+
+
+class BatchTest(unittest.TestCase):
+    '''Verifies that batch evaluation matches scalar evaluation'''
+    def _compare(self, chromosome, columns):
+        results = chromosome.batch(columns)
+        for result, row in zip(results, rows(columns)):
+            try:
+                expected = chromosome(row)
+            except (ArithmeticError, ValueError):
+                continue # semantic errors are NaN or inf in batches
+            
+            if math.isinf(expected) or math.isnan(expected):
+                continue
+            self.assertAlmostEqual(expected, result)
+
+
+    def testMathematical(self):
+        columns = {
+            'a': numpy.linspace(-2, 2, 9),
+            'b': numpy.linspace(.5, 3, 9)
+        }
+        generator = MathComputation.generate(4, 2, sum_linker)
+        for _ in xrange(100):
+            self._compare(generator.next(), columns)
+
+
+    def testLogical(self):
+        columns = {
+            'a': numpy.array([0, 0, 0, 0, 1, 1, 1, 1]),
+            'b': numpy.array([0, 0, 1, 1, 0, 0, 1, 1]),
+            'c': numpy.array([0, 1, 0, 1, 0, 1, 0, 1])
+        }
+        generator = LogicComputation.generate(4, 3, or_linker)
+        for _ in xrange(100):
+            self._compare(generator.next(), columns)
+
+
+    def testErrors(self):
+        gene = KarvaGene([divide_op, 'a', 'b'], 1)
+        results = gene.batch({'a': numpy.ones(2), 'b': numpy.zeros(2)})
+        self.assertTrue(numpy.isinf(results).all())
+        
+        # Protected functions share the vector forms of the originals
+        gene = KarvaGene([protected.divide_op, 'a', 'b'], 1)
+        results = gene.batch({'a': numpy.ones(2), 'b': numpy.zeros(2)})
+        self.assertTrue(numpy.isinf(results).all())
+
+
+    def testSignedZero(self):
+        # Scalar and batch evaluation agree on the sign of inf
+        columns = {
+            'a': numpy.array([1., -1., 1., -1., 0.]),
+            'b': numpy.array([0., 0., -0., -0., -0.])
+        }
+        genes = [
+            KarvaGene([protected.divide_op, 'a', 'b'], 1),
+            KarvaGene([protected.inverse_op, 'b'], 1),
+            KarvaGene([protected.cotangenth_op, 'b'], 1),
+            KarvaGene([protected.cosecanth_op, 'b'], 1)
+        ]
+        for gene in genes:
+            results = gene.batch(columns)
+            expected = [gene(row) for row in rows(columns)]
+            self.assertEqual(repr(expected), repr(results.tolist()))
+
+
+    def testConstants(self):
+        gene = KarvaGene([add_op, 1, 2], 1)
+        results = gene.batch({'a': numpy.ones(3)})
+        self.assertEqual([3, 3, 3], list(results))
+
+
+    def testProtectedForms(self):
+        from pygep.functions.mathematical import power
+        bounded = [f for name, f in vars(power).items() 
+                   if name.startswith('bounded_')]
+        for function in protected.PROTECTED_ALL + tuple(bounded):
+            self.assertTrue(hasattr(function, 'vector'), function.symbol)
+        
+        # SIN(FLOOR(a))
+        sine, floor = protected.sine_op, protected.floor_op
+        gene = KarvaGene([sine, floor, 'a', 'a', 'a'], 2)
+        columns = {'a': numpy.array([.5, 1.5, 2.5])}
+        self.assertEqual([math.sin(math.floor(a)) for a in columns['a']],
+                         list(gene.batch(columns)))
+
+
+    def testElementwise(self):
+        def half(i):
+            return i / 2.
+        
+        gene = KarvaGene([half, 'a'], 1)
+        results = gene.batch({'a': numpy.array([2., 4.])})
+        self.assertEqual([1, 2], list(results))
+        self.assertEqual(float, results.dtype)
+        
+        # Results of functions without vector forms feed NumPy functions
+        gene = KarvaGene([protected.sine_op, half, 'a', 'a', 'a'], 2)
+        results = gene.batch({'a': numpy.array([2., 4.])})
+        self.assertEqual([math.sin(1), math.sin(2)], list(results))
+
+
+    def testColumns(self):
+        columns = Columns(a=numpy.array([1., 2.]), b=numpy.array([3., 4.]))
+        self.assertEqual(columns, columns)
+        self.assertNotEqual(columns, Columns(columns))
+        
+        # Registered datasets are memoized, plain dicts are not
+        gene = KarvaGene([add_op, 'a', 'b', 'a', 'a'], 2)
+        results = gene.batch(columns)
+        self.assertEqual([4, 6], list(results))
+        self.assertTrue(gene.batch(columns) is results)
+        self.assertFalse(gene.batch(dict(columns)) is results)
+        
+        # Derived genes share result vectors while their coding is the same
+        self.assertTrue(gene.derive([(4, ['b'])]).batch(columns) is results)
+        derived = gene.derive([(1, ['b'])])
+        self.assertEqual([6, 8], list(derived.batch(columns)))
+        self.assertTrue(derived.batch(columns) is derived.batch(columns))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+from pygep.functions.linkers import sum_linker
+from pygep.selection import Tournament, rank
+from pygep.vector import MatrixPopulation
+from tests.base import Computation
+import numpy, unittest
+
+
+class SillyData(object):
+    a = 5
+
+
+class SillyComputation(Computation):
+    silly = SillyData()
+    def _fitness(self):
+        try:
+            return max(self(self.silly), 0)
+        except ZeroDivisionError:
+            return 0
+
+
+class RncComputation(SillyComputation):
+    terminals = 'a', '?'
+
+
+class ZeroFitnessComputation(SillyComputation):
+    def _fitness(self):
+        return 0
+
+
+class MatrixPopulationTest(unittest.TestCase):
+    '''Tests array backed population cycling'''
+    def setUp(self):
+        self.pop = self._population(SillyComputation)
+
+
+    def _population(self, cls):
+        pop = MatrixPopulation(cls, 20, 5, 3, sum_linker)
+        
+        # Turn all variation on all the time
+        pop.mutation_rate            = 1.1
+        pop.inversion_rate           = 1.1
+        pop.is_transposition_rate    = 1.1
+        pop.ris_transposition_rate   = 1.1
+        pop.gene_transposition_rate  = 1.1
+        pop.crossover_one_point_rate = 1.1
+        pop.crossover_two_point_rate = 1.1
+        pop.crossover_gene_rate      = 1.1
+        return pop
+
+
+    def _verify(self, pop):
+        # The matrix must always describe the chromosomes
+        self.assertEqual(len(pop.matrix), len(pop))
+        for row, chromosome in enumerate(pop):
+            decoded = pop._decode(
+                pop.matrix[row], pop.dcs[row] if pop.dcs is not None else None
+            )
+            self.assertEqual(repr(decoded), repr(chromosome))
+            self.assertEqual(decoded.fitness, chromosome.fitness)
+            for gene in chromosome.genes:
+                self.assertEqual(len(gene), pop.gene_length)
+                
+
+    def testCoding(self):
+        coding = self.pop.coding()
+        for row, chromosome in enumerate(self.pop):
+            self.assertEqual(
+                [g.coding for g in chromosome.genes], coding[row].tolist()
+            )
+
+
+    def testCycle(self):
+        self._verify(self.pop)
+        for _ in xrange(5):
+            first_best = self.pop.best
+            self.pop.cycle()
+            self.assertTrue(self.pop[0] is first_best)
+            self._verify(self.pop)
+        
+        self.assertEqual(self.pop.age, 5)
+        self.assertEqual(len(self.pop), 20)
+
+
+    def testRncCycle(self):
+        pop = self._population(RncComputation)
+        self.assertEqual(pop.rnc_length, pop.tail)
+        for _ in xrange(5):
+            pop.cycle()
+            self._verify(pop)
+            for row, chromosome in enumerate(pop):
+                self.assertEqual(
+                    [g.dc for g in chromosome.genes], pop.dcs[row].tolist()
+                )
+
+
+    def testNoVariation(self):
+        for name in dir(self.pop):
+            if name.endswith('_rate'):
+                setattr(self.pop, name, 0)
+        
+        before = set(id(c) for c in self.pop)
+        self.pop.cycle()
+        self.assertTrue(set(id(c) for c in self.pop) <= before)
+
+
+    def testSelection(self):
+        for strategy in Tournament(3), rank:
+            pop = self._population(SillyComputation)
+            pop.selection = strategy
+            for _ in xrange(2):
+                best = pop.best
+                pop.cycle()
+                self.assertTrue(pop[0] is best)
+                self.assertTrue(isinstance(pop.fitness, numpy.ndarray))
+                self.assertEqual([c.fitness for c in pop], 
+                                 pop.fitness.tolist())
+                self._verify(pop)
+
+
+    def testZeroFitness(self):
+        pop = self._population(ZeroFitnessComputation)
+        pop.cycle()
+        self._verify(pop)
+        self.assertEqual(0, pop.mean)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+from pygep.functions.linkers import sum_linker
+from pygep.functions.mathematical.arithmetic import add_op, multiply_op
+from pygep.gene import KarvaGene
+from pygep.vector import Columns, SubtreeCache
+from tests.vector.evaluation import MathComputation
+import numpy, unittest
+
+
+class SubtreeTest(unittest.TestCase):
+    '''Tests the common subexpression cache'''
+    def setUp(self):
+        self.columns = Columns(
+            a=numpy.linspace(-2, 2, 9), b=numpy.linspace(.5, 3, 9)
+        )
+        self.columns.subtrees = self.cache = SubtreeCache()
+
+
+    def testResults(self):
+        generator = MathComputation.generate(4, 2, sum_linker)
+        for _ in xrange(100):
+            chromosome = generator.next()
+            expected = chromosome.batch(dict(self.columns))
+            results  = chromosome.batch(self.columns)
+            numpy.testing.assert_array_equal(expected, results)
+
+
+    def testSharing(self):
+        # a*b is computed once, then found as a subtree of (a*b)+1
+        square = KarvaGene([multiply_op, 'a', 'b'], 1)
+        other  = KarvaGene([add_op, multiply_op, 1, 'a', 'b'], 2)
+        square.batch(self.columns)
+        self.assertEqual((0, 1), (self.cache.hits, self.cache.misses))
+        
+        results = other.batch(self.columns)
+        self.assertEqual((1, 2), (self.cache.hits, self.cache.misses))
+        self.assertEqual(1.0 / 3, self.cache.hit_rate)
+        numpy.testing.assert_array_equal(
+            self.columns['a'] * self.columns['b'] + 1, results
+        )
+
+
+    def testEviction(self):
+        KarvaGene([multiply_op, 'a', 'b'], 1).batch(self.columns)
+        size = len(self.cache)
+        self.assertTrue(size)
+        
+        self.cache.advance()
+        self.assertEqual(size, len(self.cache))
+        self.cache.advance()
+        self.assertEqual(0, len(self.cache))
+
+
+if __name__ == '__main__':
+    unittest.main()